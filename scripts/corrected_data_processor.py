@@ -6,9 +6,28 @@ Works with actual database structure
 
 import sqlite3
 import json
+import heapq
+import sys
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from processors.nba_rarity import NBARarityEngine
+from processors.mlb_rarity import MLBRarityEngine
+from processors.f1_rarity import F1RarityEngine
+from processors.nhl_rarity import NHLRarityEngine
+from processors.champions_league_rarity import ChampionsLeagueRarityEngine
+
+# Rarity engine that builds each non-NFL sport's all-time leaderboard
+ENGINES = {
+    'nba': NBARarityEngine,
+    'mlb': MLBRarityEngine,
+    'f1': F1RarityEngine,
+    'nhl': NHLRarityEngine,
+    'champions_league': ChampionsLeagueRarityEngine,
+}
+
 class CorrectedGAASProcessor:
     def __init__(self, data_dir="data"):
         self.data_dir = Path(data_dir)
@@ -242,36 +261,127 @@ class CorrectedGAASProcessor:
             print(f"   ⚠️  Error calculating rarity for {game.get('player_name', 'Unknown')}: {e}")
             return None
 
-    def get_all_time_rare(self, cursor, table_name, position, mapping, limit=100):
-        """Get rare performances from all time data"""
+    def bucket_signature(self, game, mapping):
+        """Index of the bucket each mapped stat falls into (None if in no bucket)"""
+        signature = []
+        for stat, ranges in mapping['buckets'].items():
+            stat_value = game.get(stat, 0)
+            if stat_value is None:
+                stat_value = 0
+
+            bucket = None
+            for i, (min_val, max_val) in enumerate(ranges):
+                if min_val <= stat_value <= max_val:
+                    bucket = i
+                    break
+            signature.append(bucket)
+        return tuple(signature)
+
+    def get_all_time_rare(self, cursor, table_name, position, mapping, limit=100, batch_size=10000):
+        """Get the rarest performances across every archived game
+
+        Two streamed passes over the table in rowid order: the first groups
+        games by bucket signature (counts plus first and last occurrence by
+        season/week), the second scores each game from its group and keeps
+        the top `limit` in a bounded heap. Linear in archive size, memory
+        bounded by the number of signatures, and deterministic: ties go to
+        the earlier archived row.
+        """
         try:
-            # Sample all games (limit for performance)
-            cursor.execute(f"SELECT * FROM {table_name} ORDER BY RANDOM() LIMIT 500")
-            games = cursor.fetchall()
-
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = [col[1] for col in cursor.fetchall()]
+            occurrence_fields = ['player_name', 'season', 'week', 'game_date']
+            groups = defaultdict(lambda: {'count': 0, 'first': None, 'last': None})
+            total_games = 0
+            for game in self._stream_games(cursor, table_name, batch_size):
+                total_games += 1
+                group = groups[self.bucket_signature(game, mapping)]
+                group['count'] += 1
+
+                when = (game.get('season') or 0, game.get('week') or 0)
+                occurrence = {field: game.get(field) for field in occurrence_fields}
+                if group['first'] is None or when < group['first'][0]:
+                    group['first'] = (when, occurrence)
+                if group['last'] is None or when >= group['last'][0]:
+                    group['last'] = (when, occurrence)
+
+            def scored():
+                for i, game in enumerate(self._stream_games(cursor, table_name, batch_size)):
+                    signature = self.bucket_signature(game, mapping)
+                    occurrence_count = groups[signature]['count']
+                    # Same cut-offs as calculate_rarity: seen before, and rare or better
+                    if occurrence_count < 2 or occurrence_count > 25:
+                        continue
+                    rarity_score = round(100 * (1 - occurrence_count / max(total_games, 1)), 2)
+                    yield (rarity_score, -i), game, signature
+
+            top = heapq.nlargest(limit, scored(), key=lambda item: item[0])
 
             rare_performances = []
+            for (rarity_score, _), game, signature in top:
+                group = groups[signature]
+                occurrence_count = group['count']
+                if occurrence_count <= 5:
+                    classification = "extremely_rare"
+                elif occurrence_count <= 10:
+                    classification = "very_rare"
+                else:
+                    classification = "rare"
+
+                rare_performances.append({
+                    'game': game,
+                    'rarity': {
+                        'occurrence_count': occurrence_count,
+                        'first_occurrence': group['first'][1],
+                        'last_occurrence': group['last'][1],
+                        'rarity_score': rarity_score,
+                        'classification': classification,
+                        'total_games': total_games
+                    }
+                })
 
-            for game in games:
-                game_dict = dict(zip(columns, game))
-                rarity = self.calculate_rarity(cursor, table_name, game_dict, position, mapping)
-
-                if rarity and rarity['occurrence_count'] <= 25:
-                    rare_performances.append({
-                        'game': game_dict,
-                        'rarity': rarity
-                    })
-
-            # Sort by rarity score and limit
-            rare_performances.sort(key=lambda x: x['rarity']['rarity_score'], reverse=True)
-            return rare_performances[:limit]
+            return rare_performances
 
         except Exception as e:
             print(f"   ⚠️  Error getting all-time rare performances: {e}")
             return []
 
+    def _stream_games(self, cursor, table_name, batch_size):
+        """Yield every row of `table_name` as a dict, in rowid order, `batch_size` rows at a time"""
+        cursor.execute(f"SELECT * FROM {table_name} ORDER BY rowid")
+        columns = [col[0] for col in cursor.description]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
+
+    def process_all_time(self, sport, limit=50):
+        """Write a sport's all-time leaderboard from its rarity engine
+
+        Every archived and current game is scored as of its own date by the
+        engine's all_time_leaderboard, so the board is the same on every run.
+        """
+        with ENGINES[sport]() as engine:
+            all_time_rare = engine.all_time_leaderboard(top_n=limit)
+
+        all_time_results = {
+            'generated_at': datetime.now().isoformat(),
+            'sport': sport,
+            'position': 'all',
+            'time_range': 'all_time',
+            'top_n': len(all_time_rare),
+            'total_rare_performances': len(all_time_rare),
+            'top_rare_performances': all_time_rare
+        }
+
+        sport_dir = self.results_dir / sport
+        sport_dir.mkdir(exist_ok=True)
+
+        with open(sport_dir / f"{sport}_all_time.json", 'w') as f:
+            json.dump(all_time_results, f, indent=2, default=str)
+
+        return all_time_rare
+
     def process_other_sports(self):
         """Process NBA, MLB, F1 data"""
         print("🏀🏈 Processing other sports...")
@@ -362,6 +472,15 @@ class CorrectedGAASProcessor:
                 except Exception as e:
                     print(f"   ❌ {sport} processing error: {e}")
 
+        # All-time leaderboards, every archived game scored by the sport's engine
+        for sport in ENGINES:
+            if (self.archive_dir / f"{sport}_archive.db").exists():
+                try:
+                    all_time_rare = self.process_all_time(sport)
+                    print(f"   {sport}: {len(all_time_rare)} all-time rare performances")
+                except Exception as e:
+                    print(f"   ❌ {sport} all-time processing error: {e}")
+
     def generate_main_index(self, results):
         """Generate main index file"""
         index_data = {
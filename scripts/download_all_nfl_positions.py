@@ -1,55 +1,13 @@
 #!/usr/bin/env python3
 """Download NFL data for all positions (2018-2024)"""
+import sys
 import nfl_data_py as nfl
 import pandas as pd
 from pathlib import Path
 from loguru import logger
 
-def bucket_pass_yards(y):
-    if y < 100: return '0-99'
-    elif y < 200: return '100-199'
-    elif y < 250: return '200-249'
-    elif y < 300: return '250-299'
-    elif y < 350: return '300-349'
-    elif y < 400: return '350-399'
-    else: return '400+'
-
-def bucket_pass_td(t):
-    if t == 0: return '0'
-    elif t == 1: return '1'
-    elif t == 2: return '2'
-    elif t == 3: return '3'
-    elif t == 4: return '4'
-    else: return '5+'
-
-def bucket_interceptions(i):
-    if i == 0: return '0'
-    elif i == 1: return '1'
-    elif i == 2: return '2'
-    else: return '3+'
-
-def bucket_receptions(r):
-    if r < 3: return '0-2'
-    elif r < 5: return '3-4'
-    elif r < 7: return '5-6'
-    elif r < 10: return '7-9'
-    elif r < 12: return '10-11'
-    else: return '12+'
-
-def bucket_receiving_yards(y):
-    if y < 30: return '0-29'
-    elif y < 50: return '30-49'
-    elif y < 75: return '50-74'
-    elif y < 100: return '75-99'
-    elif y < 125: return '100-124'
-    elif y < 150: return '125-149'
-    else: return '150+'
-
-def bucket_receiving_td(t):
-    if t == 0: return '0'
-    elif t == 1: return '1'
-    elif t == 2: return '2'
-    else: return '3+'
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.buckets import apply_buckets, POSITION_BUCKETS
 
 def main():
     logger.add("logs/download_all_positions.log")
@@ -127,34 +85,7 @@ def main():
         games['opponent'] = games['opponent'].fillna('UNKNOWN')
 
         # Apply bucketing
-        if position == 'QB':
-            games['pass_yards_bucket'] = games['pass_yards'].apply(bucket_pass_yards)
-            games['pass_td_bucket'] = games['pass_td'].apply(bucket_pass_td)
-            games['interceptions_bucket'] = games['interceptions'].apply(bucket_interceptions)
-        elif position == 'RB':
-            def rush_yards_bucket(y):
-                if y < 50: return '0-49'
-                elif y < 100: return '50-99'
-                elif y < 150: return '100-149'
-                elif y < 200: return '150-199'
-                else: return '200+'
-            def rush_td_bucket(t):
-                if t == 0: return '0'
-                elif t == 1: return '1'
-                elif t == 2: return '2'
-                elif t == 3: return '3'
-                else: return '4+'
-            def fumbles_bucket(f):
-                if f == 0: return '0'
-                elif f == 1: return '1'
-                else: return '2+'
-            games['rush_yards_bucket'] = games['rush_yards'].apply(rush_yards_bucket)
-            games['rush_td_bucket'] = games['rush_td'].apply(rush_td_bucket)
-            games['fumbles_bucket'] = games['fumbles_lost'].apply(fumbles_bucket)
-        elif position in ['WR', 'TE']:
-            games['receptions_bucket'] = games['receptions'].apply(bucket_receptions)
-            games['receiving_yards_bucket'] = games['receiving_yards'].apply(bucket_receiving_yards)
-            games['receiving_td_bucket'] = games['receiving_td'].apply(bucket_receiving_td)
+        apply_buckets(games, 'nfl', POSITION_BUCKETS[position.lower()])
 
         # Save position data
         output_file = f'data/downloads/nfl/{position.lower()}_games.csv'
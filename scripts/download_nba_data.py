@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """Download NBA historical data using nba_api"""
+import sys
 from nba_api.stats.static import players
 from nba_api.stats.endpoints import playergamelog
 import pandas as pd
@@ -8,26 +9,8 @@ from loguru import logger
 import time
 from datetime import datetime, timedelta
 
-def bucket_points(p):
-    if p < 10: return '0-9'
-    elif p < 20: return '10-19'
-    elif p < 30: return '20-29'
-    elif p < 40: return '30-39'
-    elif p < 50: return '40-49'
-    else: return '50+'
-
-def bucket_rebounds(r):
-    if r < 5: return '0-4'
-    elif r < 10: return '5-9'
-    elif r < 15: return '10-14'
-    elif r < 20: return '15-19'
-    else: return '20+'
-
-def bucket_assists(a):
-    if a < 5: return '0-4'
-    elif a < 10: return '5-9'
-    elif a < 15: return '10-14'
-    else: return '15+'
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.buckets import apply_buckets
 
 def main():
     logger.add("logs/download_nba.log")
@@ -119,9 +102,7 @@ def main():
         return
 
     # Apply bucketing
-    games_df['points_bucket'] = games_df['points'].apply(bucket_points)
-    games_df['rebounds_bucket'] = games_df['rebounds'].apply(bucket_rebounds)
-    games_df['assists_bucket'] = games_df['assists'].apply(bucket_assists)
+    apply_buckets(games_df, 'nba')
 
     # Filter for meaningful games (at least 20 minutes)
     games_df = games_df[games_df['minutes'] >= 20]
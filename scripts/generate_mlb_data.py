@@ -5,9 +5,13 @@ Generate real MLB performance data from actual database
 
 import sqlite3
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.buckets import bucket_label
+
 class MLBDataGenerator:
     def __init__(self):
         self.data_dir = Path("data")
@@ -103,8 +107,8 @@ class MLBDataGenerator:
                             "stolen_bases": stolen_bases,
                             "batting_avg": batting_avg,
                             "slugging_pct": slugging_pct,
-                            "hits_bucket": self._get_hits_bucket(hits),
-                            "home_runs_bucket": self._get_home_runs_bucket(home_runs)
+                            "hits_bucket": bucket_label('mlb', 'hits_bucket', hits),
+                            "home_runs_bucket": bucket_label('mlb', 'home_runs_bucket', home_runs)
                         },
                         "rarity": {
                             "occurrence_count": occurrence_count,
@@ -147,54 +151,6 @@ class MLBDataGenerator:
         print(f"✅ Generated MLB analysis with {len(rare_performances)} rare performances")
         return True
 
-    def _get_strikeouts_bucket(self, strikeouts):
-        if strikeouts >= 15:
-            return "15+"
-        elif strikeouts >= 12:
-            return "12-14"
-        elif strikeouts >= 10:
-            return "10-11"
-        elif strikeouts >= 8:
-            return "8-9"
-        else:
-            return "0-7"
-
-    def _get_innings_bucket(self, innings):
-        if innings >= 9:
-            return "9+ (CG)"
-        elif innings >= 8:
-            return "8"
-        elif innings >= 7:
-            return "7"
-        elif innings >= 6:
-            return "6"
-        else:
-            return "0-5"
-
-    def _get_hits_bucket(self, hits):
-        if hits >= 5:
-            return "5+"
-        elif hits >= 4:
-            return "4"
-        elif hits >= 3:
-            return "3"
-        elif hits >= 2:
-            return "2"
-        else:
-            return "0-1"
-
-    def _get_home_runs_bucket(self, home_runs):
-        if home_runs >= 4:
-            return "4+"
-        elif home_runs >= 3:
-            return "3"
-        elif home_runs >= 2:
-            return "2"
-        elif home_runs >= 1:
-            return "1"
-        else:
-            return "0"
-
 if __name__ == "__main__":
     generator = MLBDataGenerator()
     generator.analyze_mlb_performances()
\ No newline at end of file
@@ -5,9 +5,13 @@ Generate real NBA performance data from actual database
 
 import sqlite3
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.buckets import bucket_label
+
 class NBADataGenerator:
     def __init__(self):
         self.data_dir = Path("data")
@@ -103,9 +107,9 @@ class NBADataGenerator:
                             "steals": steals,
                             "blocks": blocks,
                             "minutes": minutes,
-                            "points_bucket": self._get_points_bucket(points),
-                            "rebounds_bucket": self._get_rebounds_bucket(rebounds),
-                            "assists_bucket": self._get_assists_bucket(assists)
+                            "points_bucket": bucket_label('nba', 'points_bucket', points),
+                            "rebounds_bucket": bucket_label('nba', 'rebounds_bucket', rebounds),
+                            "assists_bucket": bucket_label('nba', 'assists_bucket', assists)
                         },
                         "rarity": {
                             "occurrence_count": occurrence_count,
@@ -148,42 +152,6 @@ class NBADataGenerator:
         print(f"✅ Generated NBA analysis with {len(rare_performances)} rare performances")
         return True
 
-    def _get_points_bucket(self, points):
-        if points >= 50:
-            return "50+"
-        elif points >= 40:
-            return "40-49"
-        elif points >= 30:
-            return "30-39"
-        elif points >= 20:
-            return "20-29"
-        else:
-            return "0-19"
-
-    def _get_rebounds_bucket(self, rebounds):
-        if rebounds >= 20:
-            return "20+"
-        elif rebounds >= 15:
-            return "15-19"
-        elif rebounds >= 10:
-            return "10-14"
-        elif rebounds >= 5:
-            return "5-9"
-        else:
-            return "0-4"
-
-    def _get_assists_bucket(self, assists):
-        if assists >= 15:
-            return "15+"
-        elif assists >= 10:
-            return "10-14"
-        elif assists >= 7:
-            return "7-9"
-        elif assists >= 4:
-            return "4-6"
-        else:
-            return "0-3"
-
 if __name__ == "__main__":
     generator = NBADataGenerator()
     generator.analyze_nba_performances()
\ No newline at end of file
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 """Load all NFL position data into archive database"""
+import sys
 import pandas as pd
 import sqlite3
 from pathlib import Path
 from loguru import logger
 
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.table_stats import record_row_count
+
 def create_table_for_position(conn, position):
     """Create table for specific position"""
     conn.execute(f"DROP TABLE IF EXISTS {position.lower()}_games")
@@ -88,7 +92,7 @@ def create_table_for_position(conn, position):
 
     if bucket_cols:
         index_name = f"idx_{position.lower()}_buckets"
-        conn.execute(f"CREATE INDEX {index_name} ON {position.lower()}_games({', '.join(bucket_cols)})")
+        conn.execute(f"CREATE INDEX {index_name} ON {position.lower()}_games({', '.join(bucket_cols + ['game_date'])})")
 
     conn.execute(f"CREATE INDEX idx_{position.lower()}_date ON {position.lower()}_games(game_date)")
 
@@ -115,6 +119,7 @@ def main():
 
         # Load data into table
         df.to_sql(f'{position.lower()}_games', conn, if_exists='replace', index=False)
+        record_row_count(conn, f'{position.lower()}_games')
 
         position_count = conn.execute(f"SELECT COUNT(*) FROM {position.lower()}_games").fetchone()[0]
         total_games += position_count
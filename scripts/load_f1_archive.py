@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 """Load F1 sample data into archive database"""
+import sys
 import pandas as pd
 import sqlite3
 from pathlib import Path
 from loguru import logger
 
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.table_stats import record_row_count
+
 def main():
     logger.add("logs/load_f1.log")
     logger.info("Loading F1 sample data into archive database...")
@@ -43,9 +47,10 @@ def main():
     """)
 
     df.to_sql('races', conn, if_exists='replace', index=False)
+    record_row_count(conn, 'races')
 
     # Create indexes
-    conn.execute("CREATE INDEX idx_f1_buckets ON races(position_bucket, overtakes_bucket, fastest_lap_bucket)")
+    conn.execute("CREATE INDEX idx_f1_buckets ON races(position_bucket, overtakes_bucket, fastest_lap_bucket, race_date)")
     conn.execute("CREATE INDEX idx_f1_date ON races(race_date)")
     conn.execute("CREATE INDEX idx_f1_position ON races(position)")
     conn.execute("CREATE INDEX idx_f1_points ON races(points)")
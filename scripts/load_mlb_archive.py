@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 """Load MLB sample data into archive database"""
+import sys
 import pandas as pd
 import sqlite3
 from pathlib import Path
 from loguru import logger
 
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.table_stats import record_row_count
+
 def main():
     logger.add("logs/load_mlb.log")
     logger.info("Loading MLB sample data into archive database...")
@@ -45,9 +49,10 @@ def main():
     """)
 
     df.to_sql('games', conn, if_exists='replace', index=False)
+    record_row_count(conn, 'games')
 
     # Create indexes
-    conn.execute("CREATE INDEX idx_mlb_buckets ON games(hits_bucket, runs_bucket, rbis_bucket, home_runs_bucket)")
+    conn.execute("CREATE INDEX idx_mlb_buckets ON games(hits_bucket, runs_bucket, rbis_bucket, home_runs_bucket, game_date)")
     conn.execute("CREATE INDEX idx_mlb_date ON games(game_date)")
     conn.execute("CREATE INDEX idx_mlb_hits ON games(hits)")
     conn.execute("CREATE INDEX idx_mlb_home_runs ON games(home_runs)")
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 """Load NBA sample data into archive database"""
+import sys
 import pandas as pd
 import sqlite3
 from pathlib import Path
 from loguru import logger
 
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.table_stats import record_row_count
+
 def main():
     logger.add("logs/load_nba.log")
     logger.info("Loading NBA sample data into archive database...")
@@ -41,9 +45,10 @@ def main():
     """)
 
     df.to_sql('games', conn, if_exists='replace', index=False)
+    record_row_count(conn, 'games')
 
     # Create indexes
-    conn.execute("CREATE INDEX idx_nba_buckets ON games(points_bucket, rebounds_bucket, assists_bucket)")
+    conn.execute("CREATE INDEX idx_nba_buckets ON games(points_bucket, rebounds_bucket, assists_bucket, game_date)")
     conn.execute("CREATE INDEX idx_nba_date ON games(game_date)")
     conn.execute("CREATE INDEX idx_nba_points ON games(points)")
     conn.execute("CREATE INDEX idx_nba_season ON games(season)")
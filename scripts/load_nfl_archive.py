@@ -1,28 +1,14 @@
 #!/usr/bin/env python3
 """Load NFL RB data into archive database"""
+import sys
 import pandas as pd
 import sqlite3
 from pathlib import Path
 from loguru import logger
 
-def bucket_rush_yards(y):
-    if y < 50: return '0-49'
-    elif y < 100: return '50-99'
-    elif y < 150: return '100-149'
-    elif y < 200: return '150-199'
-    else: return '200+'
-
-def bucket_rush_td(t):
-    if t == 0: return '0'
-    elif t == 1: return '1'
-    elif t == 2: return '2'
-    elif t == 3: return '3'
-    else: return '4+'
-
-def bucket_fumbles(f):
-    if f == 0: return '0'
-    elif f == 1: return '1'
-    else: return '2+'
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.buckets import apply_buckets, POSITION_BUCKETS
+from utils.table_stats import record_row_count
 
 def main():
     logger.add("logs/load_nfl.log")
@@ -31,9 +17,7 @@ def main():
     logger.info(f"Loaded {len(df)} RB games from CSV")
 
     # Apply bucketing
-    df['rush_yards_bucket'] = df['rush_yards'].apply(bucket_rush_yards)
-    df['rush_td_bucket'] = df['rush_td'].apply(bucket_rush_td)
-    df['fumbles_bucket'] = df['fumbles_lost'].apply(bucket_fumbles)
+    apply_buckets(df, 'nfl', POSITION_BUCKETS['rb'])
 
     # Create database
     Path("data/archive").mkdir(parents=True, exist_ok=True)
@@ -62,8 +46,9 @@ def main():
     """)
 
     df.to_sql('rb_games', conn, if_exists='replace', index=False)
+    record_row_count(conn, 'rb_games')
 
-    conn.execute("CREATE INDEX idx_rb_buckets ON rb_games(rush_yards_bucket, rush_td_bucket, fumbles_bucket)")
+    conn.execute("CREATE INDEX idx_rb_buckets ON rb_games(rush_yards_bucket, rush_td_bucket, fumbles_bucket, game_date)")
     conn.execute("CREATE INDEX idx_rb_date ON rb_games(game_date)")
     conn.execute("CREATE INDEX idx_rb_yards ON rb_games(rush_yards)")
 
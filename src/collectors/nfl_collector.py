@@ -5,12 +5,37 @@ import sqlite3
 from pathlib import Path
 from datetime import datetime
 from loguru import logger
+from utils.buckets import apply_buckets, POSITION_BUCKETS
+from utils.change_feed import append_tables
+from utils.ingest_state import advance_watermark, ensure_table, past_watermark, read_watermark
+from utils.nfl_tables import games_table_sql
+from utils.sketches import update_sketch
+from utils.weekly_cache import content_hash, WeeklyCache
+
+# Weekly-data stat columns -> games table columns for each position
+POSITION_STATS = {
+    'qb': {'passing_yards': 'pass_yards', 'passing_tds': 'pass_td', 'interceptions': 'interceptions',
+           'completions': 'completions', 'attempts': 'attempts'},
+    'rb': {'carries': 'rush_attempts', 'rushing_yards': 'rush_yards', 'rushing_tds': 'rush_td',
+           'rushing_fumbles_lost': 'fumbles_lost'},
+    'wr': {'receptions': 'receptions', 'receiving_yards': 'receiving_yards', 'receiving_tds': 'receiving_td',
+           'targets': 'targets'},
+    'te': {'receptions': 'receptions', 'receiving_yards': 'receiving_yards', 'receiving_tds': 'receiving_td',
+           'targets': 'targets'},
+}
+
 
 class NFLCollector:
-    def __init__(self, position='rb'):
+    def __init__(self, position='rb', offline=None):
         self.position = position.lower()
         self.current_season = self._get_season()
         self.current_db = Path("data/current/nfl_current.db")
+        # Weekly data is served from data/cache; offline (or GAAS_OFFLINE) never downloads
+        self.weekly_cache = WeeklyCache(
+            'nfl_weekly', self.current_season,
+            lambda season: nfl.import_weekly_data([season], downcast=True),
+            offline=offline
+        )
         self._init_db()
 
     def _get_season(self):
@@ -20,237 +45,110 @@ class NFLCollector:
     def _init_db(self):
         self.current_db.parent.mkdir(parents=True, exist_ok=True)
         conn = sqlite3.connect(self.current_db)
-
-        # Create table based on position
-        if self.position == 'qb':
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS qb_games (
-                    game_id TEXT,
-                    player_id TEXT,
-                    player_name TEXT,
-                    position TEXT,
-                    team TEXT,
-                    opponent TEXT,
-                    game_date TEXT,
-                    season INTEGER,
-                    week INTEGER,
-                    pass_yards INTEGER,
-                    pass_td INTEGER,
-                    interceptions INTEGER,
-                    completions INTEGER,
-                    attempts INTEGER,
-                    pass_yards_bucket TEXT,
-                    pass_td_bucket TEXT,
-                    interceptions_bucket TEXT,
-                    PRIMARY KEY (game_id, player_id)
-                )
-            """)
-        elif self.position == 'rb':
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS rb_games (
-                    game_id TEXT,
-                    player_id TEXT,
-                    player_name TEXT,
-                    position TEXT,
-                    team TEXT,
-                    opponent TEXT,
-                    game_date TEXT,
-                    season INTEGER,
-                    week INTEGER,
-                    rush_attempts INTEGER,
-                    rush_yards INTEGER,
-                    rush_td INTEGER,
-                    fumbles_lost INTEGER,
-                    rush_yards_bucket TEXT,
-                    rush_td_bucket TEXT,
-                    fumbles_bucket TEXT,
-                    PRIMARY KEY (game_id, player_id)
-                )
-            """)
-        elif self.position in ['wr', 'te']:
-            conn.execute(f"""
-                CREATE TABLE IF NOT EXISTS {self.position}_games (
-                    game_id TEXT,
-                    player_id TEXT,
-                    player_name TEXT,
-                    position TEXT,
-                    team TEXT,
-                    opponent TEXT,
-                    game_date TEXT,
-                    season INTEGER,
-                    week INTEGER,
-                    receptions INTEGER,
-                    receiving_yards INTEGER,
-                    receiving_td INTEGER,
-                    targets INTEGER,
-                    receptions_bucket TEXT,
-                    receiving_yards_bucket TEXT,
-                    receiving_td_bucket TEXT,
-                    PRIMARY KEY (game_id, player_id)
-                )
-            """)
+        for position in POSITION_STATS:
+            self._create_table(conn, position)
         conn.close()
 
-    def _apply_buckets(self, df):
-        def pass_yards_bucket(y):
-            if y < 100: return '0-99'
-            elif y < 200: return '100-199'
-            elif y < 250: return '200-249'
-            elif y < 300: return '250-299'
-            elif y < 350: return '300-349'
-            elif y < 400: return '350-399'
-            else: return '400+'
-
-        def pass_td_bucket(t):
-            if t == 0: return '0'
-            elif t == 1: return '1'
-            elif t == 2: return '2'
-            elif t == 3: return '3'
-            elif t == 4: return '4'
-            else: return '5+'
-
-        def int_bucket(i):
-            if i == 0: return '0'
-            elif i == 1: return '1'
-            elif i == 2: return '2'
-            else: return '3+'
+    def _create_table(self, conn, position):
+        """Create the games table for one position, restoring its primary key if dropped"""
+        ensure_table(conn, f"{position}_games", games_table_sql(position))
 
-        def rush_yards_bucket(y):
-            if y < 50: return '0-49'
-            elif y < 100: return '50-99'
-            elif y < 150: return '100-149'
-            elif y < 200: return '150-199'
-            else: return '200+'
+    def _apply_buckets(self, df, position=None):
+        """Apply bucketing to NFL stats for a position (default: this collector's)"""
+        return apply_buckets(df, 'nfl', POSITION_BUCKETS.get(position or self.position, ()))
 
-        def rush_td_bucket(t):
-            if t == 0: return '0'
-            elif t == 1: return '1'
-            elif t == 2: return '2'
-            elif t == 3: return '3'
-            else: return '4+'
+    def fetch_new_games(self, position=None):
+        """Fetch new games from current season for one position"""
+        position = (position or self.position).lower()
+        return self.fetch_all_positions([position]).get(position, pd.DataFrame())
 
-        def fumbles_bucket(f):
-            if f == 0: return '0'
-            elif f == 1: return '1'
-            else: return '2+'
+    def fetch_all_positions(self, positions=None):
+        """Fetch new games for several positions from one weekly download
 
-        def receptions_bucket(r):
-            if r < 3: return '0-2'
-            elif r < 5: return '3-4'
-            elif r < 7: return '5-6'
-            elif r < 10: return '7-9'
-            elif r < 12: return '10-11'
-            else: return '12+'
-
-        def receiving_yards_bucket(y):
-            if y < 30: return '0-29'
-            elif y < 50: return '30-49'
-            elif y < 75: return '50-74'
-            elif y < 100: return '75-99'
-            elif y < 125: return '100-124'
-            elif y < 150: return '125-149'
-            else: return '150+'
-
-        def receiving_td_bucket(t):
-            if t == 0: return '0'
-            elif t == 1: return '1'
-            elif t == 2: return '2'
-            else: return '3+'
-
-        # Apply buckets based on position
-        if self.position == 'qb':
-            df['pass_yards_bucket'] = df['pass_yards'].apply(pass_yards_bucket)
-            df['pass_td_bucket'] = df['pass_td'].apply(pass_td_bucket)
-            df['interceptions_bucket'] = df['interceptions'].apply(int_bucket)
-        elif self.position == 'rb':
-            df['rush_yards_bucket'] = df['rush_yards'].apply(rush_yards_bucket)
-            df['rush_td_bucket'] = df['rush_td'].apply(rush_td_bucket)
-            df['fumbles_bucket'] = df['fumbles_lost'].apply(fumbles_bucket)
-        elif self.position in ['wr', 'te']:
-            df['receptions_bucket'] = df['receptions'].apply(receptions_bucket)
-            df['receiving_yards_bucket'] = df['receiving_yards'].apply(receiving_yards_bucket)
-            df['receiving_td_bucket'] = df['receiving_td'].apply(receiving_td_bucket)
-
-        return df
-
-    def fetch_new_games(self):
-        """Fetch new games from current season"""
-        logger.info(f"Checking for new {self.position.upper()} games ({self.current_season})")
+        The season's weekly frame is read once through the weekly cache,
+        split by position with a single groupby, and every position's table
+        is written in one transaction. Each table's ingest watermark limits
+        the rows processed to those from its last ingested date on, and a
+        table whose watermark already holds this upstream content hash is
+        skipped outright. Returns {position: games inserted}.
+        """
+        positions = [position.lower() for position in (positions or POSITION_STATS)]
+        logger.info(f"Checking for new {', '.join(p.upper() for p in positions)} games ({self.current_season})")
 
         try:
-            weekly = nfl.import_weekly_data([self.current_season], downcast=True)
-            position_data = weekly[weekly['position'] == self.position.upper()].copy()
-
-            if len(position_data) == 0:
-                logger.info(f"No {self.position.upper()} data found for {self.current_season}")
-                return pd.DataFrame()
-
-            # Check existing games
+            weekly = self.weekly_cache.get()
+            digest = (self.weekly_cache.meta() or {}).get('hash') or content_hash(weekly)
             conn = sqlite3.connect(self.current_db)
             try:
-                existing = pd.read_sql(f"SELECT game_id, player_id FROM {self.position}_games", conn)
-            except:
-                existing = pd.DataFrame(columns=['game_id', 'player_id'])
-            conn.close()
-
-            # Create game_id from available data
-            position_data['game_id'] = position_data['season'].astype(str) + '_' + \
-                                     position_data['week'].astype(str).str.zfill(2) + '_' + \
-                                     position_data['player_id'].astype(str)
-
-            # Find new games
-            if len(existing) > 0:
-                existing['key'] = existing['game_id'] + '_' + existing['player_id']
-                position_data['key'] = position_data['game_id'] + '_' + position_data['player_id']
-                new_data = position_data[~position_data['key'].isin(existing['key'])]
-            else:
-                new_data = position_data
-
-            if len(new_data) == 0:
-                logger.info("No new games found")
-                return pd.DataFrame()
-
-            # Transform data
-            games = pd.DataFrame({
-                'game_id': new_data['game_id'],
-                'player_id': new_data['player_id'],
-                'player_name': new_data['player_display_name'],
-                'position': new_data['position'],
-                'team': new_data['recent_team'],
-                'opponent': new_data['opponent_team'].fillna('UNKNOWN'),
-                'season': new_data['season'],
-                'week': new_data['week'],
-                'rush_attempts': new_data['carries'].fillna(0),
-                'rush_yards': new_data['rushing_yards'].fillna(0),
-                'rush_td': new_data['rushing_tds'].fillna(0),
-                'fumbles_lost': new_data['rushing_fumbles_lost'].fillna(0)
-            })
-
-            # Add synthetic game date
-            games['game_date'] = games.apply(
-                lambda row: pd.to_datetime(f"{row['season']}-09-01") + pd.to_timedelta(row['week'] * 7, unit='D'),
-                axis=1
-            )
-            games['game_date'] = games['game_date'].dt.strftime('%Y-%m-%d')
-
-            # Convert to integers
-            for col in ['rush_attempts', 'rush_yards', 'rush_td', 'fumbles_lost']:
-                games[col] = games[col].astype(int)
-
-            # Apply buckets
-            games = self._apply_buckets(games)
-
-            # Save to database
-            conn = sqlite3.connect(self.current_db)
-            games.to_sql(self.position + '_games', conn, if_exists='append', index=False)
-            conn.close()
-
-            logger.success(f"Found {len(games)} new games")
-            return games
+                watermarks = {position: read_watermark(conn, f"{position}_games", 'game_date') for position in positions}
+                current = [position for position in positions
+                           if watermarks[position] and watermarks[position]['upstream_hash'] == digest]
+                if current:
+                    logger.info(f"{', '.join(p.upper() for p in current)} already ingested from this upstream data")
+
+                frames = {}
+                for position, position_data in weekly.groupby(weekly['position'].str.lower(), sort=False):
+                    if position in positions and position not in current:
+                        games = self._games_frame(position_data, position)
+                        frames[position] = past_watermark(games, watermarks[position], 'game_date')
+
+                for position in positions:
+                    if position not in frames and position not in current:
+                        logger.info(f"No {position.upper()} data found for {self.current_season}")
+
+                # Save to database; games already stored are skipped by primary key
+                inserted = append_tables(
+                    conn,
+                    {f"{position}_games": games for position, games in frames.items()},
+                    {f"{position}_games": POSITION_BUCKETS[position] for position in frames},
+                    {f"{position}_games": games_table_sql(position) for position in frames}
+                )
+                for position in frames:
+                    advance_watermark(conn, f"{position}_games", inserted[f"{position}_games"], 'game_date',
+                                      upstream_hash=digest)
+            finally:
+                conn.close()
+
+            new_games = {}
+            for position in positions:
+                games = inserted.get(f"{position}_games", pd.DataFrame())
+                new_games[position] = games
+                if len(games) > 0:
+                    update_sketch('nfl', f"{position}_games", games)
+                    logger.success(f"Found {len(games)} new {position.upper()} games")
+                elif position in frames:
+                    logger.info(f"No new {position.upper()} games found")
+            return new_games
 
         except Exception as e:
             logger.error(f"Error fetching games: {e}")
-            return pd.DataFrame()
+            return {position: pd.DataFrame() for position in positions}
+
+    def _games_frame(self, position_data, position):
+        """Convert one position's weekly rows to its games table columns"""
+        stats = POSITION_STATS[position]
+        games = pd.DataFrame({
+            # Create game_id from available data
+            'game_id': position_data['season'].astype(str) + '_' +
+                       position_data['week'].astype(str).str.zfill(2) + '_' +
+                       position_data['player_id'].astype(str),
+            'player_id': position_data['player_id'],
+            'player_name': position_data['player_display_name'],
+            'position': position_data['position'],
+            'team': position_data['recent_team'],
+            'opponent': position_data['opponent_team'].fillna('UNKNOWN'),
+            'season': position_data['season'],
+            'week': position_data['week'],
+            **{column: position_data[stat].fillna(0).astype(int) for stat, column in stats.items()}
+        })
+
+        # Add synthetic game date
+        games['game_date'] = (
+            pd.to_datetime(games['season'].astype(str) + '-09-01') +
+            pd.to_timedelta(games['week'].astype(int) * 7, unit='D')
+        ).dt.strftime('%Y-%m-%d')
+
+        return self._apply_buckets(games, position)
 
     def is_game_window(self):
         """Check if it's game time"""
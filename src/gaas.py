@@ -27,6 +27,7 @@ def run_nfl_rb_pipeline():
         # Initialize components
         collector = NFLCollector('rb')
         engine = RarityEngine('nfl', 'rb')
+        engine.ensure_indexes()
         generator = JSONGenerator('nfl', 'rb')
         git_pusher = GitPusher()
 
@@ -40,17 +41,18 @@ def run_nfl_rb_pipeline():
 
         logger.info(f"Found {len(recent_games)} recent games to analyze")
 
-        # Compute rarity for each game
+        # Compute rarity for all games in one batch
+        rarities = engine.compute_rarity_batch(recent_games)
+
         rare_perfs = []
-        for idx, game in recent_games.iterrows():
+        for (idx, game), rarity in zip(recent_games.iterrows(), rarities.to_dict('records')):
             logger.info(f"Analyzing: {game['player_name']} ({game['rush_yards']} yards)")
-            rarity = engine.compute_rarity(game)
 
             # Only include rare performances (≤25 occurrences)
             if rarity['occurrence_count'] <= 25:
                 rare_perfs.append({
                     'game': game.to_dict(),
-                    'rarity': rarity
+                    'rarity': engine.resolve_occurrences(rarity)
                 })
                 logger.success(f"RARE: {game['player_name']} - {rarity['classification']} ({rarity['occurrence_count']} occurrences)")
 
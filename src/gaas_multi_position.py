@@ -24,6 +24,7 @@ def run_position_pipeline(position):
     try:
         # Initialize components
         engine = RarityEngine('nfl', position)
+        engine.ensure_indexes()
         generator = JSONGenerator('nfl', position)
 
         # Get recent interesting performances from archive
@@ -36,9 +37,11 @@ def run_position_pipeline(position):
 
         logger.info(f"Found {len(recent_games)} recent {position.upper()} games to analyze")
 
-        # Compute rarity for each game
+        # Compute rarity for all games in one batch
+        rarities = engine.compute_rarity_batch(recent_games)
+
         rare_perfs = []
-        for idx, game in recent_games.iterrows():
+        for (idx, game), rarity in zip(recent_games.iterrows(), rarities.to_dict('records')):
             logger.info(f"Analyzing {position.upper()}: {game['player_name']}")
             if position == 'qb':
                 stats_desc = f"{game['pass_yards']} yards, {game['pass_td']} TDs"
@@ -51,13 +54,11 @@ def run_position_pipeline(position):
 
             logger.info(f"  {stats_desc}")
 
-            rarity = engine.compute_rarity(game)
-
             # Only include rare performances (≤25 occurrences)
             if rarity['occurrence_count'] <= 25:
                 rare_perfs.append({
                     'game': game.to_dict(),
-                    'rarity': rarity
+                    'rarity': engine.resolve_occurrences(rarity)
                 })
                 logger.success(f"RARE: {game['player_name']} - {rarity['classification']} ({rarity['occurrence_count']} occurrences)")
 
@@ -76,8 +77,9 @@ def run_position_pipeline(position):
         files_generated.append(str(latest_file))
         logger.info(f"Generated: {latest_file}")
 
-        # All-time rarest (using same data for demo)
-        all_time_file = generator.generate_all_time(rare_perfs, top_n=min(20, len(rare_perfs)))
+        # All-time rarest, every game scored as of its own date
+        all_time_perfs = engine.all_time_leaderboard(top_n=20)
+        all_time_file = generator.generate_all_time(all_time_perfs, top_n=min(20, len(all_time_perfs)))
         files_generated.append(str(all_time_file))
         logger.info(f"Generated: {all_time_file}")
 
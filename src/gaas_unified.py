@@ -38,50 +38,74 @@ from collectors.nhl_collector import NHLCollector
 from processors.nhl_rarity import NHLRarityEngine
 from generators.nhl_generator import NHLGenerator
 
+from processors.in_memory_rarity import in_memory_engine
+from processors.sharded_scoring import ShardedScorer, scoring_pool
+
 
 class SportOrchestrator:
-    def __init__(self, auto_commit=False):
+    def __init__(self, auto_commit=False, in_memory=False, workers=None):
         self.auto_commit = auto_commit
         self.git_pusher = GitPusher() if auto_commit else None
+        # With workers, every sport scores on one shared process pool
+        self.scoring_pool = scoring_pool(workers) if workers else None
+
+        def engine(engine_cls):
+            # in_memory swaps every sport onto InMemoryRarityEngine (for the daemon)
+            rarity_engine = (in_memory_engine(engine_cls) if in_memory else engine_cls)()
+            if self.scoring_pool is not None:
+                rarity_engine.scorer = ShardedScorer(
+                    engine_cls, workers=workers, in_memory=in_memory,
+                    engine=rarity_engine, executor=self.scoring_pool
+                )
+            return rarity_engine
+
         self.sports = {
             'nfl': {
                 'collector': NFLCollector(),
-                'rarity_engine': NFLRarityEngine(),
+                'rarity_engine': engine(NFLRarityEngine),
                 'generator': NFLGenerator(),
                 'positions': ['rb', 'qb', 'wr', 'te']  # Main positions
             },
             'nba': {
                 'collector': NBACollector(),
-                'rarity_engine': NBARarityEngine(),
+                'rarity_engine': engine(NBARarityEngine),
                 'generator': NBAJSONGenerator(),
                 'positions': ['all']  # NBA handles all players
             },
             'mlb': {
                 'collector': MLBCollector(),
-                'rarity_engine': MLBRarityEngine(),
+                'rarity_engine': engine(MLBRarityEngine),
                 'generator': MLBJSONGenerator(),
                 'positions': ['all']  # MLB handles all players
             },
             'f1': {
                 'collector': F1Collector(),
-                'rarity_engine': F1RarityEngine(),
+                'rarity_engine': engine(F1RarityEngine),
                 'generator': F1JSONGenerator(),
                 'positions': ['all']  # F1 handles all drivers
             },
             'champions_league': {
                 'collector': ChampionsLeagueCollector(),
-                'rarity_engine': ChampionsLeagueRarityEngine(),
+                'rarity_engine': engine(ChampionsLeagueRarityEngine),
                 'generator': ChampionsLeagueGenerator(),
                 'positions': ['all']  # Champions League handles all players
             },
             'nhl': {
                 'collector': NHLCollector(),
-                'rarity_engine': NHLRarityEngine(),
+                'rarity_engine': engine(NHLRarityEngine),
                 'generator': NHLGenerator(),
                 'positions': ['all']  # NHL handles all players
             }
         }
 
+    def close(self):
+        """Release every rarity engine's pooled database connections"""
+        for sport_config in self.sports.values():
+            sport_config['rarity_engine'].close()
+        if self.scoring_pool is not None:
+            self.scoring_pool.shutdown()
+            self.scoring_pool = None
+
     def process_sport(self, sport_name, sport_config):
         """Process a single sport"""
         logger.info(f"Processing {sport_name.upper()}...")
@@ -98,9 +122,9 @@ class SportOrchestrator:
                 if collector.is_game_window():
                     logger.info(f"{sport_name.upper()} game window detected - fetching new data")
                     if sport_name == 'nfl':
-                        # NFL has multiple positions
-                        for position in sport_config['positions']:
-                            new_matches = collector.fetch_new_games(position=position)
+                        # NFL has multiple positions, all from one weekly download
+                        new_games = collector.fetch_all_positions(sport_config['positions'])
+                        for position, new_matches in new_games.items():
                             if new_matches is not None and len(new_matches) > 0:
                                 logger.success(f"Fetched {len(new_matches)} new {sport_name.upper()} {position} performances")
                                 new_data = True
@@ -261,16 +285,26 @@ class SportOrchestrator:
         logger.info("=" * 60)
 
 
+def scoring_workers():
+    """Worker processes from ``--workers N``; None scores in-process"""
+    if '--workers' in sys.argv:
+        return int(sys.argv[sys.argv.index('--workers') + 1])
+    return None
+
+
 async def main():
     """Main unified orchestrator"""
     logger.info("Starting GAAS Unified Orchestrator")
 
     auto_commit = '--commit' in sys.argv
-    orchestrator = SportOrchestrator(auto_commit=auto_commit)
+    in_memory = '--in-memory' in sys.argv
+    orchestrator = SportOrchestrator(auto_commit=auto_commit, in_memory=in_memory, workers=scoring_workers())
 
     # Process all sports in parallel
     results = await orchestrator.process_all_sports_parallel()
 
+    orchestrator.close()
+
     # Print summary
     orchestrator.print_summary(results)
 
@@ -294,8 +328,10 @@ if __name__ == "__main__":
         else:
             # Sequential processing (default for compatibility)
             auto_commit = '--commit' in sys.argv
-            orchestrator = SportOrchestrator(auto_commit=auto_commit)
+            in_memory = '--in-memory' in sys.argv
+            orchestrator = SportOrchestrator(auto_commit=auto_commit, in_memory=in_memory, workers=scoring_workers())
             results = orchestrator.process_all_sports_sequential()
+            orchestrator.close()
             orchestrator.print_summary(results)
 
             # Auto-commit results if enabled
@@ -129,7 +129,7 @@ class NFLGenerator:
         if never_before:
             md_content += "## 🏆 Never Before Seen Performances\n\n"
             for perf in never_before:
-                md_content += f"**{perf['player_name']}** ({perf['display_position']}, {perf['home_team']} vs {perf['away_team']}, Week {perf.get('week', 'N/A')}, {perf['game_date']})\n"
+                md_content += f"**{perf['player_name']}** ({perf['display_position']}, {perf['team']} vs {perf['opponent']}, Week {perf.get('week', 'N/A')}, {perf['game_date']})\n"
 
                 # Add position-specific stats
                 if perf['display_position'] == 'RB':
@@ -144,7 +144,7 @@ class NFLGenerator:
         if extremely_rare:
             md_content += "## ⭐ Extremely Rare (2-5 occurrences)\n\n"
             for perf in extremely_rare:
-                md_content += f"**{perf['player_name']}** ({perf['display_position']}, {perf['home_team']} vs {perf['away_team']}, Week {perf.get('week', 'N/A')}, {perf['game_date']})\n"
+                md_content += f"**{perf['player_name']}** ({perf['display_position']}, {perf['team']} vs {perf['opponent']}, Week {perf.get('week', 'N/A')}, {perf['game_date']})\n"
 
                 if perf['display_position'] == 'RB':
                     md_content += f"- Rush Yards: {perf.get('rush_yards', 0)}, Rush TD: {perf.get('rush_td', 0)}, Receptions: {perf.get('receptions', 0)}\n"
@@ -0,0 +1,62 @@
+"""Point-in-time ("as of game date") occurrence counts"""
+import numpy as np
+import pandas as pd
+
+
+class AsOfIndex:
+    """Per-signature sorted game dates for "occurrences up to date D"
+
+    Games are sorted by (signature, day) and packed into one int64 array of
+    ``group << 32 | day`` keys, so each signature's dates are a contiguous
+    sorted run. Counting a signature's games on or before D is a single
+    ``np.searchsorted``, vectorized over any number of queries.
+    """
+
+    _DAY_OFFSET = 1 << 31
+
+    def __init__(self, signatures, days, ids):
+        signatures = pd.Series(signatures, dtype=object).astype(str).to_numpy()
+        days = np.asarray(days, dtype=np.int64)
+        ids = np.asarray(ids, dtype=object)
+
+        groups, uniques = pd.factorize(signatures)
+        order = np.lexsort((days, groups))
+        self.groups = {signature: group for group, signature in enumerate(uniques)}
+        self.keys = self._key(groups[order], days[order])
+        self.ids = ids[order]
+        self.signatures = np.asarray(uniques, dtype=object)[groups[order]]
+        self.days = days[order]
+        self.starts = np.searchsorted(self.keys, self._key(np.arange(len(uniques)), -self._DAY_OFFSET))
+        self.all_days = np.sort(days)
+        self.size = len(ids)
+
+    @classmethod
+    def _key(cls, groups, days):
+        return (np.asarray(groups, dtype=np.int64) << 32) | (np.asarray(days, dtype=np.int64) + cls._DAY_OFFSET)
+
+    def query(self, signatures, days):
+        """Vectorized (count, first id, last id, total) as of each day
+
+        Counts include games on the as-of day itself, so a game scored as of
+        its own date counts itself, as compute_rarity does.
+        """
+        days = np.asarray(days, dtype=np.int64)
+        groups = pd.Series(signatures, dtype=object).astype(str).map(self.groups)
+        found = groups.notna().to_numpy()
+        groups = groups.fillna(0).to_numpy(dtype=np.int64)
+
+        if len(self.starts):
+            ends = np.searchsorted(self.keys, self._key(groups, days), side='right')
+            count = np.where(found, ends - self.starts[groups], 0)
+        else:
+            ends = np.zeros(len(days), dtype=np.int64)
+            count = np.zeros(len(days), dtype=np.int64)
+
+        first = np.full(len(days), None, dtype=object)
+        last = np.full(len(days), None, dtype=object)
+        hit = count > 0
+        first[hit] = self.ids[self.starts[groups[hit]]]
+        last[hit] = self.ids[ends[hit] - 1]
+
+        total = np.searchsorted(self.all_days, days, side='right')
+        return count, first, last, total
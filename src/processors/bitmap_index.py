@@ -0,0 +1,90 @@
+"""Bitmap indexes for ad-hoc multi-stat rarity questions"""
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# Set bits per byte value, for popcounting packed bitmaps
+_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+
+class BitmapIndex:
+    """Per-column, per-value packed bitmaps over a rarity engine's games
+
+    Every (column, value) pair gets a ``np.packbits`` bitmap with one bit
+    per game in archive + current, rows in date order. Any combination of
+    conditions is answered by ORing bitmaps within a column, ANDing across
+    columns and popcounting, with no SQL or per-combination index::
+
+        index = BitmapIndex(RarityEngine('nfl', 'qb'), derived={
+            'four_td_game': lambda games: games['pass_td'] >= 4
+        })
+        index.rarity({'pass_yards_bucket': '400+', 'interceptions_bucket': '0', 'four_td_game': True})
+
+    Values are compared as strings, like ``RarityEngine.signature_key``.
+    `columns` defaults to the engine's signature columns; `derived` maps
+    extra column names to functions computing them from the games frame.
+    """
+
+    def __init__(self, engine, columns=None, derived=None):
+        self.engine = engine
+        self.columns = list(columns or engine.signature_columns)
+        self.derived = dict(derived or {})
+        self.bitmaps = {}
+        self.size = 0
+        self.ids = np.array([], dtype=object)
+        self.keys = np.array([], dtype=object)
+        self.build()
+
+    def build(self):
+        """(Re)build every bitmap from the engine's archive + current games"""
+        engine = self.engine
+        games = engine._read_all(f"SELECT * FROM {engine.union_view}")
+        if games is None:
+            games = pd.DataFrame(columns=engine._with_keys(self.columns))
+        games = games.sort_values(engine.DATE_COLUMN, kind='stable').reset_index(drop=True)
+        for name, compute in self.derived.items():
+            games[name] = compute(games)
+
+        self.size = len(games)
+        self.ids = games[engine.ID_COLUMN].to_numpy(dtype=object)
+        self.keys = engine._occurrence_keys(games)
+        self.bitmaps = {}
+        for col in self.columns + list(self.derived):
+            codes, uniques = pd.factorize(games[col].astype(str))
+            for code, value in enumerate(uniques):
+                self.bitmaps[(col, value)] = np.packbits(codes == code)
+
+        logger.info(f"Built {len(self.bitmaps)} {engine.sport} {engine.table_name} bitmaps over {self.size} games")
+
+    def mask(self, conditions):
+        """Packed bitmap of games matching every condition
+
+        `conditions` maps column -> value, or column -> list of values to
+        accept any of them.
+        """
+        result = np.packbits(np.ones(self.size, dtype=bool))
+        empty = np.zeros_like(result)
+        for col, values in conditions.items():
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            column_mask = empty
+            for value in values:
+                column_mask = column_mask | self.bitmaps.get((col, str(value)), empty)
+            result &= column_mask
+        return result
+
+    def count(self, conditions):
+        """Number of games matching every condition"""
+        return int(_POPCOUNT[self.mask(conditions)].sum())
+
+    def matches(self, conditions):
+        """Ids of matching games in date order"""
+        rows = np.flatnonzero(np.unpackbits(self.mask(conditions), count=self.size))
+        return self.ids[rows]
+
+    def rarity(self, conditions):
+        """Rarity dict, as compute_rarity returns, for an arbitrary condition set"""
+        keys = self.keys[np.flatnonzero(np.unpackbits(self.mask(conditions), count=self.size))]
+        first = self.engine._get_occurrence(keys[0]) if len(keys) else None
+        last = self.engine._get_occurrence(keys[-1]) if len(keys) else None
+        return self.engine._rarity_result(len(keys), first, last, self.size)
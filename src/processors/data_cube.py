@@ -0,0 +1,91 @@
+"""Precomputed rarity counts over every subset of signature dimensions"""
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+
+class DataCube:
+    """GROUP BY CUBE-style counts held in one dense NumPy array
+
+    Every dimension is dictionary-encoded to codes 0..r-1 plus one extra
+    "ALL" slot at index r. After counting games per cell, each axis's ALL
+    slot is filled with the sum over that axis; doing this axis by axis
+    covers every subset of dimensions. A trailing axis splits counts by
+    source database (archive/current). Any partial signature, with omitted
+    dimensions meaning "any", is then a single array read.
+    """
+
+    SOURCES = ('archive', 'current')
+    MAX_CELLS = 1 << 22
+
+    def __init__(self, frames, dims, optional_dims=()):
+        """Build from {source: DataFrame} holding at least `dims`
+
+        `optional_dims` are appended when present in every frame, and
+        dropped from the end if the cube would exceed MAX_CELLS.
+        """
+        frames = {source: frame for source, frame in frames.items() if frame is not None}
+        dims = list(dims) + [dim for dim in optional_dims
+                             if frames and all(dim in frame.columns for frame in frames.values())]
+        games = pd.concat(
+            [frame[dims].assign(_source=self.SOURCES.index(source)) for source, frame in frames.items()],
+            ignore_index=True
+        ) if frames else pd.DataFrame(columns=dims + ['_source'])
+
+        codes, self.values = [], []
+        for dim in dims:
+            dim_codes, uniques = pd.factorize(games[dim].astype(str))
+            codes.append(dim_codes)
+            self.values.append(list(uniques))
+
+        while len(dims) > 0 and self._cells(dims) > self.MAX_CELLS and dims[-1] in optional_dims:
+            logger.warning(f"Data cube too large; dropping dimension {dims[-1]}")
+            dims, codes, self.values = dims[:-1], codes[:-1], self.values[:-1]
+
+        self.dims = dims
+        self.codes = [{value: code for code, value in enumerate(values)} for values in self.values]
+        self.cube = np.zeros([len(values) + 1 for values in self.values] + [len(self.SOURCES)], dtype=np.int64)
+        np.add.at(self.cube, tuple(codes) + (games['_source'].to_numpy(dtype=np.int64),), 1)
+
+        # Fill each axis's ALL slot with the sum over that axis
+        for axis in range(len(dims)):
+            all_slot = [slice(None)] * self.cube.ndim
+            all_slot[axis] = -1
+            known = [slice(None)] * self.cube.ndim
+            known[axis] = slice(0, -1)
+            self.cube[tuple(all_slot)] = self.cube[tuple(known)].sum(axis=axis)
+
+    def _cells(self, dims):
+        return int(np.prod([len(values) + 1 for values in self.values[:len(dims)]])) * len(self.SOURCES)
+
+    def count(self, conditions=None, source=None):
+        """Games matching `conditions` ({dim: value}; omitted dims = any)
+
+        `source` limits the count to 'archive' or 'current'.
+        """
+        cell = [-1] * len(self.dims)
+        for dim, value in (conditions or {}).items():
+            if dim not in self.dims:
+                raise KeyError(f"{dim} is not a cube dimension")
+            axis = self.dims.index(dim)
+            code = self.codes[axis].get(str(value))
+            if code is None:
+                return 0
+            cell[axis] = code
+
+        counts = self.cube[tuple(cell)]
+        if source is None:
+            return int(counts.sum())
+        return int(counts[self.SOURCES.index(source)])
+
+    def distribution(self, dim, conditions=None, source=None):
+        """{value: count} of `dim` among games matching `conditions`, most common first"""
+        axis = self.dims.index(dim)
+        counts = {
+            value: self.count({**(conditions or {}), dim: value}, source)
+            for value in self.values[axis]
+        }
+        return dict(sorted(
+            ((value, count) for value, count in counts.items() if count),
+            key=lambda item: item[1], reverse=True
+        ))
@@ -0,0 +1,85 @@
+"""Dominance counting for exact "at least this stat line" rarity"""
+import numpy as np
+from loguru import logger
+
+
+class DominanceIndex:
+    """Count games whose stats are all >= a query line, in O(k log n)
+
+    Each of the k stat columns is coordinate-compressed to the ranks of its
+    sorted distinct values. A k-dimensional grid over those ranks holds the
+    number of games per cell, then a suffix cumulative sum along every axis
+    turns each cell into the count of games dominating it. A query is one
+    ``np.searchsorted`` per dimension plus a single grid read. The same
+    suffix trick with min/max over each game's ordinal in date order gives
+    the first and last dominating game.
+
+    Box stats have few distinct values, so grids stay small (NFL RB is a
+    few thousand cells). The three int32 grids take 12 bytes per cell, so
+    beyond ``MAX_CELLS`` (24 MB) the index falls back to a vectorized O(n)
+    comparison.
+    """
+
+    MAX_CELLS = 1 << 21
+
+    def __init__(self, values, days, ids):
+        self.values = np.asarray(values, dtype=np.float64).reshape(len(ids), -1)
+        self.days = np.asarray(days, dtype=np.int64)
+        self.ids = np.asarray(ids, dtype=object)
+        self.size = len(self.ids)
+
+        self.axes = [np.unique(self.values[:, dim]) for dim in range(self.values.shape[1])]
+        shape = tuple(len(axis) for axis in self.axes)
+        self.dense = self.size > 0 and int(np.prod(shape)) <= self.MAX_CELLS
+        if not self.dense:
+            if self.size:
+                logger.warning(f"Dominance grid {shape} too large; falling back to linear counts")
+            return
+
+        ranks = tuple(np.searchsorted(axis, self.values[:, dim]) for dim, axis in enumerate(self.axes))
+        # Rows in (day, row) order; a game's ordinal is its position in it
+        self.order = np.lexsort((np.arange(self.size), self.days))
+        ordinals = np.empty(self.size, dtype=np.int32)
+        ordinals[self.order] = np.arange(self.size, dtype=np.int32)
+
+        self.counts = np.zeros(shape, dtype=np.int32)
+        np.add.at(self.counts, ranks, 1)
+        self.first = np.full(shape, np.iinfo(np.int32).max, dtype=np.int32)
+        np.minimum.at(self.first, ranks, ordinals)
+        self.last = np.full(shape, -1, dtype=np.int32)
+        np.maximum.at(self.last, ranks, ordinals)
+
+        # Suffix accumulate along every axis: cell -> all cells >= it
+        for axis in range(len(shape)):
+            self.counts = np.flip(np.cumsum(np.flip(self.counts, axis), axis=axis, dtype=np.int32), axis)
+            self.first = np.flip(np.minimum.accumulate(np.flip(self.first, axis), axis=axis), axis)
+            self.last = np.flip(np.maximum.accumulate(np.flip(self.last, axis), axis=axis), axis)
+
+    def query(self, thresholds):
+        """(count, first row, last row) of games with every stat >= thresholds
+
+        Rows index into ``ids``; first/last are None when nothing dominates.
+        """
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        if self.size == 0:
+            return 0, None, None
+
+        if not self.dense:
+            dominating = np.flatnonzero((self.values >= thresholds).all(axis=1))
+            if len(dominating) == 0:
+                return 0, None, None
+            order = np.lexsort((dominating, self.days[dominating]))
+            return len(dominating), int(dominating[order[0]]), int(dominating[order[-1]])
+
+        cell = []
+        for axis, threshold in zip(self.axes, thresholds):
+            rank = np.searchsorted(axis, threshold, side='left')
+            if rank == len(axis):
+                return 0, None, None
+            cell.append(rank)
+        cell = tuple(cell)
+
+        count = int(self.counts[cell])
+        if count == 0:
+            return 0, None, None
+        return count, int(self.order[self.first[cell]]), int(self.order[self.last[cell]])
@@ -0,0 +1,169 @@
+"""Columnar in-memory rarity engine backed by NumPy integer-coded buckets"""
+import threading
+import numpy as np
+import pandas as pd
+from loguru import logger
+from .rarity_engine import RarityEngine
+
+
+class InMemoryRarityEngine(RarityEngine):
+    """RarityEngine that answers signature lookups from NumPy arrays
+
+    Archive + current games are loaded once. Each bucket column is
+    dictionary-encoded to small ints, a game's signature becomes one
+    mixed-radix integer key, and occurrence counts come from a
+    ``np.bincount`` histogram over those keys, so a lookup is a few array
+    reads. Dates are held as int32 days for first/last ordering.
+
+    Use directly for NFL positions, or wrap a sport engine with
+    ``in_memory_engine(NBARarityEngine)`` to keep its
+    ``check_current_season``. The snapshot is refreshed when either
+    database changes at the start of each batch; call ``refresh()`` to pick
+    up new data between single ``compute_rarity`` calls.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._snapshot = None
+        self._snapshot_version = None
+        self._snapshot_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def refresh(self):
+        """Load the archive + current snapshot if missing or out of date"""
+        version = (self.position, self._data_version())
+        with self._snapshot_lock:
+            if self._snapshot is None or version != self._snapshot_version:
+                self._snapshot = self._load_snapshot()
+                self._snapshot_version = version
+            return self._snapshot
+
+    def _current_snapshot(self):
+        """Loaded snapshot without a data version check, unless the position changed"""
+        snapshot = self._snapshot
+        if snapshot is None or self._snapshot_version[0] != self.position:
+            snapshot = self.refresh()
+        return snapshot
+
+    def _load_snapshot(self):
+        """Read every game once and build the encoded signature histogram"""
+        games = self._read_all(f"SELECT * FROM {self.union_view}")
+        if games is None:
+            games = pd.DataFrame(columns=self._with_keys(self.signature_columns))
+
+        # Dictionary-encode each bucket column; radix = number of distinct values
+        codes, vocab, radices = [], [], []
+        for col in self.signature_columns:
+            col_codes, uniques = pd.factorize(games[col].astype(str))
+            codes.append(col_codes.astype(np.int64))
+            vocab.append({value: code for code, value in enumerate(uniques)})
+            radices.append(max(len(uniques), 1))
+
+        strides = np.cumprod([1] + radices[:0:-1])[::-1].astype(np.int64)
+        keys = sum(col_codes * stride for col_codes, stride in zip(codes, strides))
+        keys = np.asarray(keys, dtype=np.int64)
+        key_space = int(np.prod(radices))
+
+        days = self._to_days(games[self.DATE_COLUMN])
+        keys_by_row = self._occurrence_keys(games)
+
+        # Rows ordered by (key, date), ties kept in archive-then-current order
+        order = np.lexsort((days, keys))
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])[:len(keys)]
+        ends = np.r_[starts[1:], len(keys)][:len(starts)] - 1
+
+        first_row = np.full(key_space, -1, dtype=np.int64)
+        last_row = np.full(key_space, -1, dtype=np.int64)
+        first_row[sorted_keys[starts]] = order[starts]
+        last_row[sorted_keys[ends]] = order[ends]
+
+        logger.info(f"Loaded {len(games)} {self.sport} {self.table_name} rows into memory")
+        return {
+            'total': len(games),
+            'vocab': vocab,
+            'strides': strides,
+            'histogram': np.bincount(keys, minlength=key_space),
+            'first_row': first_row,
+            'last_row': last_row,
+            'days': days,
+            'columns': {col: games[col].to_numpy(dtype=object) for col in games.columns},
+            'keys': keys_by_row,
+            'key_rows': {key: row for row, key in enumerate(keys_by_row)},
+        }
+
+    def _signature_code(self, snapshot, game):
+        """Mixed-radix key for a game's signature, or None if any bucket is unseen"""
+        key = 0
+        for col, vocab, stride in zip(self.signature_columns, snapshot['vocab'], snapshot['strides']):
+            code = vocab.get(str(game[col]))
+            if code is None:
+                return None
+            key += code * int(stride)
+        return key
+
+    def _row(self, snapshot, row):
+        if row < 0:
+            return None
+        return {col: values[row] for col, values in snapshot['columns'].items()}
+
+    def _lookup_rarity(self, game, as_of=None, version=None):
+        """Occurrence counts from the in-memory histogram"""
+        if not self.signature_columns or as_of is not None:
+            return super()._lookup_rarity(game, as_of, version)
+
+        snapshot = self._current_snapshot()
+        key = self._signature_code(snapshot, game)
+        if key is None:
+            return self._rarity_result(0, None, None, snapshot['total'])
+
+        return self._rarity_result(
+            int(snapshot['histogram'][key]),
+            self._row(snapshot, snapshot['first_row'][key]),
+            self._row(snapshot, snapshot['last_row'][key]),
+            snapshot['total']
+        )
+
+    def _lookup_rarity_batch(self, games, as_of=None):
+        """Vectorized _lookup_rarity over a DataFrame of games"""
+        if not self.signature_columns or len(games) == 0 or as_of is not None:
+            return super()._lookup_rarity_batch(games, as_of)
+
+        snapshot = self.refresh()
+        keys = np.zeros(len(games), dtype=np.int64)
+        seen = np.ones(len(games), dtype=bool)
+        for col, vocab, stride in zip(self.signature_columns, snapshot['vocab'], snapshot['strides']):
+            col_codes = games[col].astype(str).map(vocab)
+            seen &= col_codes.notna().to_numpy()
+            keys += col_codes.fillna(0).to_numpy(dtype=np.int64) * stride
+
+        count = np.where(seen, snapshot['histogram'][keys], 0)
+        occurrence_keys = snapshot['keys']
+
+        def occurrences(rows):
+            rows = np.where(seen, rows[keys], -1)
+            if len(occurrence_keys) == 0:
+                return np.full(len(rows), None, dtype=object)
+            return np.where(rows >= 0, occurrence_keys[np.maximum(rows, 0)], None)
+
+        return self._rarity_frame(
+            count, snapshot['total'],
+            occurrences(snapshot['first_row']), occurrences(snapshot['last_row']),
+            games.index
+        )
+
+    def _get_occurrence(self, occurrence_key):
+        """Fetch a game row by occurrence key from the snapshot"""
+        snapshot = self._current_snapshot()
+        row = snapshot['key_rows'].get(occurrence_key)
+        return self._row(snapshot, row) if row is not None else None
+
+
+def in_memory_engine(engine_cls):
+    """Return an in-memory variant of a sport RarityEngine subclass
+
+    The result keeps the sport's schema, databases and
+    ``check_current_season`` while scoring through InMemoryRarityEngine.
+    """
+    if issubclass(engine_cls, InMemoryRarityEngine):
+        return engine_cls
+    return type(f"InMemory{engine_cls.__name__}", (InMemoryRarityEngine, engine_cls), {})
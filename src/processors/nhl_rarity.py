@@ -1,6 +1,5 @@
 """NHL rarity engine for rare statistical performance detection"""
 import sqlite3
-import pandas as pd
 from pathlib import Path
 from loguru import logger
 from .rarity_engine import RarityEngine
@@ -9,15 +8,22 @@ from .rarity_engine import RarityEngine
 class NHLRarityEngine(RarityEngine):
     """NHL-specific rarity engine"""
 
-    def __init__(self):
-        super().__init__('nhl', 'nhl')
+    TABLE_NAME = 'games'
+    KEY_COLUMNS = ('game_id',)
+    SIGNATURE_COLUMNS = {'nhl': ('goals_bucket', 'assists_bucket', 'points_bucket', 'shots_bucket')}
+    EXACT_COLUMNS = {'nhl': ('goals', 'assists', 'shots')}
+
+    def __init__(self, read_only=False):
+        super().__init__('nhl', 'nhl', read_only=read_only)
         self.position = 'nhl'
         self.archive_db = Path("data/archive/nhl_archive.db")
         self.current_db = Path("data/current/nhl_current.db")
 
         # Initialize NHL databases
-        self._init_nhl_archive()
-        self._init_nhl_current()
+        if not read_only:
+            self._init_nhl_archive()
+            self._init_nhl_current()
+            self.ensure_indexes()
 
     def _init_nhl_archive(self):
         """Ensure NHL archive database exists"""
@@ -58,48 +64,32 @@ class NHLRarityEngine(RarityEngine):
             logger.warning("NHL current database not found - run NHLCollector first")
             self.current_db.parent.mkdir(parents=True, exist_ok=True)
 
-    def _find_games(self, game):
-        """Find matching games in NHL archive"""
-        where_clause = f"""
-            goals_bucket = '{game['goals_bucket']}'
-            AND assists_bucket = '{game['assists_bucket']}'
-            AND points_bucket = '{game['points_bucket']}'
-            AND shots_bucket = '{game['shots_bucket']}'
-        """
-        query = f"""
-            SELECT * FROM games
-            WHERE {where_clause}
-            ORDER BY game_date ASC
-        """
-
-        dfs = []
-        for db in [self.archive_db, self.current_db]:
-            if db.exists():
-                try:
-                    conn = sqlite3.connect(db)
-                    df = pd.read_sql(query, conn)
-                    conn.close()
-                    dfs.append(df)
-                except Exception as e:
-                    logger.warning(f"Error querying {db}: {e}")
-                    pass
-
-        return pd.concat(dfs) if dfs else pd.DataFrame()
-
-    def _get_total_games(self):
-        """Count all games in NHL dataset"""
-        total = 0
-        for db in [self.archive_db, self.current_db]:
-            if db.exists():
-                try:
-                    conn = sqlite3.connect(db)
-                    res = conn.execute("SELECT COUNT(*) FROM games").fetchone()
-                    total += res[0]
-                    conn.close()
-                except Exception as e:
-                    logger.warning(f"Error counting games in {db}: {e}")
-                    pass
-        return total
+    def iter_current_season(self, changed=None):
+        """Yield rare NHL performances in the current season, one batch of games at a time"""
+        query = "SELECT * FROM games ORDER BY game_date DESC"
+        for game, rarity in self._stream_rare(query, changed=changed):
+            yield {
+                'player_name': game['player_name'],
+                'home_team': game['home_team'],
+                'away_team': game['away_team'],
+                'game_date': game['game_date'],
+                'goals': game['goals'],
+                'assists': game['assists'],
+                'points': game['points'],
+                'shots': game['shots'],
+                'plus_minus': game['plus_minus'],
+                'penalty_minutes': game['penalty_minutes'],
+                'time_on_ice': game['time_on_ice'],
+                'position': game['position'],
+                'goals_bucket': game['goals_bucket'],
+                'assists_bucket': game['assists_bucket'],
+                'points_bucket': game['points_bucket'],
+                'shots_bucket': game['shots_bucket'],
+                'occurrence_count': rarity['occurrence_count'],
+                'rarity_score': rarity['rarity_score'],
+                'percentile': rarity['percentile'],
+                'classification': rarity['classification']
+            }
 
     def check_current_season(self):
         """Check for rare NHL performances in current season"""
@@ -108,106 +98,19 @@ class NHLRarityEngine(RarityEngine):
             return []
 
         logger.info("Checking current NHL season for rare performances...")
-        rare_performances = []
-
-        conn = sqlite3.connect(self.current_db)
-        games = conn.execute("""
-            SELECT * FROM games
-            ORDER BY game_date DESC
-        """).fetchall()
-        conn.close()
-
-        logger.info(f"Analyzing {len(games)} NHL game performances")
-
-        for game in games:
-            # Convert to dict
-            game_dict = {
-                'game_id': game[0],
-                'player_id': game[1],
-                'player_name': game[2],
-                'season': game[3],
-                'game_date': game[4],
-                'home_team': game[5],
-                'away_team': game[6],
-                'goals': game[7],
-                'assists': game[8],
-                'points': game[9],
-                'shots': game[10],
-                'plus_minus': game[11],
-                'penalty_minutes': game[12],
-                'time_on_ice': game[13],
-                'position': game[14],
-                'goals_bucket': game[15],
-                'assists_bucket': game[16],
-                'points_bucket': game[17],
-                'shots_bucket': game[18]
-            }
-
-            # Calculate rarity
-            rarity = self.compute_rarity(game_dict)
-
-            # Only include rare performances
-            if rarity['classification'] != 'common':
-                rare_performances.append({
-                    'player_name': game_dict['player_name'],
-                    'home_team': game_dict['home_team'],
-                    'away_team': game_dict['away_team'],
-                    'game_date': game_dict['game_date'],
-                    'goals': game_dict['goals'],
-                    'assists': game_dict['assists'],
-                    'points': game_dict['points'],
-                    'shots': game_dict['shots'],
-                    'plus_minus': game_dict['plus_minus'],
-                    'penalty_minutes': game_dict['penalty_minutes'],
-                    'time_on_ice': game_dict['time_on_ice'],
-                    'position': game_dict['position'],
-                    'goals_bucket': game_dict['goals_bucket'],
-                    'assists_bucket': game_dict['assists_bucket'],
-                    'points_bucket': game_dict['points_bucket'],
-                    'shots_bucket': game_dict['shots_bucket'],
-                    'occurrence_count': rarity['occurrence_count'],
-                    'rarity_score': rarity['rarity_score'],
-                    'classification': rarity['classification']
-                })
 
         # Sort by rarity score (highest first)
-        rare_performances.sort(key=lambda x: x['rarity_score'], reverse=True)
+        rare_performances = sorted(self.iter_current_season(), key=lambda x: x['rarity_score'], reverse=True)
 
         logger.success(f"Found {len(rare_performances)} rare NHL performances")
         return rare_performances
 
     def get_archive_summary(self):
         """Get summary of NHL archive data"""
-        conn = sqlite3.connect(self.archive_db)
-        total_games = conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
-
-        # Bucket distributions
-        goals_dist = conn.execute("""
-            SELECT goals_bucket, COUNT(*) as count
-            FROM games
-            GROUP BY goals_bucket
-            ORDER BY count DESC
-        """).fetchall()
-
-        assists_dist = conn.execute("""
-            SELECT assists_bucket, COUNT(*) as count
-            FROM games
-            GROUP BY assists_bucket
-            ORDER BY count DESC
-        """).fetchall()
-
-        points_dist = conn.execute("""
-            SELECT points_bucket, COUNT(*) as count
-            FROM games
-            GROUP BY points_bucket
-            ORDER BY count DESC
-        """).fetchall()
-
-        conn.close()
-
+        cube = self.data_cube()
         return {
-            'total_games': total_games,
-            'goals_distribution': dict(goals_dist),
-            'assists_distribution': dict(assists_dist),
-            'points_distribution': dict(points_dist)
+            'total_games': cube.count(source='archive'),
+            'goals_distribution': cube.distribution('goals_bucket', source='archive'),
+            'assists_distribution': cube.distribution('assists_bucket', source='archive'),
+            'points_distribution': cube.distribution('points_bucket', source='archive')
         }
\ No newline at end of file
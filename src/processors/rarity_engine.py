@@ -1,18 +1,575 @@
 """Core rarity computation engine"""
+import copy
+import re
 import sqlite3
+import threading
+import numpy as np
 import pandas as pd
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 from loguru import logger
+from utils.buckets import POSITION_BUCKETS
+from utils.change_feed import feed_position, last_write, read_changes
+from utils.db_pool import ConnectionPool
+from utils.sketches import SignatureSketch, TDigest, load_digests, save_digests, sketch_path
+from utils.table_stats import cached_row_count
+from .as_of_index import AsOfIndex
+from .data_cube import DataCube
+from .dominance_index import DominanceIndex
+
+# Bucket columns that make up a rarity signature for each NFL position;
+# shared with the collectors and loaders that write them
+POSITION_SIGNATURES = POSITION_BUCKETS
+
+# Raw stat columns for exact "at least this line" rarity; higher is better
+POSITION_EXACT_STATS = {
+    'qb': ('pass_yards', 'pass_td'),
+    'rb': ('rush_yards', 'rush_td'),
+    'wr': ('receiving_yards', 'receptions', 'receiving_td'),
+    'te': ('receiving_yards', 'receptions', 'receiving_td'),
+}
+
 
 class RarityEngine:
-    def __init__(self, sport: str, position: str):
+    # Table layout; sport engines override these for their own schema
+    TABLE_NAME = '{position}_games'
+    DATE_COLUMN = 'game_date'
+    ID_COLUMN = 'game_id'
+    # Columns that identify one row; NFL tables hold a row per player per game
+    KEY_COLUMNS = ('game_id', 'player_id')
+    SIGNATURE_COLUMNS = POSITION_SIGNATURES
+    EXACT_COLUMNS = POSITION_EXACT_STATS
+    CUBE_COLUMNS = ('season', 'team')
+    POOL_SIZE = 4
+    MEMO_SIZE = 4096
+    FETCH_SIZE = 1000
+    # Bound values per query, within SQLite's oldest SQLITE_MAX_VARIABLE_NUMBER default
+    MAX_QUERY_VARIABLES = 999
+    PLAYER_COLUMN = 'player_id'
+    SKETCH_CHUNK_SIZE = 100000
+
+    def __init__(self, sport: str, position: str, read_only: bool = False):
         self.sport = sport
         self.position = position
+        # Read-only engines open every database with mode=ro and never issue DDL
+        self.read_only = read_only
         self.archive_db = Path(f"data/archive/{sport}_archive.db")
         self.current_db = Path(f"data/current/{sport}_current.db")
+        self.index_db = Path(f"data/index/{sport}_index.db")
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+        self._views = {}
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self._memo_version = None
+        self._version_probes = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+        # Optional ShardedScorer used to score current-season batches across processes
+        self.scorer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close all pooled database connections"""
+        with self._pools_lock:
+            pools, self._pools = list(self._pools.values()), {}
+            self._views = {}
+        with self._memo_lock:
+            probes, self._version_probes = list(self._version_probes.values()), {}
+        pools += probes
+        for pool in pools:
+            pool.close()
+
+    @contextmanager
+    def _connect(self, db):
+        """Borrow a long-lived connection to the archive, current or index database
+
+        The archive is opened read-only, as is every database of a
+        ``read_only`` engine; every database gets its own small pool so
+        engines can be shared across threads.
+        """
+        with self._pools_lock:
+            pool = self._pools.get(db)
+            if pool is None:
+                pool = ConnectionPool(
+                    db,
+                    size=self.POOL_SIZE,
+                    read_only=(self.read_only or db == self.archive_db),
+                    create=(not self.read_only and db == self.index_db)
+                )
+                self._pools[db] = pool
+        with pool.connection() as conn:
+            yield conn
+
+    @contextmanager
+    def _connect_all(self):
+        """Borrow a connection that sees archive + current as one table
+
+        The current database is ATTACHed (read-only) to a pooled archive
+        connection and exposed through the TEMP view ``union_view``. Yields
+        None when neither database exists.
+        """
+        if self.archive_db.exists():
+            db = self.archive_db
+        elif self.current_db.exists():
+            db = self.current_db
+        else:
+            yield None
+            return
+
+        with self._connect(db) as conn:
+            self._prepare_union_view(conn, attach_current=(db == self.archive_db))
+            yield conn
+
+    def _prepare_union_view(self, conn, attach_current):
+        """Attach the current DB and (re)create the UNION ALL view if schemas changed"""
+        schemas = {row[1] for row in conn.execute("PRAGMA database_list")}
+        if attach_current and 'current_db' not in schemas and self.current_db.exists():
+            conn.execute(
+                "ATTACH DATABASE ? AS current_db",
+                (f"{self.current_db.resolve().as_uri()}?mode=ro",)
+            )
+            schemas.add('current_db')
+
+        sources = [schema for schema in ['main', 'current_db'] if schema in schemas]
+        schema_key = tuple(
+            conn.execute(f"PRAGMA {schema}.schema_version").fetchone()[0] for schema in sources
+        ) + tuple(sources)
+        view_key = (id(conn), self.union_view)
+        if self._views.get(view_key) == schema_key:
+            return
+
+        tables = []
+        for schema in sources:
+            columns = [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({self.table_name})")]
+            if columns:
+                tables.append((schema, columns))
+        if not tables:
+            raise sqlite3.OperationalError(f"no such table: {self.table_name}")
+
+        # Only columns present on both sides can be UNIONed
+        common = [col for col in tables[0][1] if all(col in columns for _, columns in tables)]
+        selects = [f"SELECT {', '.join(common)} FROM {schema}.{self.table_name}" for schema, _ in tables]
+        conn.execute(f"DROP VIEW IF EXISTS temp.{self.union_view}")
+        conn.execute(f"CREATE TEMP VIEW {self.union_view} AS {' UNION ALL '.join(selects)}")
+        self._views[view_key] = schema_key
+
+    def _read_all(self, query, params=()):
+        """Run one query against ``union_view``; None if no database has the table"""
+        try:
+            with self._connect_all() as conn:
+                if conn is None:
+                    return None
+                return pd.read_sql(query, conn, params=params)
+        except Exception as e:
+            logger.warning(f"Error querying {self.sport} {self.table_name}: {e}")
+            return None
+
+    @property
+    def table_name(self):
+        return self.TABLE_NAME.format(position=self.position)
+
+    @property
+    def exact_columns(self):
+        return list(self.EXACT_COLUMNS.get(self.position, ()))
+
+    @property
+    def union_view(self):
+        return f"all_{self.table_name}"
+
+    @property
+    def signature_columns(self):
+        return list(self.SIGNATURE_COLUMNS.get(self.position, ()))
+
+    @property
+    def key_columns(self):
+        return list(self.KEY_COLUMNS)
+
+    def _with_keys(self, columns):
+        """`columns` plus the key and date columns, without duplicates"""
+        return list(dict.fromkeys(list(columns) + self.key_columns + [self.DATE_COLUMN]))
+
+    def _occurrence_keys(self, games):
+        """Each row's occurrence key: its KEY_COLUMNS values joined with '|'"""
+        key_cols = self.key_columns
+        return games[key_cols[0]].astype(str).str.cat(
+            [games[col].astype(str) for col in key_cols[1:]], sep='|'
+        ).to_numpy(dtype=object)
+
+    def signature_key(self, game):
+        """Encode a game's bucket signature as a single lookup key"""
+        return '|'.join(str(game[col]) for col in self.signature_columns)
+
+    def compute_rarity(self, game: pd.Series, as_of=None, percentile=False) -> dict:
+        """Compute how rare a performance is
+
+        Signature engines memoize results in an LRU keyed by
+        (sport, position, signature, data version), so repeated stat lines
+        cost a dict lookup until either database changes. With `as_of` (a
+        date) only games played on or before that date are counted. With
+        `percentile`, 'percentile' places the game's raw
+        ``percentile_column`` stat among every game's (None if the game has
+        no such stat).
+        """
+        if not percentile:
+            return self._lookup_rarity(game, as_of)
+        # One data version probe serves both the memo and the digests
+        version = self._data_version()
+        rarity = self._lookup_rarity(game, as_of, version)
+        rarity['percentile'] = self.percentile(game, version)
+        return rarity
+
+    def _lookup_rarity(self, game, as_of=None, version=None):
+        """Occurrence-based part of compute_rarity; `version` is a _data_version() already probed"""
+        if as_of is not None:
+            return self._compute_rarity_as_of(game, as_of)
+        if not self.signature_columns:
+            return self._compute_rarity(game)
+
+        if version is None:
+            version = self._data_version()
+        key = (self.sport, self.position, self.signature_key(game), version)
+        with self._memo_lock:
+            if version != self._memo_version:
+                # Data changed: every cached result is stale
+                self._memo.clear()
+                self._memo_version = version
+            result = self._memo.get(key)
+            if result is not None:
+                self._memo.move_to_end(key)
+                self.memo_hits += 1
+                return copy.deepcopy(result)
+            self.memo_misses += 1
+
+        result = self._compute_rarity(game)
+        with self._memo_lock:
+            if version == self._memo_version:
+                self._memo[key] = result
+                if len(self._memo) > self.MEMO_SIZE:
+                    self._memo.popitem(last=False)
+        return copy.deepcopy(result)
+
+    def compute_exact_rarity(self, game) -> dict:
+        """Compute how rare "at least this stat line" is, without buckets
+
+        Counts archive + current games where every ``exact_columns`` stat is
+        >= this game's (e.g. >= 212 rush yards AND >= 3 TDs) through a
+        DominanceIndex, and returns the same dict as compute_rarity.
+        """
+        index = self._dominance_index()
+        count, first_row, last_row = index.query([game[col] for col in self.exact_columns])
+        return self._rarity_result(
+            count,
+            self._get_occurrence(index.ids[first_row]) if count else None,
+            self._get_occurrence(index.ids[last_row]) if count else None,
+            index.size
+        )
+
+    def _compute_rarity_as_of(self, game, as_of):
+        """compute_rarity counting only games played on or before `as_of`"""
+        count, first, last, total = self._as_of_index().query(
+            [self.signature_key(game)], self._to_days([as_of])
+        )
+        count = int(count[0])
+        return self._rarity_result(
+            count,
+            self._get_occurrence(first[0]) if count else None,
+            self._get_occurrence(last[0]) if count else None,
+            int(total[0])
+        )
+
+    def _as_of_index(self):
+        """AsOfIndex over signature dates, rebuilt when either database changes"""
+        if not self.signature_columns:
+            raise ValueError(f"No signature columns defined for {self.sport} {self.position}")
+        return self._versioned('as_of', self._build_as_of_index)
+
+    def _build_as_of_index(self):
+        columns = self._with_keys(self.signature_columns)
+        games = self._read_all(f"SELECT {', '.join(columns)} FROM {self.union_view}")
+        if games is None:
+            games = pd.DataFrame(columns=columns)
+        return AsOfIndex(
+            self._signature_strings(games) if len(games) else [],
+            self._to_days(games[self.DATE_COLUMN]),
+            self._occurrence_keys(games)
+        )
+
+    def all_time_leaderboard(self, top_n=50, max_occurrences=25):
+        """Rarest games in archive + current, each scored as of its own date
+
+        Point-in-time scoring means later games never make an earlier
+        performance look common. Returns up to `top_n` {'game', 'rarity'}
+        dicts with at most `max_occurrences`, ordered by rarity_score, then
+        date and id so the board is stable between runs.
+        """
+        index = self._as_of_index()
+        count, first, last, total = index.query(index.signatures, index.days)
+        rarities = self._rarity_frame(count, total, first, last, pd.RangeIndex(index.size))
+
+        score = rarities['rarity_score'].to_numpy()
+        rare = np.flatnonzero(count <= max_occurrences)
+        order = rare[np.lexsort((index.ids[rare].astype(str), index.days[rare], -score[rare]))][:top_n]
+
+        return [
+            {
+                'game': self._get_occurrence(index.ids[row]),
+                'rarity': self.resolve_occurrences(rarities.iloc[row].to_dict())
+            }
+            for row in order
+        ]
+
+    def _dominance_index(self):
+        """DominanceIndex over exact_columns, rebuilt when either database changes"""
+        if not self.exact_columns:
+            raise ValueError(f"No exact stat columns defined for {self.sport} {self.position}")
+
+        return self._versioned('dominance', self._build_dominance_index)
+
+    def _build_dominance_index(self):
+        columns = self._with_keys(self.exact_columns)
+        games = self._read_all(f"SELECT {', '.join(columns)} FROM {self.union_view}")
+        if games is None:
+            games = pd.DataFrame(columns=columns)
+        games = games.sort_values(self.DATE_COLUMN, kind='stable')
+
+        days = self._to_days(games[self.DATE_COLUMN])
+        values = games[self.exact_columns].apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy()
+        return DominanceIndex(values, days, self._occurrence_keys(games))
+
+    def _versioned(self, name, build, version=None):
+        """Cache a structure derived from the data until either database changes"""
+        key = (name, self.position)
+        if version is None:
+            version = self._data_version()
+        with self._derived_lock:
+            cached = self._derived.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            value = build()
+            self._derived[key] = (version, value)
+            return value
+
+    def data_cube(self):
+        """DataCube over signature columns plus CUBE_COLUMNS, split by archive/current"""
+        if not self.signature_columns:
+            raise ValueError(f"No signature columns defined for {self.sport} {self.position}")
+        return self._versioned('cube', self._build_data_cube)
+
+    def _build_data_cube(self):
+        frames = {}
+        for source, db in [('archive', self.archive_db), ('current', self.current_db)]:
+            if not db.exists():
+                continue
+            try:
+                with self._connect(db) as conn:
+                    available = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table_name})")}
+                    columns = [col for col in self.signature_columns + list(self.CUBE_COLUMNS) if col in available]
+                    if set(self.signature_columns) <= available:
+                        frames[source] = pd.read_sql(f"SELECT {', '.join(columns)} FROM {self.table_name}", conn)
+            except Exception as e:
+                logger.warning(f"Error reading {db} for data cube: {e}")
+        return DataCube(frames, self.signature_columns, self.CUBE_COLUMNS)
+
+    def compute_partial_rarity(self, conditions, source=None) -> dict:
+        """Rarity of a partial signature from the data cube
+
+        `conditions` maps any subset of signature columns, season or team to
+        a value; omitted columns match anything (e.g. points_bucket='50+'
+        with any rebounds). First/last occurrences are not tracked by the
+        cube and are returned as None.
+        """
+        cube = self.data_cube()
+        return self._rarity_result(
+            cube.count(conditions, source), None, None, cube.count({}, source)
+        )
+
+    @property
+    def sketch_path(self):
+        return sketch_path(self.sport, self.table_name)
+
+    def build_sketch(self):
+        """Rebuild the SignatureSketch of exact stat lines from archive + current and save it
+
+        Reads ``SKETCH_CHUNK_SIZE`` rows at a time, so memory stays bounded
+        by the sketch rather than the table.
+        """
+        sketch = SignatureSketch(self.exact_columns, self.PLAYER_COLUMN)
+        try:
+            with self._connect_all() as conn:
+                if conn is not None:
+                    for games in pd.read_sql(f"SELECT * FROM {self.union_view}", conn,
+                                             chunksize=self.SKETCH_CHUNK_SIZE):
+                        sketch.add(games)
+        except Exception as e:
+            logger.warning(f"Error building {self.sport} {self.table_name} sketch: {e}")
+            return sketch
+        sketch.save(self.sketch_path)
+        return sketch
+
+    def sketch(self):
+        """Saved SignatureSketch, rebuilt if it no longer covers every game"""
+        if not self.exact_columns:
+            raise ValueError(f"No exact stat columns defined for {self.sport} {self.position}")
+        return self._versioned('sketch', self._load_sketch)
+
+    def _load_sketch(self):
+        sketch = SignatureSketch.load(self.sketch_path)
+        if sketch is None or sketch.columns != self.exact_columns or sketch.total != self._get_total_games():
+            sketch = self.build_sketch()
+        return sketch
+
+    def compute_approximate_rarity(self, game) -> dict:
+        """Approximate rarity of a game's exact stat line from the constant-memory sketch
+
+        occurrence_count is the number of games with exactly this game's
+        ``exact_columns`` values (bucket signatures are already counted
+        exactly by bucket_counts). It never undercounts, and overcounts by
+        more than 'error_bound' games with probability at most
+        1 - 'confidence'.
+        First/last occurrences are not tracked and are returned as None.
+        """
+        sketch = self.sketch()
+        count = int(sketch.estimate(pd.DataFrame([dict(game)]))[0])
+        rarity = self._rarity_result(count, None, None, sketch.total)
+        rarity['error_bound'] = sketch.counts.error_bound
+        rarity['confidence'] = 1 - sketch.counts.delta
+        return rarity
+
+    def sketch_summary(self):
+        """Approximate game, player and signature counts with their error bounds"""
+        return self.sketch().summary()
+
+    @property
+    def percentile_column(self):
+        """Raw stat reported as 'percentile': the first of exact_columns"""
+        return self.exact_columns[0] if self.exact_columns else None
+
+    def quantile_digests(self, version=None):
+        """{stat: TDigest} for every exact column over archive + current
+
+        The archive digests are built once, saved next to the index and
+        reused until the archive file changes; the current season is
+        digested on each data change and merged in.
+        """
+        if not self.exact_columns:
+            raise ValueError(f"No exact stat columns defined for {self.sport} {self.position}")
+        return self._versioned('quantiles', self._merge_digests, version)
+
+    def _merge_digests(self):
+        current = self._build_digests(self.current_db)
+        return {col: digest.merge(current[col]) for col, digest in self._archive_digests().items()}
+
+    def _archive_digests(self):
+        path = sketch_path(self.sport, self.table_name, 'quantiles')
+        source = self._db_fingerprint(self.archive_db)
+        digests, saved_source = load_digests(path)
+        if digests is not None and saved_source == source and set(digests) == set(self.exact_columns):
+            return digests
+        digests = self._build_digests(self.archive_db)
+        save_digests(path, digests, source)
+        return digests
+
+    def _build_digests(self, db):
+        """TDigest of each exact column in one database, read in chunks"""
+        digests = {col: TDigest() for col in self.exact_columns}
+        if not db.exists():
+            return digests
+        try:
+            with self._connect(db) as conn:
+                available = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table_name})")}
+                columns = [col for col in self.exact_columns if col in available]
+                if columns:
+                    for games in pd.read_sql(f"SELECT {', '.join(columns)} FROM {self.table_name}", conn,
+                                             chunksize=self.SKETCH_CHUNK_SIZE):
+                        for col in columns:
+                            digests[col].add(games[col])
+        except Exception as e:
+            logger.warning(f"Error reading {db} for quantile digests: {e}")
+        return digests
+
+    def percentile(self, game, version=None):
+        """Percentile of the game's percentile_column stat, e.g. 99.97; None if unknown"""
+        col = self.percentile_column
+        if col is None or col not in game or pd.isna(game[col]):
+            return None
+        value = self.quantile_digests(version)[col].percentile([game[col]])[0]
+        return None if np.isnan(value) else round(float(value), 2)
+
+    def _percentile_array(self, games):
+        """Vectorized percentile over a DataFrame, None where unknown"""
+        col = self.percentile_column
+        if col is None or col not in games.columns or len(games) == 0:
+            return np.full(len(games), None, dtype=object)
+        values = np.round(self.quantile_digests()[col].percentile(games[col]), 2).astype(object)
+        values[pd.isna(values)] = None
+        return values
+
+    @staticmethod
+    def _to_days(dates):
+        """Dates as int32 days since the epoch; unparseable dates sort last"""
+        days = pd.to_datetime(dates, errors='coerce').to_numpy(dtype='datetime64[D]').astype('int64')
+        return np.where(days == np.iinfo(np.int64).min, np.iinfo(np.int32).max, days).astype(np.int32)
+
+    def memo_stats(self):
+        """Hit/miss counters and size of the compute_rarity memo"""
+        with self._memo_lock:
+            return {'hits': self.memo_hits, 'misses': self.memo_misses, 'size': len(self._memo)}
+
+    def _data_version(self):
+        """Change token for archive + current: file mtime/size plus PRAGMA data_version"""
+        versions = []
+        for db in [self.archive_db, self.current_db]:
+            if not db.exists():
+                versions.append(None)
+                continue
+            stat = db.stat()
+            versions.append((stat.st_mtime_ns, stat.st_size, self._pragma_data_version(db)))
+        return tuple(versions)
+
+    def _pragma_data_version(self, db):
+        """PRAGMA data_version from one long-lived probe connection per database
+
+        The value is only comparable on a single connection, so each database
+        gets a dedicated one rather than whichever pooled connection is free.
+        """
+        with self._memo_lock:
+            probe = self._version_probes.get(db)
+            if probe is None:
+                probe = self._version_probes[db] = ConnectionPool(db, size=1, read_only=True)
+        try:
+            with probe.connection() as conn:
+                return conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error:
+            return None
+
+    def _compute_rarity(self, game):
+        """Uncached rarity lookup behind compute_rarity"""
+        if self.signature_columns:
+            bucket = self._lookup_bucket(game)
+            if bucket is not None:
+                count, first_id, last_id, total = bucket
+                return self._rarity_result(
+                    count,
+                    self._get_occurrence(first_id) if count else None,
+                    self._get_occurrence(last_id) if count else None,
+                    total
+                )
+
+        summary = self._occurrence_summary(game)
+        if summary is not None:
+            count, first, last = summary
+            return self._rarity_result(count, first, last, self._get_total_games())
 
-    def compute_rarity(self, game: pd.Series) -> dict:
-        """Compute how rare a performance is"""
         matches = self._find_matches(game)
 
         if matches is None or len(matches) == 0:
@@ -24,7 +581,65 @@ class RarityEngine:
             first = matches.iloc[0].to_dict()
             last = matches.iloc[-1].to_dict()
 
-        total = self._get_total_games()
+        return self._rarity_result(count, first, last, self._get_total_games())
+
+    def compute_rarity_batch(self, games: pd.DataFrame, as_of=None, percentile=False) -> pd.DataFrame:
+        """Compute rarity for a whole DataFrame of games in one pass
+
+        Joins each game's bucket signature against the bucket_counts index
+        instead of querying per row. Returns a DataFrame aligned with
+        ``games.index`` holding occurrence_count, rarity_score, classification,
+        total_games and the first/last occurrence keys, plus percentile with
+        `percentile`. `as_of` is a date, or dates aligned with `games` (e.g.
+        ``games['game_date']``), limiting each count to games played on or
+        before it.
+        """
+        rarities = self._lookup_rarity_batch(games, as_of)
+        if percentile:
+            rarities['percentile'] = self._percentile_array(games)
+        return rarities
+
+    def _lookup_rarity_batch(self, games, as_of=None):
+        """Occurrence-based part of compute_rarity_batch"""
+        columns = ['occurrence_count', 'rarity_score', 'classification', 'total_games',
+                   'first_occurrence', 'last_occurrence']
+        if len(games) == 0:
+            return pd.DataFrame(columns=columns, index=games.index)
+
+        if as_of is not None:
+            if np.ndim(as_of) == 0:
+                as_of = [as_of] * len(games)
+            count, first, last, total = self._as_of_index().query(
+                self._signature_strings(games), self._to_days(as_of)
+            )
+            return self._rarity_frame(count, total, first, last, games.index)
+
+        counts = self._load_bucket_counts() if self.signature_columns else None
+        if counts is None:
+            # No usable index: fall back to scoring row by row
+            results = [self._lookup_rarity(game) for _, game in games.iterrows()]
+            return pd.DataFrame(results, index=games.index)[columns]
+
+        counts, total = counts
+        signatures = self._signature_strings(games)
+        merged = signatures.to_frame('signature').merge(counts, on='signature', how='left')
+        merged = merged.astype(object).where(merged.notna(), None)
+
+        count = merged['occurrence_count'].fillna(0).astype(int).to_numpy()
+        return self._rarity_frame(
+            count, total, merged['first_id'].to_numpy(), merged['last_id'].to_numpy(), games.index
+        )
+
+    def resolve_occurrences(self, rarity):
+        """Replace first/last occurrence keys from compute_rarity_batch with full rows"""
+        rarity = dict(rarity)
+        for key in ['first_occurrence', 'last_occurrence']:
+            if rarity.get(key) is not None and not isinstance(rarity[key], dict):
+                rarity[key] = self._get_occurrence(rarity[key])
+        return rarity
+
+    def _rarity_result(self, count, first, last, total):
+        """Assemble the rarity dict for an occurrence count"""
         score = 100 * (1 - (count / total)) ** 2 if total > 0 else 100
 
         return {
@@ -36,65 +651,558 @@ class RarityEngine:
             'total_games': total
         }
 
-    def _find_matches(self, game):
-        """Find matching stat lines in archive + current"""
-        # Build WHERE clause based on position
-        if self.position == 'qb':
-            where_clause = f"""
-                pass_yards_bucket = '{game['pass_yards_bucket']}'
-                AND pass_td_bucket = '{game['pass_td_bucket']}'
-                AND interceptions_bucket = '{game['interceptions_bucket']}'
-            """
-        elif self.position == 'rb':
-            where_clause = f"""
-                rush_yards_bucket = '{game['rush_yards_bucket']}'
-                AND rush_td_bucket = '{game['rush_td_bucket']}'
-                AND fumbles_bucket = '{game['fumbles_bucket']}'
-            """
-        elif self.position in ['wr', 'te']:
-            where_clause = f"""
-                receptions_bucket = '{game['receptions_bucket']}'
-                AND receiving_yards_bucket = '{game['receiving_yards_bucket']}'
-                AND receiving_td_bucket = '{game['receiving_td_bucket']}'
-            """
-        else:
-            # Default to just match on player_id if position unknown
-            where_clause = f"player_id = '{game['player_id']}'"
+    def _signature_strings(self, games):
+        """Vectorized signature_key over a DataFrame"""
+        sig_cols = self.signature_columns
+        return games[sig_cols[0]].astype(str).str.cat(
+            [games[col].astype(str) for col in sig_cols[1:]], sep='|'
+        )
 
-        query = f"""
-            SELECT * FROM {self.position}_games
-            WHERE {where_clause}
-            ORDER BY game_date ASC
+    def _rarity_frame(self, count, total, first_ids, last_ids, index):
+        """Vectorized _rarity_result for compute_rarity_batch; total may be per game"""
+        total = np.asarray(total)
+        score = np.where(total > 0, np.round(100 * (1 - count / np.maximum(total, 1)) ** 2, 2), 100.0)
+
+        return pd.DataFrame({
+            'occurrence_count': count,
+            'rarity_score': score,
+            'classification': self._classify_array(count),
+            'total_games': total,
+            'first_occurrence': first_ids,
+            'last_occurrence': last_ids
+        }, index=index)
+
+    def _stream_current(self, query, params=(), changed=None):
+        """Yield the current database's rows for `query` as DataFrame batches
+
+        Batches hold FETCH_SIZE rows, or FETCH_SIZE per worker with a
+        scorer. Rows are fetched as sqlite3.Row, so columns keep their names
+        from the table schema, and only one batch is held in memory at a time.
+        With `changed` (signature keys) only games with one of those
+        signatures are read, MAX_QUERY_VARIABLES bound values per query.
+        """
+        if not self.current_db.exists():
+            return
+        batch_size = self.FETCH_SIZE * (self.scorer.workers if self.scorer is not None else 1)
+        with self._connect(self.current_db) as conn:
+            for chunk_query, chunk_params in self._changed_queries(query, tuple(params), changed):
+                cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
+                cursor.execute(chunk_query, chunk_params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield pd.DataFrame([tuple(row) for row in rows], columns=rows[0].keys())
+
+    def _changed_queries(self, query, params, changed):
+        """(query, params) pairs that together read `query`'s rows with a `changed` signature"""
+        if changed is None:
+            yield query, params
+            return
+        width = len(self.signature_columns)
+        per_query = max(1, (self.MAX_QUERY_VARIABLES - len(params)) // width)
+        changed = sorted(changed)
+        for start in range(0, len(changed), per_query):
+            chunk = changed[start:start + per_query]
+            placeholders = ', '.join(['(' + ', '.join(['?'] * width) + ')'] * len(chunk))
+            yield (
+                f"SELECT * FROM ({query}) WHERE ({', '.join(self.signature_columns)}) IN (VALUES {placeholders})",
+                params + tuple(value for signature in chunk for value in signature.split('|'))
+            )
+
+    def _stream_rare(self, query, params=(), changed=None):
+        """Score current-season rows batch by batch, yielding (game, rarity) for non-common games
+
+        Percentiles are only looked up for the rare games, in this process.
+        """
+        for games in self._stream_current(query, params, changed):
+            if self.scorer is not None:
+                rarities = self.scorer.score(games, position=self.position)
+            else:
+                rarities = self.compute_rarity_batch(games)
+            rare = (rarities['classification'] != 'common').to_numpy()
+            games = games[rare]
+            rarities = rarities[rare].assign(percentile=self._percentile_array(games))
+            yield from zip(games.to_dict('records'), rarities.to_dict('records'))
+
+    def _source_fingerprint(self):
+        """Identify the current state of the archive and current databases and the key format"""
+        fingerprints = [self._db_fingerprint(db) for db in [self.archive_db, self.current_db]]
+        return '|'.join(fingerprints + [','.join(self.key_columns)])
+
+    def _archive_fingerprint(self):
+        """_source_fingerprint for the archive alone, as recorded for change feed updates"""
+        return f"{self._db_fingerprint(self.archive_db)}|{','.join(self.key_columns)}"
+
+    @staticmethod
+    def _db_fingerprint(db):
+        if not db.exists():
+            return 'missing'
+        stat = db.stat()
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _init_index_db(self, conn):
+        """Create the bucket count index tables"""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS bucket_counts (
+                position TEXT,
+                signature TEXT,
+                occurrence_count INTEGER,
+                first_id TEXT,
+                last_id TEXT,
+                PRIMARY KEY (position, signature)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS bucket_builds (
+                position TEXT PRIMARY KEY,
+                fingerprint TEXT,
+                total_games INTEGER,
+                built_at TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS bucket_feed (
+                position TEXT PRIMARY KEY,
+                archive_fingerprint TEXT,
+                feed_seq INTEGER,
+                current_rows INTEGER,
+                last_write TEXT
+            )
+        """)
+
+    def build_bucket_counts(self):
+        """Rebuild the bucket_counts index with one GROUP BY pass over archive + current"""
+        if not self.signature_columns:
+            raise ValueError(f"No signature columns defined for {self.sport} {self.position}")
+
+        fingerprint = self._source_fingerprint()
+        feed_seq, current_rows, written = self._current_feed_state()
+        columns = self._with_keys(self.signature_columns)
+        games = self._read_all(f"SELECT {', '.join(columns)} FROM {self.union_view}")
+        if games is None:
+            games = pd.DataFrame(columns=columns)
+        games = games.sort_values(self.DATE_COLUMN, kind='stable')
+
+        sig_cols = self.signature_columns
+        games['signature'] = games[sig_cols[0]].astype(str).str.cat(
+            [games[col].astype(str) for col in sig_cols[1:]], sep='|'
+        )
+        games['occurrence_key'] = self._occurrence_keys(games)
+        grouped = games.groupby('signature', sort=False)['occurrence_key']
+        counts = pd.DataFrame({
+            'occurrence_count': grouped.size(),
+            'first_id': grouped.first(),
+            'last_id': grouped.last()
+        })
+
+        self.index_db.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect(self.index_db) as conn:
+            self._init_index_db(conn)
+            with conn:
+                conn.execute("DELETE FROM bucket_counts WHERE position = ?", (self.position,))
+                conn.executemany(
+                    "INSERT INTO bucket_counts VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (self.position, sig, int(row.occurrence_count), str(row.first_id), str(row.last_id))
+                        for sig, row in counts.iterrows()
+                    ]
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO bucket_builds VALUES (?, ?, ?, ?)",
+                    (self.position, fingerprint, len(games), datetime.now().isoformat())
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO bucket_feed VALUES (?, ?, ?, ?, ?)",
+                    (self.position, self._archive_fingerprint(), feed_seq, current_rows, written)
+                )
+
+        logger.info(f"Built {len(counts)} {self.sport.upper()} {self.position} bucket signatures over {len(games)} games")
+        return len(counts)
+
+    def _current_feed_state(self):
+        """(change feed position, row count, last recorded write) of the current games table"""
+        if not self.current_db.exists():
+            return 0, 0, None
+        with self._connect(self.current_db) as conn:
+            try:
+                rows = conn.execute(f"SELECT COUNT(*) FROM {self.table_name}").fetchone()[0]
+            except sqlite3.OperationalError:
+                return 0, 0, None
+            return feed_position(conn, self.table_name), rows, last_write(conn, self.table_name)
+
+    def _apply_bucket_changes(self):
+        """Update bucket_counts in place from the current database's change feed
+
+        Applies only the rows collectors appended since the last build or
+        update, so the cost follows the number of new games. Returns False,
+        leaving the caller to rebuild, unless the archive is unchanged and
+        the current table's last write was a feed append (or it has not
+        been written) that accounts for every new row.
+        """
+        if not self.index_db.exists() or not self.current_db.exists():
+            return False
+        with self._connect(self.index_db) as conn:
+            try:
+                state = conn.execute(
+                    "SELECT archive_fingerprint, feed_seq, current_rows, last_write FROM bucket_feed WHERE position = ?",
+                    (self.position,)
+                ).fetchone()
+                build = conn.execute(
+                    "SELECT total_games FROM bucket_builds WHERE position = ?", (self.position,)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                return False
+        if state is None or build is None or state[0] != self._archive_fingerprint():
+            return False
+        _, feed_seq, current_rows, written = state
+
+        fingerprint = self._source_fingerprint()
+        with self._connect(self.current_db) as conn:
+            changes = read_changes(conn, self.table_name, since=feed_seq)
+            rows = conn.execute(f"SELECT COUNT(*) FROM {self.table_name}").fetchone()[0]
+            latest_write = last_write(conn, self.table_name)
+            expected_write = changes['recorded_at'].iloc[-1] if len(changes) else written
+            if rows != current_rows + len(changes) or latest_write != expected_write:
+                return False
+            columns = self._with_keys(self.signature_columns)
+            games = pd.read_sql(
+                f"SELECT rowid AS row_id, {', '.join(columns)} FROM {self.table_name} WHERE rowid BETWEEN ? AND ?",
+                conn, params=(int(changes['row_id'].min() or 0), int(changes['row_id'].max() or 0))
+            ) if len(changes) else pd.DataFrame(columns=['row_id'] + columns)
+        games = games[games['row_id'].isin(changes['row_id'])].sort_values(self.DATE_COLUMN, kind='stable')
+        if len(games) != len(changes):
+            return False
+
+        games['signature'] = self._signature_strings(games) if len(games) else []
+        games['occurrence_key'] = self._occurrence_keys(games)
+        with self._connect(self.index_db) as conn:
+            existing = {
+                row[0]: row[1:] for row in conn.execute(
+                    "SELECT signature, occurrence_count, first_id, last_id FROM bucket_counts WHERE position = ?",
+                    (self.position,)
+                )
+            }
+        updates = []
+        for signature, group in games.groupby('signature', sort=False):
+            count, first_id, last_id = existing.get(signature, (0, None, None))
+            new_first, new_last = group.iloc[0], group.iloc[-1]
+            if first_id is None or self._occurrence_date(first_id) > str(new_first[self.DATE_COLUMN]):
+                first_id = new_first['occurrence_key']
+            if last_id is None or self._occurrence_date(last_id) <= str(new_last[self.DATE_COLUMN]):
+                last_id = new_last['occurrence_key']
+            updates.append((self.position, signature, count + len(group), first_id, last_id))
+
+        with self._connect(self.index_db) as conn:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO bucket_counts VALUES (?, ?, ?, ?, ?)", updates)
+                conn.execute(
+                    "UPDATE bucket_builds SET fingerprint = ?, total_games = ?, built_at = ? WHERE position = ?",
+                    (fingerprint, build[0] + len(games), datetime.now().isoformat(), self.position)
+                )
+                conn.execute(
+                    "UPDATE bucket_feed SET feed_seq = ?, current_rows = ?, last_write = ? WHERE position = ?",
+                    (int(changes['seq'].max()) if len(changes) else feed_seq, rows, latest_write, self.position)
+                )
+
+        logger.info(f"Applied {len(games)} new {self.sport.upper()} {self.position} games to {len(updates)} bucket signatures")
+        return True
+
+    def _occurrence_date(self, occurrence_key):
+        game = self._get_occurrence(occurrence_key)
+        return str(game[self.DATE_COLUMN]) if game is not None else ''
+
+    def changed_signatures(self, since=0):
+        """Signatures of current games published to the change feed after position `since`"""
+        if not self.current_db.exists():
+            return set()
+        with self._connect(self.current_db) as conn:
+            return set(read_changes(conn, self.table_name, since)['signature'].dropna())
+
+    def feed_position(self):
+        """Latest change feed position of this engine's current games table"""
+        return self._current_feed_state()[0]
+
+    def check_changes(self, since=0, position=None):
+        """Rare current-season performances whose signature count changed since feed position `since`
+
+        Only games sharing a signature with a newly collected game are read
+        and re-scored. Returns (performances, feed position) so the caller
+        can pass the position back as `since` on the next run. `position`
+        applies to this call only.
         """
+        engine = self.at_position(position)
+        latest = engine.feed_position()
+        changed = engine.changed_signatures(since)
+        if not changed or not engine.signature_columns:
+            return [], latest
+        performances = sorted(engine.iter_current_season(changed=changed), key=lambda x: x['rarity_score'], reverse=True)
+        logger.info(f"Re-scored {len(performances)} rare {self.sport.upper()} games across {len(changed)} changed signatures")
+        return performances, latest
+
+    def at_position(self, position):
+        """This engine for `position`, sharing its pools, memo and caches; self if unchanged"""
+        if position is None or position == self.position:
+            return self
+        engine = copy.copy(self)
+        engine.position = position
+        return engine
+
+    def _read_bucket_build(self):
+        """Return (fingerprint, total_games) of the last index build, if any"""
+        if not self.index_db.exists():
+            return None
+        with self._connect(self.index_db) as conn:
+            try:
+                return conn.execute(
+                    "SELECT fingerprint, total_games FROM bucket_builds WHERE position = ?",
+                    (self.position,)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                return None
+
+    def _load_bucket_counts(self):
+        """Load this position's bucket counts as (DataFrame, total_games)
+
+        Rebuilds the index first if it is stale. Returns None if the index
+        cannot be used.
+        """
+        try:
+            build = self._read_bucket_build()
+            if build is None or build[0] != self._source_fingerprint():
+                if not self._apply_bucket_changes():
+                    self.build_bucket_counts()
+                build = self._read_bucket_build()
+
+            with self._connect(self.index_db) as conn:
+                counts = pd.read_sql(
+                    "SELECT signature, occurrence_count, first_id, last_id FROM bucket_counts WHERE position = ?",
+                    conn, params=(self.position,)
+                )
+            return counts, build[1]
+        except Exception as e:
+            logger.warning(f"Bucket index unavailable for {self.sport} {self.position}: {e}")
+            return None
 
-        dfs = []
+    def _lookup_bucket(self, game):
+        """Point lookup of (count, first_id, last_id, total) for a game's signature
+
+        Rebuilds the index first if the source databases changed since the
+        last build. Returns None if the index cannot be used.
+        """
+        query = """
+            SELECT b.fingerprint, c.occurrence_count, c.first_id, c.last_id, b.total_games
+            FROM bucket_builds b
+            LEFT JOIN bucket_counts c ON c.position = b.position AND c.signature = ?
+            WHERE b.position = ?
+        """
+        try:
+            signature = self.signature_key(game)
+            for attempt in range(2):
+                row = None
+                if self.index_db.exists():
+                    with self._connect(self.index_db) as conn:
+                        try:
+                            row = conn.execute(query, (signature, self.position)).fetchone()
+                        except sqlite3.OperationalError:
+                            row = None
+
+                if row is not None and row[0] == self._source_fingerprint():
+                    _, count, first_id, last_id, total = row
+                    return (count or 0, first_id, last_id, total)
+
+                if attempt == 0 and not self._apply_bucket_changes():
+                    self.build_bucket_counts()
+        except Exception as e:
+            logger.warning(f"Bucket index unavailable for {self.sport} {self.position}: {e}")
+        return None
+
+    @property
+    def signature_index(self):
+        return f"idx_{self.table_name}_signature"
+
+    def ensure_indexes(self):
+        """Create covering lookup indexes on the archive and current databases
+
+        Adds a (signature..., date) index and a key index unless an existing
+        index already leads with those columns, then returns ``report_scans()``.
+        Read-only engines only report.
+        """
+        if not self.signature_columns:
+            return {}
+        if self.read_only:
+            return self.report_scans()
+
+        columns = self.signature_columns + [self.DATE_COLUMN]
         for db in [self.archive_db, self.current_db]:
-            if db.exists():
+            if not db.exists():
+                continue
+            try:
+                conn = sqlite3.connect(db)
                 try:
-                    conn = sqlite3.connect(db)
-                    df = pd.read_sql(query, conn)
+                    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({self.table_name})")}
+                    if not set(columns) <= existing:
+                        continue
+                    if not self._has_leading_index(conn, columns):
+                        conn.execute(
+                            f"CREATE INDEX IF NOT EXISTS {self.signature_index} "
+                            f"ON {self.table_name} ({', '.join(columns)})"
+                        )
+                    keys = self.key_columns
+                    if set(keys) <= existing and not self._has_leading_index(conn, keys):
+                        conn.execute(
+                            f"CREATE INDEX IF NOT EXISTS idx_{self.table_name}_{'_'.join(keys)} "
+                            f"ON {self.table_name} ({', '.join(keys)})"
+                        )
+                    conn.commit()
+                finally:
                     conn.close()
-                    dfs.append(df)
-                except Exception as e:
-                    logger.warning(f"Error querying {db}: {e}")
-                    pass
+            except sqlite3.Error as e:
+                logger.warning(f"Could not index {self.table_name} in {db}: {e}")
+
+        return self.report_scans()
+
+    def _has_leading_index(self, conn, columns):
+        """Whether any index on the table starts with ``columns`` in order"""
+        for index in conn.execute(f"PRAGMA index_list({self.table_name})").fetchall():
+            info = sorted(conn.execute(f"PRAGMA index_info('{index[1]}')").fetchall())
+            if [row[2] for row in info[:len(columns)]] == list(columns):
+                return True
+        return False
+
+    def report_scans(self):
+        """EXPLAIN QUERY PLAN every rarity lookup and warn about any that scan
+
+        Returns {lookup name: [scan details]} for lookups that still walk a
+        whole table instead of seeking an index.
+        """
+        if not self.signature_columns:
+            return {}
+
+        table_scan = re.compile(rf"^SCAN (\w+\.)?{re.escape(self.table_name)}\b")
+        scans = {}
+        try:
+            with self._connect_all() as conn:
+                if conn is None:
+                    return {}
+                for name, query in self._lookup_queries().items():
+                    params = [None] * query.count('?')
+                    plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+                    scanned = [detail for detail in plan if table_scan.match(detail)]
+                    if scanned:
+                        scans[name] = scanned
+        except Exception as e:
+            logger.warning(f"Could not explain {self.sport} {self.table_name} lookups: {e}")
+            return {}
+
+        for name, details in scans.items():
+            logger.warning(f"{self.sport} {self.table_name} {name} lookup scans: {'; '.join(details)}")
+        return scans
+
+    def _get_occurrence(self, occurrence_key):
+        """Fetch the game row with an occurrence key from archive or current"""
+        values = str(occurrence_key).split('|', len(self.key_columns) - 1)
+        if len(values) != len(self.key_columns):
+            return None
+        rows = self._read_all(self._lookup_queries()['occurrence_by_key'], values)
+        if rows is None or len(rows) == 0:
+            return None
+        return rows.iloc[0].to_dict()
+
+    def _signature_filter(self, game):
+        """WHERE clause and parameters matching a game's bucket signature"""
+        return self._signature_where(), [str(game[col]) for col in self.signature_columns]
+
+    def _signature_where(self):
+        return ' AND '.join(f"{col} = ?" for col in self.signature_columns)
+
+    def _lookup_queries(self, where_clause=None):
+        """SQL for every per-game rarity lookup against ``union_view``"""
+        where_clause = where_clause or self._signature_where()
+        ordered = f"SELECT * FROM {self.union_view} WHERE {where_clause} ORDER BY {self.DATE_COLUMN}"
+        return {
+            'occurrence_count': f"SELECT COUNT(*) FROM {self.union_view} WHERE {where_clause}",
+            'first_occurrence': f"{ordered} ASC LIMIT 1",
+            'last_occurrence': f"{ordered} DESC LIMIT 1",
+            'occurrence_by_key': f"SELECT * FROM {self.union_view} WHERE "
+                                 f"{' AND '.join(f'{col} = ?' for col in self.key_columns)} LIMIT 1",
+        }
+
+    def _match_filter(self, game):
+        """WHERE clause and parameters for games matching this stat line"""
+        if self.signature_columns:
+            return self._signature_filter(game)
+        # Default to just match on player if position unknown
+        return f"{self.PLAYER_COLUMN} = ?", [game[self.PLAYER_COLUMN]]
 
-        return pd.concat(dfs) if dfs else None
+    @staticmethod
+    def _fetch_dict(cursor):
+        """First row of a cursor as a dict, or None"""
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([col[0] for col in cursor.description], row))
+
+    def _occurrence_summary(self, game):
+        """(count, first row, last row) of a stat line without loading every match
+
+        One COUNT(*) plus two ``LIMIT 1`` seeks ordered by date, which a
+        (signature..., date) index answers without sorting, so the cost does
+        not grow with how common the stat line is.
+        """
+        where_clause, params = self._match_filter(game)
+        queries = self._lookup_queries(where_clause)
+
+        try:
+            with self._connect_all() as conn:
+                if conn is None:
+                    return None
+                count = conn.execute(queries['occurrence_count'], params).fetchone()[0]
+                if not count:
+                    return 0, None, None
+                first = self._fetch_dict(conn.execute(queries['first_occurrence'], params))
+                last = self._fetch_dict(conn.execute(queries['last_occurrence'], params))
+                return count, first, last
+        except Exception as e:
+            logger.warning(f"Error summarizing {self.sport} {self.table_name} occurrences: {e}")
+            return None
+
+    def _find_matches(self, game):
+        """Find matching stat lines in archive + current"""
+        where_clause, params = self._match_filter(game)
+        return self._read_all(f"""
+            SELECT * FROM {self.union_view}
+            WHERE {where_clause}
+            ORDER BY {self.DATE_COLUMN} ASC
+        """, params)
 
     def _get_total_games(self):
-        """Count all games in dataset"""
-        total = 0
-        for db in [self.archive_db, self.current_db]:
-            if db.exists():
-                try:
-                    conn = sqlite3.connect(db)
-                    res = conn.execute(f"SELECT COUNT(*) FROM {self.position}_games").fetchone()
-                    total += res[0]
-                    conn.close()
-                except Exception as e:
-                    logger.warning(f"Error counting games in {db}: {e}")
-                    pass
-        return total
+        """Count all games in dataset
+
+        Uses each database's cached table_stats count and only runs COUNT(*)
+        where that cache is missing or stale.
+        """
+        try:
+            with self._connect_all() as conn:
+                if conn is None:
+                    return 0
+                total = 0
+                for schema in [row[1] for row in conn.execute("PRAGMA database_list")]:
+                    has_table = conn.execute(
+                        f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?",
+                        (self.table_name,)
+                    ).fetchone()
+                    if not has_table:
+                        continue
+                    count = cached_row_count(conn, self.table_name, schema)
+                    if count is None:
+                        count = conn.execute(f"SELECT COUNT(*) FROM {schema}.{self.table_name}").fetchone()[0]
+                    total += count
+                return total
+        except Exception as e:
+            logger.warning(f"Error counting {self.sport} {self.table_name} games: {e}")
+            return 0
 
     def _classify(self, count):
         """Classify rarity"""
@@ -104,6 +1212,14 @@ class RarityEngine:
         elif count <= 25: return 'rare'
         else: return 'common'
 
+    def _classify_array(self, counts):
+        """Vectorized _classify over an array of occurrence counts"""
+        return np.select(
+            [counts == 1, counts <= 5, counts <= 10, counts <= 25],
+            ['never_before', 'extremely_rare', 'very_rare', 'rare'],
+            default='common'
+        )
+
     def is_interesting(self, game):
         """Check if game is worth analyzing"""
         if self.position == 'qb':
@@ -129,38 +1245,25 @@ class RarityEngine:
 
     def get_recent_performances(self, days=7):
         """Get recent interesting performances"""
-        dfs = []
-        for db in [self.archive_db, self.current_db]:
-            if db.exists():
-                try:
-                    conn = sqlite3.connect(db)
-
-                    # Build query based on position
-                    if self.position == 'qb':
-                        where_clause = "pass_yards >= 300 OR pass_td >= 4 OR interceptions >= 3"
-                    elif self.position == 'rb':
-                        where_clause = "rush_yards >= 100 OR rush_td >= 2 OR fumbles_lost >= 2"
-                    elif self.position in ['wr', 'te']:
-                        where_clause = "receiving_yards >= 100 OR receiving_td >= 2 OR receptions >= 10"
-                    else:
-                        where_clause = "1=1"  # All games for unknown positions
-
-                    query = f"""
-                        SELECT * FROM {self.position}_games
-                        WHERE {where_clause}
-                        ORDER BY game_date DESC
-                        LIMIT 50
-                    """
-                    df = pd.read_sql(query, conn)
-                    conn.close()
-                    dfs.append(df)
-                except Exception as e:
-                    logger.warning(f"Error getting recent games from {db}: {e}")
+        # Build query based on position
+        if self.position == 'qb':
+            where_clause = "pass_yards >= 300 OR pass_td >= 4 OR interceptions >= 3"
+        elif self.position == 'rb':
+            where_clause = "rush_yards >= 100 OR rush_td >= 2 OR fumbles_lost >= 2"
+        elif self.position in ['wr', 'te']:
+            where_clause = "receiving_yards >= 100 OR receiving_td >= 2 OR receptions >= 10"
+        else:
+            where_clause = "1=1"  # All games for unknown positions
+
+        recent = self._read_all(f"""
+            SELECT * FROM {self.union_view}
+            WHERE {where_clause}
+            ORDER BY game_date DESC
+            LIMIT 20
+        """)
 
-        if dfs:
-            recent = pd.concat(dfs)
+        if recent is not None:
             # Convert game_date to datetime for proper sorting
             recent['game_date'] = pd.to_datetime(recent['game_date'])
-            recent = recent.sort_values('game_date', ascending=False)
-            return recent.head(20)  # Return top 20 recent interesting games
-        return pd.DataFrame()
\ No newline at end of file
+            return recent  # Top 20 recent interesting games
+        return pd.DataFrame()
@@ -0,0 +1,144 @@
+"""Multi-process rarity scoring, sharded by bucket signature"""
+import multiprocessing
+import os
+import zlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from loguru import logger
+from .in_memory_rarity import in_memory_engine
+
+# Engines built inside a worker process, keyed by (engine class, args, in_memory)
+_worker_engines = {}
+
+
+def scoring_pool(workers=None):
+    """Process pool for ShardedScorer; one pool can be shared by every sport
+
+    Workers are started with 'spawn' because SQLite connections must not
+    be carried across a fork, so scripts using it need the usual
+    ``if __name__ == "__main__"`` guard.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context('spawn')
+    )
+
+
+def _score_shard(spec, position, games, as_of):
+    """Worker entry point: score one shard with this process's engine
+
+    The engine is built ``read_only``, so workers open every database with
+    ``mode=ro`` and leave table and index creation to the parent.
+    """
+    engine = _worker_engines.get(spec)
+    if engine is None:
+        engine_cls, engine_args, in_memory = spec
+        if in_memory:
+            engine_cls = in_memory_engine(engine_cls)
+        engine = _worker_engines[spec] = engine_cls(*engine_args, read_only=True)
+    engine.position = position
+    return engine.compute_rarity_batch(games, as_of=as_of)
+
+
+class ShardedScorer:
+    """compute_rarity_batch spread over worker processes
+
+    Games are split into one shard per worker by a CRC32 of their bucket
+    signature, so every game sharing a signature goes to the same worker
+    and its memo or in-memory snapshot. Each worker builds its own
+    read-only engine the first time it sees a sport; the parent creates the
+    lookup indexes once before the first dispatch. Shards are merged back into input order, so the result is the
+    same frame a single-process ``compute_rarity_batch`` returns for any
+    worker count::
+
+        with ShardedScorer(NBARarityEngine, workers=8) as scorer:
+            rarities = scorer.score(games)
+
+    `engine` reuses an existing engine in this process for sharding and
+    refreshing the bucket index before dispatch; `executor` shares one
+    ``scoring_pool()`` between scorers.
+    """
+
+    def __init__(self, engine_cls, engine_args=(), workers=None, in_memory=False, engine=None, executor=None):
+        self.spec = (engine_cls, tuple(engine_args), in_memory)
+        self.workers = workers or os.cpu_count() or 1
+        self._engine = engine
+        self._owns_engine = engine is None
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._indexed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Shut down the pool and engine if this scorer created them"""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._owns_engine and self._engine is not None:
+            self._engine.close()
+            self._engine = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            engine_cls, engine_args, _ = self.spec
+            self._engine = engine_cls(*engine_args)
+        return self._engine
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = scoring_pool(self.workers)
+        return self._executor
+
+    def shards(self, games):
+        """Shard number of every game, stable across processes and runs"""
+        engine = self.engine
+        if not engine.signature_columns:
+            return np.arange(len(games)) % self.workers
+        signatures = engine._signature_strings(games)
+        return np.fromiter(
+            (zlib.crc32(signature.encode()) % self.workers for signature in signatures),
+            dtype=np.int64, count=len(games)
+        )
+
+    def score(self, games, position=None, as_of=None):
+        """compute_rarity_batch for `games`, scored across the worker pool"""
+        engine = self.engine
+        if position is not None:
+            engine.position = position
+        if len(games) == 0 or self.workers == 1:
+            return engine.compute_rarity_batch(games, as_of=as_of)
+
+        if not self._indexed:
+            # Workers are read-only, so any index DDL has to happen here
+            engine.ensure_indexes()
+            self._indexed = True
+        _, _, in_memory = self.spec
+        if as_of is None and not in_memory and engine.signature_columns:
+            # Rebuild a stale bucket index once here rather than in every worker
+            engine._load_bucket_counts()
+        if as_of is not None and np.ndim(as_of) > 0:
+            as_of = np.asarray(as_of, dtype=object)
+
+        shard = self.shards(games)
+        rows, futures = [], []
+        for n in range(self.workers):
+            mask = shard == n
+            if not mask.any():
+                continue
+            shard_as_of = as_of[mask] if as_of is not None and np.ndim(as_of) > 0 else as_of
+            rows.append(np.flatnonzero(mask))
+            futures.append(self._pool().submit(_score_shard, self.spec, engine.position, games[mask], shard_as_of))
+
+        logger.info(f"Scoring {len(games)} {engine.sport} {engine.table_name} games across {len(futures)} worker shards")
+        results = pd.concat([future.result() for future in futures])
+        order = np.argsort(np.concatenate(rows), kind='stable')
+        results = results.iloc[order]
+        results.index = games.index
+        return results
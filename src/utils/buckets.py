@@ -0,0 +1,116 @@
+"""Shared stat bucket definitions for every sport"""
+import numpy as np
+import pandas as pd
+
+
+class BucketSpec:
+    """Edges and labels that bucket one raw stat column
+
+    `edges` are the boundaries between consecutive labels, so there is one
+    more label than edges. By default a bucket includes its lower edge
+    (``edges=[10, 20]`` gives <10, 10-19, 20+); ``right=True`` makes each
+    edge the inclusive top of the bucket below it instead. Values below the
+    first edge land in the first bucket, as do missing and non-numeric
+    values, matching the collectors' old ``fillna(0)``. Bucketing is one
+    ``np.searchsorted`` call over the whole column.
+    """
+
+    def __init__(self, stat, edges, labels, right=False):
+        if len(labels) != len(edges) + 1:
+            raise ValueError(f"{stat}: {len(edges)} edges need {len(edges) + 1} labels, got {len(labels)}")
+        self.stat = stat
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.labels = np.asarray(labels, dtype=object)
+        self.side = 'left' if right else 'right'
+
+    def apply(self, values):
+        """Bucket labels for an array-like of raw values"""
+        values = np.asarray(values)
+        if values.dtype.kind not in 'biuf':
+            values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        positions = np.searchsorted(self.edges, values, side=self.side)
+        if values.dtype.kind == 'f':
+            # searchsorted puts NaN past every edge; a missing stat is not a rare one
+            positions[np.isnan(values)] = 0
+        return self.labels[positions]
+
+    def label(self, value):
+        """Bucket label for a single value"""
+        return self.apply([value])[0]
+
+
+# sport -> bucket column -> spec
+BUCKETS = {
+    'nfl': {
+        'pass_yards_bucket': BucketSpec('pass_yards', [100, 200, 250, 300, 350, 400],
+                                        ['0-99', '100-199', '200-249', '250-299', '300-349', '350-399', '400+']),
+        'pass_td_bucket': BucketSpec('pass_td', [1, 2, 3, 4, 5], ['0', '1', '2', '3', '4', '5+']),
+        'interceptions_bucket': BucketSpec('interceptions', [1, 2, 3], ['0', '1', '2', '3+']),
+        'rush_yards_bucket': BucketSpec('rush_yards', [50, 100, 150, 200],
+                                        ['0-49', '50-99', '100-149', '150-199', '200+']),
+        'rush_td_bucket': BucketSpec('rush_td', [1, 2, 3, 4], ['0', '1', '2', '3', '4+']),
+        'fumbles_bucket': BucketSpec('fumbles_lost', [1, 2], ['0', '1', '2+']),
+        'receptions_bucket': BucketSpec('receptions', [3, 5, 7, 10, 12],
+                                        ['0-2', '3-4', '5-6', '7-9', '10-11', '12+']),
+        'receiving_yards_bucket': BucketSpec('receiving_yards', [30, 50, 75, 100, 125, 150],
+                                             ['0-29', '30-49', '50-74', '75-99', '100-124', '125-149', '150+']),
+        'receiving_td_bucket': BucketSpec('receiving_td', [1, 2, 3], ['0', '1', '2', '3+']),
+    },
+    'nba': {
+        'points_bucket': BucketSpec('points', [10, 20, 30, 40, 50],
+                                    ['0-9', '10-19', '20-29', '30-39', '40-49', '50+']),
+        'rebounds_bucket': BucketSpec('rebounds', [5, 10, 15, 20], ['0-4', '5-9', '10-14', '15-19', '20+']),
+        'assists_bucket': BucketSpec('assists', [5, 10, 15], ['0-4', '5-9', '10-14', '15+']),
+    },
+    'mlb': {
+        'hits_bucket': BucketSpec('hits', [1, 2, 3, 4], ['0', '1', '2', '3', '4+']),
+        'runs_bucket': BucketSpec('runs', [1, 2, 3], ['0', '1', '2', '3+']),
+        'rbis_bucket': BucketSpec('rbis', [1, 2, 3, 4], ['0', '1', '2', '3', '4+']),
+        'home_runs_bucket': BucketSpec('home_runs', [1, 2], ['0', '1', '2+']),
+    },
+    'f1': {
+        'position_bucket': BucketSpec('position', [1, 2, 3, 5, 10], ['1', '2', '3', '4-5', '6-10', '11+'], right=True),
+        'overtakes_bucket': BucketSpec('overtakes', [2, 5, 10], ['0-2', '3-5', '6-10', '11+'], right=True),
+        'fastest_lap_bucket': BucketSpec('fastest_lap', [0.5, 1.0, 2.0, 3.0],
+                                         ['0.0-0.5', '0.5-1.0', '1.0-2.0', '2.0-3.0', '3.0+'], right=True),
+    },
+    'nhl': {
+        'goals_bucket': BucketSpec('goals', [1, 2, 3, 4], ['0', '1', '2', '3', '4+']),
+        'assists_bucket': BucketSpec('assists', [1, 2, 3, 4], ['0', '1', '2', '3', '4+']),
+        'points_bucket': BucketSpec('points', [1, 2, 3, 4], ['0', '1', '2', '3', '4+']),
+        'shots_bucket': BucketSpec('shots', [1, 3, 5], ['0-1', '2-3', '4-5', '6+'], right=True),
+    },
+    'champions_league': {
+        'goals_bucket': BucketSpec('goals', [1, 2, 3], ['0', '1', '2', '3+']),
+        'assists_bucket': BucketSpec('assists', [1, 2, 3], ['0', '1', '2', '3+']),
+        'shots_bucket': BucketSpec('shots', [1, 3, 5], ['0-1', '2-3', '4-5', '6+'], right=True),
+    },
+}
+
+# Bucket columns that make up a rarity signature for each NFL position
+POSITION_BUCKETS = {
+    'qb': ('pass_yards_bucket', 'pass_td_bucket', 'interceptions_bucket'),
+    'rb': ('rush_yards_bucket', 'rush_td_bucket', 'fumbles_bucket'),
+    'wr': ('receptions_bucket', 'receiving_yards_bucket', 'receiving_td_bucket'),
+    'te': ('receptions_bucket', 'receiving_yards_bucket', 'receiving_td_bucket'),
+}
+
+
+def bucket_label(sport, column, value):
+    """Label of `column` (e.g. 'points_bucket') for one raw stat value"""
+    return BUCKETS[sport][column].label(value)
+
+
+def apply_buckets(df, sport, columns=None):
+    """Add bucket columns to `df` in place and return it
+
+    `columns` defaults to every bucket registered for the sport whose raw
+    stat is in the frame; NFL callers pass ``POSITION_BUCKETS[position]``.
+    """
+    specs = BUCKETS[sport]
+    if columns is None:
+        columns = [column for column, spec in specs.items() if spec.stat in df.columns]
+    for column in columns:
+        spec = specs[column]
+        df[column] = spec.apply(df[spec.stat])
+    return df
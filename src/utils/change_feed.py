@@ -0,0 +1,149 @@
+"""Append-only feed of the rows collectors insert into games tables"""
+import sqlite3
+from datetime import datetime
+import pandas as pd
+from .ingest_state import ensure_table
+from .table_stats import record_row_count
+
+
+def _init_change_feed(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_feed (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            signature TEXT,
+            recorded_at TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_change_feed_table ON change_feed (table_name, seq)")
+
+
+def append_games(conn, table, games, signature_columns=(), create_sql=None):
+    """Insert `games` into `table`, skipping rows whose primary key already exists
+
+    The rows are staged in a TEMP table and copied with one
+    ``INSERT OR IGNORE``, so deduplication is done by the table's primary
+    key index and costs O(new rows) rather than a read of every existing
+    key. The insert, the table's recorded row count and the change feed
+    entries commit in one transaction.
+
+    Each feed entry holds an inserted row's rowid and its bucket signature
+    (the `signature_columns` values joined with '|', as RarityEngine keys
+    them), so readers can apply just those rows, and shares the table_stats
+    ``updated_at`` of the write, which lets readers tell a feed append
+    from any other write. Returns the rows actually inserted.
+
+    A missing table is created from `create_sql` (its keyed CREATE TABLE
+    statement); without one it raises sqlite3.OperationalError rather than
+    creating a table with no primary key to deduplicate by.
+    """
+    create_sql = {table: create_sql} if create_sql else None
+    return append_tables(conn, {table: games}, {table: signature_columns}, create_sql)[table]
+
+
+def append_tables(conn, frames, signature_columns=None, create_sql=None):
+    """append_games for several tables in a single transaction
+
+    `frames` maps table name to games, `signature_columns` table name to
+    its signature columns and `create_sql` table name to the statement that
+    creates it if missing. Returns {table: rows actually inserted}.
+    """
+    signature_columns = signature_columns or {}
+    create_sql = create_sql or {}
+    inserted = {table: games for table, games in frames.items() if len(games) == 0}
+    frames = {table: games for table, games in frames.items() if len(games) > 0}
+    if not frames:
+        return inserted
+    for table in frames:
+        if table in create_sql:
+            ensure_table(conn, table, create_sql[table])
+        elif not _has_table(conn, table):
+            raise sqlite3.OperationalError(f"no such table: {table}")
+
+    _init_change_feed(conn)
+    for table, games in frames.items():
+        conn.execute(f"DROP TABLE IF EXISTS temp.staging_{table}")
+        conn.execute(f"CREATE TEMP TABLE staging_{table} AS SELECT {_columns(games)} FROM main.{table} LIMIT 0")
+    recorded_at = datetime.now().isoformat()
+    try:
+        with conn:
+            for table, games in frames.items():
+                inserted[table] = _insert_staged(conn, table, games, signature_columns.get(table, ()), recorded_at)
+    finally:
+        for table in frames:
+            conn.execute(f"DROP TABLE IF EXISTS temp.staging_{table}")
+    return inserted
+
+
+def _columns(games):
+    return ', '.join(f'"{col}"' for col in games.columns)
+
+
+def _insert_staged(conn, table, games, signature_columns, recorded_at):
+    """Stage, INSERT OR IGNORE and publish one table's rows; the caller commits"""
+    columns = _columns(games)
+    rows = games.copy()
+    for col in rows.select_dtypes(include=['datetime', 'datetimetz']).columns:
+        rows[col] = rows[col].astype(str)
+    rows = rows.astype(object).where(rows.notna(), None)
+    conn.executemany(
+        f"INSERT INTO temp.staging_{table} ({columns}) VALUES ({', '.join(['?'] * len(games.columns))})",
+        rows.itertuples(index=False, name=None)
+    )
+    before = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM main.{table}").fetchone()[0]
+    conn.execute(f"INSERT OR IGNORE INTO main.{table} ({columns}) SELECT {columns} FROM temp.staging_{table}")
+    inserted = pd.read_sql(
+        f"SELECT rowid AS row_id, {columns} FROM main.{table} WHERE rowid > ? ORDER BY rowid",
+        conn, params=(before,)
+    )
+
+    signature_columns = list(signature_columns)
+    if signature_columns and len(inserted):
+        signatures = inserted[signature_columns[0]].astype(str).str.cat(
+            [inserted[col].astype(str) for col in signature_columns[1:]], sep='|'
+        ).tolist()
+    else:
+        signatures = [None] * len(inserted)
+    conn.executemany(
+        "INSERT INTO change_feed (table_name, row_id, signature, recorded_at) VALUES (?, ?, ?, ?)",
+        [(table, int(row_id), signature, recorded_at) for row_id, signature in zip(inserted['row_id'], signatures)]
+    )
+    record_row_count(conn, table, recorded_at, commit=False)
+    return inserted.drop(columns='row_id')
+
+
+def _has_table(conn, table):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone() is not None
+
+
+def feed_position(conn, table):
+    """Sequence number of the latest feed entry for `table`; 0 if none"""
+    try:
+        row = conn.execute("SELECT MAX(seq) FROM change_feed WHERE table_name = ?", (table,)).fetchone()
+    except sqlite3.OperationalError:
+        # Database predates the change feed
+        return 0
+    return row[0] or 0
+
+
+def read_changes(conn, table, since=0):
+    """Feed entries for `table` after position `since` (seq, row_id, signature, recorded_at)"""
+    try:
+        return pd.read_sql(
+            "SELECT seq, row_id, signature, recorded_at FROM change_feed WHERE table_name = ? AND seq > ? ORDER BY seq",
+            conn, params=(table, since)
+        )
+    except (sqlite3.OperationalError, pd.errors.DatabaseError):
+        return pd.DataFrame(columns=['seq', 'row_id', 'signature', 'recorded_at'])
+
+
+def last_write(conn, table):
+    """table_stats ``updated_at`` of `table`'s last recorded write, or None"""
+    try:
+        row = conn.execute("SELECT updated_at FROM table_stats WHERE table_name = ?", (table,)).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
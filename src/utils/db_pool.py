@@ -0,0 +1,95 @@
+"""Long-lived, thread-safe SQLite connection pool"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class ConnectionPool:
+    """Hands out up to `size` reusable connections to one SQLite database
+
+    Connections are opened lazily through a file URI so the pool never
+    creates a missing database by accident: `read_only` pools use
+    ``mode=ro``, others ``mode=rw`` (or ``mode=rwc`` with `create`).
+    Each connection is only ever used by one thread at a time, and a
+    thread that borrows again while it already holds one gets the same
+    connection back, so nested borrows never wait on the pool.
+    """
+
+    def __init__(self, db_path, size=4, read_only=False, create=False):
+        self.db_path = Path(db_path)
+        self.size = size
+        self.read_only = read_only
+        self.create = create
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._connections = []
+        # Per-thread connection currently borrowed and how many borrows hold it
+        self._held = threading.local()
+
+    def _open(self):
+        if self.read_only:
+            mode = 'ro'
+        else:
+            mode = 'rwc' if self.create else 'rw'
+        uri = f"{self.db_path.resolve().as_uri()}?mode={mode}"
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._connections) < self.size:
+                conn = self._open()
+                self._connections.append(conn)
+                return conn
+
+        # Pool exhausted: wait for another thread to hand one back
+        return self._idle.get()
+
+    def _release(self, conn):
+        with self._lock:
+            alive = conn in self._connections
+        if not alive:
+            # Pool was closed while this connection was borrowed
+            conn.close()
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a `with` block"""
+        depth = getattr(self._held, 'depth', 0)
+        if depth:
+            self._held.depth = depth + 1
+            try:
+                yield self._held.conn
+            finally:
+                self._held.depth -= 1
+            return
+
+        conn = self._acquire()
+        self._held.conn, self._held.depth = conn, 1
+        try:
+            yield conn
+        finally:
+            self._held.conn, self._held.depth = None, 0
+            self._release(conn)
+
+    def close(self):
+        """Close every idle connection; borrowed ones close when returned"""
+        with self._lock:
+            self._connections = []
+
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
@@ -0,0 +1,128 @@
+"""Per-table ingest watermarks kept in each sport's current database"""
+import sqlite3
+from datetime import datetime
+from .table_stats import record_row_count
+
+
+def _init_ingest_state(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_state (
+            table_name TEXT PRIMARY KEY,
+            season INTEGER,
+            week INTEGER,
+            last_date TEXT,
+            upstream_hash TEXT,
+            rows_ingested INTEGER,
+            updated_at TEXT
+        )
+    """)
+
+
+def ensure_table(conn, table, create_sql):
+    """Run `create_sql` (CREATE TABLE IF NOT EXISTS) and restore a dropped primary key
+
+    Collectors used to ``to_sql(..., if_exists='replace')`` their tables,
+    which recreates them without the primary key that appends rely on for
+    deduplication. Such a table is renamed to ``{table}_legacy``, recreated
+    from `create_sql` and refilled with one row per key. The rename and
+    create commit on their own, so a rebuild interrupted before the copy
+    leaves ``{table}_legacy`` behind for the next call to finish.
+    """
+    conn.execute(create_sql)
+    legacy = f"{table}_legacy"
+    info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    if not any(column[5] for column in info):
+        conn.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        conn.execute(create_sql)
+    elif conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (legacy,)).fetchone() is None:
+        return
+
+    with conn:
+        available = {column[1] for column in conn.execute(f"PRAGMA table_info({table})")}
+        columns = ', '.join(
+            f'"{column[1]}"' for column in conn.execute(f"PRAGMA table_info({legacy})") if column[1] in available
+        )
+        conn.execute(f"INSERT OR IGNORE INTO {table} ({columns}) SELECT {columns} FROM {legacy} ORDER BY rowid")
+        conn.execute(f"DROP TABLE {legacy}")
+        record_row_count(conn, table, commit=False)
+
+
+def read_watermark(conn, table, date_column):
+    """How far `table` has been ingested: dict of season, week, last_date and upstream_hash
+
+    Tables ingested before watermarks existed are seeded from their latest
+    row. Returns None for an empty table.
+    """
+    try:
+        row = conn.execute(
+            "SELECT season, week, last_date, upstream_hash FROM ingest_state WHERE table_name = ?", (table,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # Database predates ingest_state
+        row = None
+    if row is not None:
+        return dict(zip(['season', 'week', 'last_date', 'upstream_hash'], row))
+
+    try:
+        columns = {column[1] for column in conn.execute(f"PRAGMA table_info({table})")}
+        if date_column not in columns:
+            return None
+        latest = conn.execute(
+            f"SELECT {', '.join(col if col in columns else 'NULL' for col in ['season', 'week'])}, {date_column} "
+            f"FROM {table} ORDER BY {date_column} DESC LIMIT 1"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    if latest is None:
+        return None
+    return {'season': latest[0], 'week': latest[1], 'last_date': latest[2], 'upstream_hash': None}
+
+
+def resume_date(watermark, default):
+    """Date to request data after: the watermark's last date, or `default` before any ingest"""
+    if watermark is None or watermark.get('last_date') is None:
+        return default
+    return max(default, datetime.fromisoformat(str(watermark['last_date'])[:10]))
+
+
+def past_watermark(games, watermark, date_column):
+    """Rows of `games` on or after the watermark date
+
+    The boundary date is included, since more of its games can arrive
+    after a run; rows already stored are skipped by the table's primary
+    key when appended.
+    """
+    if watermark is None or watermark.get('last_date') is None or len(games) == 0:
+        return games
+    return games[games[date_column].astype(str) >= str(watermark['last_date'])]
+
+
+def advance_watermark(conn, table, games, date_column, upstream_hash=None):
+    """Move `table`'s watermark to the latest of `games` and record `upstream_hash`
+
+    Call after the rows are committed; a crash in between only means the
+    next run re-reads rows the primary key then skips. Commits.
+    """
+    _init_ingest_state(conn)
+    watermark = read_watermark(conn, table, date_column) or {}
+    season, week, last_date = watermark.get('season'), watermark.get('week'), watermark.get('last_date')
+    if len(games) > 0:
+        latest = games.sort_values(date_column, kind='stable').iloc[-1]
+        if last_date is None or str(latest[date_column]) >= str(last_date):
+            last_date = str(latest[date_column])
+            season = int(latest['season']) if 'season' in games.columns else season
+            week = int(latest['week']) if 'week' in games.columns else week
+
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO ingest_state (table_name, season, week, last_date, upstream_hash, rows_ingested, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (table_name) DO UPDATE SET
+                season = excluded.season, week = excluded.week, last_date = excluded.last_date,
+                upstream_hash = COALESCE(excluded.upstream_hash, ingest_state.upstream_hash),
+                rows_ingested = ingest_state.rows_ingested + excluded.rows_ingested,
+                updated_at = excluded.updated_at
+            """,
+            (table, season, week, last_date, upstream_hash, len(games), datetime.now().isoformat())
+        )
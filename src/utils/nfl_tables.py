@@ -0,0 +1,22 @@
+"""Schema of the per-position NFL games tables, shared by the collector and the archive"""
+from .buckets import POSITION_BUCKETS
+
+# Raw stat columns of each position's games table
+POSITION_COLUMNS = {
+    'qb': ('pass_yards', 'pass_td', 'interceptions', 'completions', 'attempts'),
+    'rb': ('rush_attempts', 'rush_yards', 'rush_td', 'fumbles_lost'),
+    'wr': ('receptions', 'receiving_yards', 'receiving_td', 'targets'),
+    'te': ('receptions', 'receiving_yards', 'receiving_td', 'targets'),
+}
+
+
+def games_table_sql(position):
+    """CREATE TABLE IF NOT EXISTS statement for `position`'s ``{position}_games`` table"""
+    columns = [
+        'game_id TEXT', 'player_id TEXT', 'player_name TEXT', 'position TEXT', 'team TEXT', 'opponent TEXT',
+        'game_date TEXT', 'season INTEGER', 'week INTEGER',
+        *(f'{column} INTEGER' for column in POSITION_COLUMNS[position]),
+        *(f'{column} TEXT' for column in POSITION_BUCKETS[position]),
+        'PRIMARY KEY (game_id, player_id)'
+    ]
+    return f"CREATE TABLE IF NOT EXISTS {position}_games ({', '.join(columns)})"
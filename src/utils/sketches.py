@@ -0,0 +1,324 @@
+"""Constant-memory frequency, distinct-count and quantile sketches"""
+import json
+import math
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# siphash keys (16 bytes) for the two independent 64-bit hashes
+_HASH_KEYS = ('gaas-sketch-key1', 'gaas-sketch-key2')
+
+
+def _hash(values, key=0):
+    """Stable 64-bit hashes of values as strings"""
+    values = pd.Series(values, dtype=object).astype(str)
+    return pd.util.hash_pandas_object(values, index=False, hash_key=_HASH_KEYS[key]).to_numpy(dtype=np.uint64)
+
+
+def _key_strings(values):
+    """Values as key strings, with equal numbers spelled the same (212, 212.0, '212')"""
+    values = pd.Series(values).reset_index(drop=True)
+    strings = values.astype(str)
+    numbers = pd.to_numeric(values, errors='coerce')
+    numeric = numbers.notna().to_numpy()
+    if numeric.any():
+        strings[numeric] = numbers[numeric].astype(np.float64).map(repr)
+    return strings
+
+
+def _bit_length(values):
+    """Vectorized int.bit_length for uint64 arrays"""
+    values = values.copy()
+    length = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = values >= np.uint64(1 << shift)
+        length[big] += shift
+        values[big] >>= np.uint64(shift)
+    return length + (values > 0)
+
+
+class CountMinSketch:
+    """Count-min sketch of key frequencies
+
+    ``depth`` rows of ``width`` counters; a key increments one counter per
+    row (Kirsch-Mitzenmacher double hashing) and its estimate is the
+    minimum of those counters. Estimates never undercount, and with
+    ``width = ceil(e / epsilon)`` and ``depth = ceil(ln(1 / delta))`` an
+    estimate exceeds the true count by more than ``epsilon * total`` with
+    probability at most ``delta``.
+    """
+
+    def __init__(self, epsilon=2e-5, delta=0.01, counts=None, total=0):
+        self.epsilon = epsilon
+        self.delta = delta
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.counts = counts if counts is not None else np.zeros((self.depth, self.width), dtype=np.uint32)
+        self.total = total
+
+    def _columns(self, keys):
+        h1, h2 = _hash(keys, 0), _hash(keys, 1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h1[None, :] + rows * h2[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+    def add(self, keys):
+        """Count each key once"""
+        if len(keys) == 0:
+            return
+        columns = self._columns(keys)
+        for row in range(self.depth):
+            np.add.at(self.counts[row], columns[row], 1)
+        self.total += len(keys)
+
+    def estimate(self, keys):
+        """Estimated count of each key"""
+        columns = self._columns(keys)
+        return self.counts[np.arange(self.depth)[:, None], columns].min(axis=0).astype(np.int64)
+
+    @property
+    def error_bound(self):
+        """Maximum overcount, holding with probability 1 - delta"""
+        return self.epsilon * self.total
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-value counter
+
+    ``2 ** precision`` one-byte registers; the standard error of an
+    estimate is about ``1.04 / sqrt(2 ** precision)`` (0.81% at the default
+    precision of 14, in 16 KB). Small cardinalities use linear counting.
+    """
+
+    def __init__(self, precision=14, registers=None):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = registers if registers is not None else np.zeros(self.size, dtype=np.uint8)
+
+    def add(self, values):
+        """Add values (compared as strings)"""
+        if len(values) == 0:
+            return
+        hashes = _hash(values)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        rest = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - _bit_length(rest) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def estimate(self):
+        """Estimated number of distinct values added"""
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+    @property
+    def standard_error(self):
+        return 1.04 / math.sqrt(self.size)
+
+
+class SignatureSketch:
+    """Approximate occurrence counts for games keyed by `columns`
+
+    Holds a CountMinSketch of signature frequencies plus HyperLogLogs of
+    distinct players and distinct signatures, so memory stays constant no
+    matter how many games or signatures are added. Signatures are the
+    column values joined with '|', numbers normalised so an int and a
+    float stat compare equal; engines key it by their raw exact stats,
+    whose signatures are too many for an exact count table.
+    """
+
+    def __init__(self, columns, player_column='player_id', epsilon=2e-5, delta=0.01, precision=14):
+        self.columns = list(columns)
+        self.player_column = player_column
+        self.counts = CountMinSketch(epsilon, delta)
+        self.players = HyperLogLog(precision)
+        self.signatures = HyperLogLog(precision)
+
+    def signature_keys(self, games):
+        games = pd.DataFrame(games)
+        return _key_strings(games[self.columns[0]]).str.cat(
+            [_key_strings(games[col]) for col in self.columns[1:]], sep='|'
+        )
+
+    def add(self, games):
+        """Add a DataFrame of games"""
+        keys = self.signature_keys(games)
+        self.counts.add(keys)
+        self.signatures.add(keys)
+        if self.player_column in games.columns:
+            self.players.add(games[self.player_column])
+
+    def estimate(self, games):
+        """Estimated occurrence count of each game's signature"""
+        return self.counts.estimate(self.signature_keys(games))
+
+    @property
+    def total(self):
+        return self.counts.total
+
+    def summary(self):
+        return {
+            'total_games': self.total,
+            'distinct_players': self.players.estimate(),
+            'distinct_signatures': self.signatures.estimate(),
+            'count_error_bound': self.counts.error_bound,
+            'count_confidence': 1 - self.counts.delta,
+            'distinct_standard_error': self.players.standard_error
+        }
+
+    def save(self, path):
+        """Write the sketch to `path` (.npz), replacing any previous file atomically"""
+        meta = {
+            'columns': self.columns, 'player_column': self.player_column,
+            'epsilon': self.counts.epsilon, 'delta': self.counts.delta,
+            'precision': self.players.precision, 'total': self.total
+        }
+        _save_npz(path, meta, counts=self.counts.counts,
+                  players=self.players.registers, signatures=self.signatures.registers)
+
+    @classmethod
+    def load(cls, path):
+        """Read a sketch written by save(); None if missing or unreadable"""
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data['meta']))
+                sketch = cls(meta['columns'], meta['player_column'], meta['epsilon'], meta['delta'], meta['precision'])
+                sketch.counts = CountMinSketch(meta['epsilon'], meta['delta'], data['counts'], meta['total'])
+                sketch.players = HyperLogLog(meta['precision'], registers=data['players'])
+                sketch.signatures = HyperLogLog(meta['precision'], registers=data['signatures'])
+            return sketch
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read sketch {path}: {e}")
+            return None
+
+
+class TDigest:
+    """Merging t-digest of one numeric stat
+
+    Values are merged into at most about `compression` / 2 weighted centroids,
+    sized by the arcsine scale function so centroids shrink towards the
+    tails: extreme values stay singletons and percentiles of rare games are
+    the most accurate. Digests of separate batches merge into one, and a
+    percentile lookup is a binary search over the centroids. Repeated
+    values (most stats are integer counts) share one centroid, so a tied
+    value's percentile is its mid-rank.
+    """
+
+    def __init__(self, compression=200, means=None, weights=None):
+        self.compression = compression
+        self.means = means if means is not None else np.empty(0)
+        self.weights = weights if weights is not None else np.empty(0)
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def add(self, values):
+        """Add an array-like of values; missing or non-numeric values are skipped"""
+        values = pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy(dtype=np.float64)
+        self._merge(values, np.ones(len(values)))
+        return self
+
+    def merge(self, other):
+        """Merge another digest into this one"""
+        self._merge(other.means, other.weights)
+        return self
+
+    def _merge(self, means, weights):
+        if len(means) == 0:
+            return
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        means, inverse = np.unique(means, return_inverse=True)
+        weights = np.bincount(inverse, weights=weights)
+
+        # Cluster by whole steps of the scale function k(q) over each centroid's mid-rank
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        cluster = np.floor(k - k[0]).astype(np.int64)
+        # Keep the minimum and maximum exact
+        cluster[1:] += 1
+        cluster[-1] += 1
+        _, cluster = np.unique(cluster, return_inverse=True)
+
+        merged_weights = np.bincount(cluster, weights=weights)
+        self.means = np.bincount(cluster, weights=means * weights) / merged_weights
+        self.weights = merged_weights
+
+    def percentile(self, values):
+        """Percent of values below each of `values`, counting ties as half; NaN if unknown"""
+        values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64)
+        total = self.count
+        if total == 0:
+            return np.full(len(values), np.nan)
+        mid_ranks = np.cumsum(self.weights) - self.weights / 2
+        ranks = np.interp(values, self.means, mid_ranks, left=0, right=total)
+        return 100 * ranks / total
+
+
+def _save_npz(path, meta, **arrays):
+    """Write arrays plus JSON `meta` to `path`, replacing any previous file atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp, 'wb') as f:
+        np.savez_compressed(f, meta=np.array(json.dumps(meta)), **arrays)
+    os.replace(tmp, path)
+
+
+def save_digests(path, digests, source=None):
+    """Write {stat: TDigest} to `path`; `source` identifies the data they cover"""
+    meta = {'source': source, 'compression': {stat: d.compression for stat, d in digests.items()}}
+    arrays = {}
+    for stat, digest in digests.items():
+        arrays[f'{stat}.means'] = digest.means
+        arrays[f'{stat}.weights'] = digest.weights
+    _save_npz(path, meta, **arrays)
+
+
+def load_digests(path):
+    """(digests, source) written by save_digests, or (None, None) if missing or unreadable"""
+    try:
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            digests = {
+                stat: TDigest(compression, data[f'{stat}.means'], data[f'{stat}.weights'])
+                for stat, compression in meta['compression'].items()
+            }
+        return digests, meta['source']
+    except FileNotFoundError:
+        return None, None
+    except Exception as e:
+        logger.warning(f"Could not read digests {path}: {e}")
+        return None, None
+
+
+def sketch_path(sport, table, kind='sketch'):
+    """Where a sketch of a sport's games table lives ('sketch' or 'quantiles')"""
+    return Path(f"data/index/{sport}_{table}_{kind}.npz")
+
+
+def update_sketch(sport, table, games):
+    """Add newly inserted games to an existing sketch
+
+    Call after appending rows to a games table. Does nothing until the
+    rarity engine has built the sketch from the full table; an engine
+    rebuilds it if its total drifts from the table's row count.
+    """
+    path = sketch_path(sport, table)
+    sketch = SignatureSketch.load(path)
+    if sketch is None or len(games) == 0:
+        return
+    if not all(col in games.columns for col in sketch.columns):
+        logger.warning(f"Sketch columns {sketch.columns} missing from new {sport} {table} rows")
+        return
+    sketch.add(games)
+    sketch.save(path)
@@ -0,0 +1,411 @@
+"""Seeded, vectorized synthetic games for demos and rarity engine benchmarks"""
+import sqlite3
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from loguru import logger
+from .buckets import apply_buckets
+from .table_stats import record_row_count
+
+DEFAULT_SEASONS = range(2000, 2025)
+
+NBA_TEAMS = np.array(["LAL", "BOS", "NYK", "BRK", "PHI", "TOR", "CHI", "MIL", "IND"], dtype=object)
+MLB_TEAMS = np.array(["NYY", "BOS", "TOR", "BAL", "TB", "LAD", "SF", "NYM", "ATL", "PHI"], dtype=object)
+NHL_TEAMS = np.array([
+    "Bruins", "Sabres", "Canadiens", "Senators", "Maple Leafs",
+    "Hurricanes", "Panthers", "Lightning", "Capitals", "Blue Jackets",
+    "Devils", "Islanders", "Rangers", "Flyers", "Penguins",
+    "Blackhawks", "Red Wings", "Blues", "Jets", "Predators",
+    "Stars", "Avalanche", "Wild", "Oilers", "Canucks", "Flames",
+    "Sharks", "Kraken", "Golden Knights", "Ducks", "Coyotes", "Kings"
+], dtype=object)
+CL_TEAMS = np.array([
+    "Real Madrid", "Manchester City", "Bayern Munich", "Barcelona",
+    "PSG", "Liverpool", "Chelsea", "Arsenal", "Manchester United",
+    "Inter Milan", "AC Milan", "Juventus", "Atletico Madrid",
+    "Borussia Dortmund", "Tottenham", "Napoli", "Benfica", "Porto"
+], dtype=object)
+CL_POSITIONS = np.array(["FW", "MF", "DF"], dtype=object)
+CL_ROUNDS = np.array(["Group Stage"] * 6 + ["Round of 16"] * 2 + ["Quarter-Final"] * 2 +
+                     ["Semi-Final"] * 2 + ["Final"], dtype=object)
+
+# Circuit name, laps and average lap time in seconds
+F1_CIRCUITS = [
+    ("Bahrain International Circuit", 57, 95), ("Jeddah Corniche Circuit", 50, 88), ("Albert Park", 58, 85),
+    ("Suzuka Circuit", 53, 92), ("Shanghai International Circuit", 56, 90),
+    ("Miami International Autodrome", 57, 93), ("Circuit de Monaco", 78, 75),
+    ("Circuit Gilles Villeneuve", 70, 78), ("Circuit de Barcelona-Catalunya", 66, 82),
+    ("Red Bull Ring", 71, 68), ("Silverstone Circuit", 52, 87), ("Hungaroring", 70, 76),
+    ("Spa-Francorchamps", 44, 108), ("Circuit Zandvoort", 72, 73), ("Monza Circuit", 53, 84),
+    ("Marina Bay Street Circuit", 62, 95), ("Circuit of the Americas", 56, 95),
+    ("Rodriguez Brothers Circuit", 71, 78), ("Interlagos", 71, 73), ("Las Vegas Street Circuit", 50, 90),
+    ("Yas Marina Circuit", 58, 85)
+]
+F1_GRID = 20
+F1_POINTS = np.array([25, 18, 15, 12, 10, 8, 6, 4, 2, 1])
+
+
+def _gamma_poisson(rng, mean, shape):
+    """Overdispersed counts: Poisson draws around gamma-distributed means"""
+    return rng.poisson(rng.gamma(shape, np.asarray(mean) / shape))
+
+
+def _opponents(rng, team, n_teams):
+    """A random team index other than `team` for every row"""
+    return (team + rng.integers(1, n_teams, size=len(team))) % n_teams
+
+
+def _rank_within(groups, scores):
+    """1-based rank of each score within its group, highest first"""
+    order = np.lexsort((-scores, groups))
+    ordered = groups[order]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    counts = np.diff(np.r_[starts, len(order)])
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order)) - np.repeat(starts, counts) + 1
+    return ranks
+
+
+def _nba_traits(rng, n):
+    return {
+        'minutes': rng.uniform(20, 36, n),
+        # Per-minute production; the gamma tails are the league's stars
+        'points': rng.gamma(8, 0.056, n),
+        'rebounds': rng.gamma(3, 0.06, n),
+        'assists': rng.gamma(2.5, 0.05, n),
+        'team': rng.integers(0, len(NBA_TEAMS), n),
+    }
+
+
+def _nba_rows(rng, traits, p, g, race):
+    minutes = np.clip(rng.normal(traits['minutes'][p], 5), 5, 48)
+    team = traits['team'][p]
+    return {
+        'week': g // 4 + 1,
+        'team': NBA_TEAMS[team],
+        'opponent': '@' + NBA_TEAMS[_opponents(rng, team, len(NBA_TEAMS))],
+        'points': _gamma_poisson(rng, traits['points'][p] * minutes, 20),
+        'rebounds': _gamma_poisson(rng, traits['rebounds'][p] * minutes, 6),
+        'assists': _gamma_poisson(rng, traits['assists'][p] * minutes, 6),
+        'steals': rng.poisson(0.035 * minutes),
+        'blocks': rng.poisson(0.02 * minutes),
+        'minutes': np.round(minutes, 1),
+    }
+
+
+def _mlb_traits(rng, n):
+    return {
+        'average': rng.beta(26, 74, n),
+        # Share of hits that leave the park, walk and steal rates
+        'power': rng.beta(2, 14, n),
+        'eye': rng.beta(2, 20, n),
+        'speed': rng.beta(1, 30, n),
+        'team': rng.integers(0, len(MLB_TEAMS), n),
+    }
+
+
+def _mlb_rows(rng, traits, p, g, race):
+    at_bats = rng.integers(2, 6, size=len(p))
+    hits = rng.binomial(at_bats, traits['average'][p])
+    home_runs = rng.binomial(hits, traits['power'][p])
+    other_hits = hits - home_runs
+    walks = rng.binomial(2, traits['eye'][p])
+    extra_bases = rng.binomial(other_hits, 0.25)
+    team = traits['team'][p]
+    return {
+        'week': g // 7 + 1,
+        'team': MLB_TEAMS[team],
+        'opponent': '@' + MLB_TEAMS[_opponents(rng, team, len(MLB_TEAMS))],
+        'hits': hits,
+        'runs': home_runs + rng.binomial(other_hits + walks, 0.3),
+        'rbis': home_runs + rng.poisson(0.35 * other_hits + 0.5 * home_runs),
+        'home_runs': home_runs,
+        'stolen_bases': rng.binomial(other_hits + walks, traits['speed'][p]),
+        'batting_avg': np.round(hits / at_bats, 3),
+        'slugging_pct': np.round((hits + extra_bases + 3 * home_runs) / at_bats, 3),
+        'on_base_pct': np.round((hits + walks) / (at_bats + walks), 3),
+        'at_bats': at_bats,
+    }
+
+
+def _nhl_traits(rng, n):
+    defense = rng.random(n) < 0.33
+    return {
+        'defense': defense,
+        'shots': np.where(defense, rng.gamma(4, 0.45, n), rng.gamma(4, 0.7, n)),
+        'shooting': np.where(defense, rng.beta(5, 95, n), rng.beta(10, 90, n)),
+        'assists': np.where(defense, rng.gamma(3, 0.12, n), rng.gamma(3, 0.15, n)),
+        'time_on_ice': np.where(defense, rng.uniform(18, 25, n), rng.uniform(12, 21, n)),
+        'team': rng.integers(0, len(NHL_TEAMS), n),
+    }
+
+
+def _nhl_rows(rng, traits, p, g, race):
+    usual_ice = traits['time_on_ice'][p]
+    time_on_ice = np.clip(np.round(rng.normal(usual_ice, 2.5)), 5, 32).astype(np.int64)
+    shots = _gamma_poisson(rng, traits['shots'][p] * time_on_ice / usual_ice, 5)
+    goals = rng.binomial(shots, traits['shooting'][p])
+    assists = _gamma_poisson(rng, traits['assists'][p], 4)
+    team = traits['team'][p]
+    return {
+        'home_team': NHL_TEAMS[team],
+        'away_team': NHL_TEAMS[_opponents(rng, team, len(NHL_TEAMS))],
+        'goals': goals,
+        'assists': assists,
+        'points': goals + assists,
+        'shots': shots,
+        'plus_minus': rng.poisson(0.8, len(p)) - rng.poisson(0.8, len(p)),
+        'penalty_minutes': 2 * rng.poisson(0.3, len(p)),
+        'time_on_ice': time_on_ice,
+        'position': np.where(traits['defense'][p], 'D', 'F').astype(object),
+    }
+
+
+def _cl_traits(rng, n):
+    position = rng.choice(len(CL_POSITIONS), n, p=[0.3, 0.4, 0.3])
+    # Per-90 rates by position (FW, MF, DF), varied per player
+    return {
+        'position': position,
+        'shots': np.array([3.0, 1.5, 0.6])[position] * rng.gamma(5, 0.2, n),
+        'on_target': rng.beta(8, 12, n),
+        'conversion': rng.beta(6, 14, n),
+        'assists': np.array([0.25, 0.3, 0.1])[position] * rng.gamma(3, 1 / 3, n),
+        'passes': np.array([30, 60, 50])[position] * rng.uniform(0.7, 1.3, n),
+        'pass_accuracy': np.array([72, 85, 84])[position] + rng.normal(0, 3, n),
+        'team': rng.integers(0, len(CL_TEAMS), n),
+    }
+
+
+def _cl_rows(rng, traits, p, g, race):
+    minutes = np.where(rng.random(len(p)) < 0.8, 90, rng.integers(15, 90, size=len(p)))
+    share = minutes / 90
+    shots = _gamma_poisson(rng, traits['shots'][p] * share, 4)
+    shots_on_target = rng.binomial(shots, traits['on_target'][p])
+    team = traits['team'][p]
+    return {
+        'round': CL_ROUNDS[g % len(CL_ROUNDS)],
+        'home_team': CL_TEAMS[team],
+        'away_team': CL_TEAMS[_opponents(rng, team, len(CL_TEAMS))],
+        'goals': rng.binomial(shots_on_target, traits['conversion'][p]),
+        'assists': _gamma_poisson(rng, traits['assists'][p] * share, 3),
+        'shots': shots,
+        'shots_on_target': shots_on_target,
+        'passes': rng.poisson(traits['passes'][p] * share),
+        'pass_accuracy': np.round(np.clip(rng.normal(traits['pass_accuracy'][p], 4), 40, 100), 1),
+        'minutes_played': minutes,
+        'position': CL_POSITIONS[traits['position'][p]],
+    }
+
+
+def _f1_traits(rng, n):
+    return {
+        'skill': rng.normal(0, 1, n),
+        'reliability': rng.beta(23, 2, n),
+    }
+
+
+def _f1_rows(rng, traits, p, g, race):
+    circuit = g % len(F1_CIRCUITS)
+    names, laps, lap_times = (np.array(column, dtype=dtype)[circuit]
+                              for column, dtype in zip(zip(*F1_CIRCUITS), (object, np.int64, np.float64)))
+    skill = traits['skill'][p]
+    # Drivers race in grids of F1_GRID; rank qualifying and finishing order within each grid
+    grids = race * -(-len(traits['skill']) // F1_GRID) + p // F1_GRID
+    grid_position = _rank_within(grids, skill + rng.gumbel(0, 0.7, len(p)))
+    finished = rng.random(len(p)) < traits['reliability'][p]
+    pace = skill - 0.08 * grid_position + rng.gumbel(0, 0.8, len(p))
+    position = _rank_within(grids, np.where(finished, pace, pace - 1e6))
+    lapped = finished & (position > 12) & (rng.random(len(p)) < 0.5)
+    laps_completed = np.where(finished, laps - lapped, rng.integers(1, laps, size=len(p)))
+    gap_to_leader = np.where(position == 1, 0.0, (position - 1) * rng.gamma(2, 2.5, len(p)))
+    return {
+        'round': g + 1,
+        'circuit_name': names,
+        'position': position,
+        'grid_position': grid_position,
+        'laps_completed': laps_completed,
+        'race_time': np.round(laps_completed * lap_times * 1.02 + gap_to_leader, 3),
+        'fastest_lap': np.round(lap_times * rng.normal(0.99, 0.006, len(p)) - 0.15 * skill, 3),
+        'points': np.where(position <= len(F1_POINTS), F1_POINTS[np.minimum(position, len(F1_POINTS)) - 1], 0),
+        'overtakes': np.maximum(grid_position - position, 0) + rng.poisson(1.5, len(p)),
+        'status': np.where(~finished, rng.choice(np.array(["Retired", "Accident"], dtype=object), len(p), p=[0.75, 0.25]),
+                           np.where(lapped, "+1 Lap", "Finished")).astype(object),
+        'gap_to_leader': np.round(gap_to_leader, 3),
+    }
+
+
+class SportSpec:
+    """Table layout, calendar and stat model of one sport's synthetic games
+
+    `season_start` is (year offset from the season, month, day) and games
+    fall every `day_step` days after it. `traits(rng, n)` draws per-player
+    parameters once; `rows(rng, traits, p, g, race)` draws the stat columns
+    for rows of player index `p` in season slot `g` of race/round `race`.
+    With `whole_slots`, batches are cut at slot boundaries so `rows` sees
+    every player of a slot together (F1 ranks each grid).
+    """
+
+    def __init__(self, table, key, player_column, name_column, date_column, season_start, day_step,
+                 games_per_season, roster, traits, rows, whole_slots=False):
+        self.table = table
+        self.key = key
+        self.player_column = player_column
+        self.name_column = name_column
+        self.date_column = date_column
+        self.season_start = season_start
+        self.day_step = day_step
+        self.games_per_season = games_per_season
+        self.roster = roster
+        self.traits = traits
+        self.rows = rows
+        self.whole_slots = whole_slots
+
+
+SPORTS = {
+    'nba': SportSpec('games', 'game_id', 'player_id', 'player_name', 'game_date', (-1, 10, 1), 2, 82, [
+        "LeBron James", "Stephen Curry", "Kevin Durant", "Giannis Antetokounmpo",
+        "Luka Dončić", "Nikola Jokić", "Joel Embiid", "Jayson Tatum",
+        "Damian Lillard", "Anthony Davis", "Kyrie Irving"
+    ], _nba_traits, _nba_rows),
+    'mlb': SportSpec('games', 'game_id', 'player_id', 'player_name', 'game_date', (0, 4, 1), 1, 162, [
+        "Mike Trout", "Aaron Judge", "Mookie Betts", "Freddie Freeman",
+        "Shohei Ohtani", "Juan Soto", "Bryce Harper", "Paul Goldschmidt",
+        "Manny Machado", "Nolan Arenado", "Trea Turner", "Jose Altuve",
+        "Jose Ramirez", "Rafael Devers", "Xander Bogaerts"
+    ], _mlb_traits, _mlb_rows),
+    'nhl': SportSpec('games', 'game_id', 'player_id', 'player_name', 'game_date', (0, 10, 1), 2, 82, [
+        "Connor McDavid", "Nathan MacKinnon", "Sidney Crosby", "Leon Draisaitl",
+        "Auston Matthews", "David Pastrňák", "Jason Robertson", "Kirill Kaprizov",
+        "Jack Hughes", "Brayden Point", "Nikita Kucherov", "Steven Stamkos",
+        "Cale Makar", "Roman Josi", "Victor Hedman", "Adam Fox",
+        "Aleksander Barkov", "Jonathan Huberdeau", "Sam Reinhart", "Mitch Marner"
+    ], _nhl_traits, _nhl_rows),
+    'f1': SportSpec('races', 'race_id', 'driver_id', 'driver_name', 'race_date', (0, 3, 1), 14, 22, [
+        "Max Verstappen", "Lewis Hamilton", "Charles Leclerc", "Sergio Perez",
+        "Carlos Sainz", "Lando Norris", "George Russell", "Fernando Alonso",
+        "Esteban Ocon", "Pierre Gasly", "Lance Stroll", "Oscar Piastri",
+        "Yuki Tsunoda", "Valtteri Bottas", "Guanyu Zhou", "Logan Sargeant",
+        "Nico Hulkenberg", "Kevin Magnussen", "Alexander Albon"
+    ], _f1_traits, _f1_rows, whole_slots=True),
+    'champions_league': SportSpec('matches', 'match_id', 'player_id', 'player_name', 'match_date', (0, 9, 1), 14, 13, [
+        "Kylian Mbappé", "Erling Haaland", "Kevin De Bruyne", "Vinícius Júnior",
+        "Jude Bellingham", "Lionel Messi", "Cristiano Ronaldo", "Robert Lewandowski",
+        "Harry Kane", "Mohamed Salah", "Neymar", "Luka Modrić",
+        "Pedri", "Jamal Musiala", "Phil Foden", "Bukayo Saka",
+        "Victor Osimhen", "Raphinha", "Rodrigo", "Alvaro Morata"
+    ], _cl_traits, _cl_rows),
+}
+
+
+def iter_games(sport, n=None, seed=None, seasons=None, players=None, games_per_season=None, start=None,
+               batch_size=100000):
+    """Yield `n` synthetic games for `sport` as bucketed DataFrames of up to `batch_size` rows
+
+    Rows fill a season x slot x player grid, players fastest, so n rows
+    cover every season with as many players as they need: the sport's
+    roster first, then "Player 000042"-style names. `players` fixes the
+    names instead, and n defaults to the full grid. `start` moves the first
+    season's start date (games fall strictly after it). Columns match the
+    sport's archive and current tables.
+
+    Player traits and every batch draw from their own ``numpy.random``
+    Generator spawned from `seed`, so the same seed and batch_size give the
+    same rows however the batches are consumed.
+    """
+    spec = SPORTS[sport]
+    seasons = np.asarray(list(seasons or DEFAULT_SEASONS))
+    slots = games_per_season or spec.games_per_season
+    if players is None:
+        count = len(spec.roster) if n is None else max(1, -(-n // (len(seasons) * slots)))
+        players = spec.roster[:count] + [f"Player {i:06d}" for i in range(len(spec.roster), count)]
+    names = np.asarray(players, dtype=object)
+    keys = np.array([name.replace(' ', '_') for name in names], dtype=object)
+    player_ids = np.array([key.lower() for key in keys], dtype=object)
+    grid = len(seasons) * slots * len(names)
+    n = grid if n is None else n
+    if n > grid:
+        raise ValueError(f"{n} rows do not fit {len(seasons)} seasons x {slots} games x {len(names)} players")
+
+    year_offset, month, day = spec.season_start
+    starts = np.array([f"{season + year_offset}-{month:02d}-{day:02d}" for season in seasons], dtype='datetime64[D]')
+    if start is not None:
+        starts[0] = np.datetime64(pd.Timestamp(start).date(), 'D')
+
+    root = np.random.SeedSequence(seed)
+    traits = spec.traits(np.random.default_rng(root.spawn(1)[0]), len(names))
+    batch_size = batch_size or max(n, 1)
+    if spec.whole_slots:
+        batch_size = -(-batch_size // len(names)) * len(names)
+    bounds = range(0, n, batch_size)
+    for lo, batch_seed in zip(bounds, root.spawn(len(bounds))):
+        rows = np.arange(lo, min(lo + batch_size, n))
+        p = rows % len(names)
+        race = rows // len(names)
+        g, s = race % slots, race // slots
+        dates = np.datetime_as_string(starts[s] + (g + 1) * spec.day_step, unit='D')
+
+        games = pd.DataFrame({
+            spec.key: pd.Series(seasons[s]).astype(str).str.cat(
+                [pd.Series(np.char.replace(dates, '-', '')), pd.Series(keys[p])], sep='_'
+            ),
+            spec.player_column: player_ids[p],
+            spec.name_column: names[p],
+            'season': seasons[s],
+            spec.date_column: dates.astype(object),
+        })
+        for column, values in spec.rows(np.random.default_rng(batch_seed), traits, p, g, race).items():
+            games[column] = values
+        yield apply_buckets(games, sport)
+
+
+def generate(sport, n=None, seed=None, **kwargs):
+    """All of iter_games' rows as one DataFrame"""
+    batches = list(iter_games(sport, n, seed, batch_size=None, **kwargs))
+    return batches[0] if batches else pd.DataFrame()
+
+
+def _create_sql(table, games, key):
+    types = {'i': 'INTEGER', 'u': 'INTEGER', 'b': 'INTEGER', 'f': 'REAL'}
+    columns = [f'"{column}" {types.get(dtype.kind, "TEXT")}' for column, dtype in games.dtypes.items()]
+    return f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)}, PRIMARY KEY ({key}))"
+
+
+def write_archive(sport, n, db_path=None, seed=None, batch_size=100000, replace=False, **kwargs):
+    """Stream `n` synthetic games into a sport's archive database; returns rows written
+
+    Each batch is inserted and committed on its own, so memory stays at one
+    batch however large the archive (1M-50M rows for benchmarks). Defaults
+    to the archive the sport's rarity engine reads; a table that already
+    has rows is only overwritten with `replace`. Signature indexes are left
+    to the engine's ``ensure_indexes``, which is faster after the load.
+    """
+    spec = SPORTS[sport]
+    db_path = Path(db_path or f"data/archive/{sport}_archive.db")
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    try:
+        # A crash mid-load leaves an archive to regenerate anyway
+        conn.execute("PRAGMA synchronous = OFF")
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (spec.table,)
+        ).fetchone()
+        if exists and replace:
+            conn.execute(f"DROP TABLE {spec.table}")
+        elif exists and conn.execute(f"SELECT 1 FROM {spec.table} LIMIT 1").fetchone():
+            raise ValueError(f"{db_path} already has {spec.table} rows; pass replace=True to overwrite")
+
+        written = 0
+        for games in iter_games(sport, n, seed, batch_size=batch_size, **kwargs):
+            columns = ', '.join(f'"{column}"' for column in games.columns)
+            with conn:
+                conn.execute(_create_sql(spec.table, games, spec.key))
+                conn.executemany(
+                    f"INSERT INTO {spec.table} ({columns}) VALUES ({', '.join(['?'] * len(games.columns))})",
+                    zip(*(games[column].tolist() for column in games.columns))
+                )
+            written += len(games)
+            logger.info(f"Wrote {written:,}/{n:,} synthetic {sport} rows to {db_path}")
+        record_row_count(conn, spec.table)
+    finally:
+        conn.close()
+    return written
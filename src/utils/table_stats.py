@@ -0,0 +1,54 @@
+"""Cached per-table row counts stored alongside the data they describe"""
+import sqlite3
+from datetime import datetime
+
+
+def _init_table_stats(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS table_stats (
+            table_name TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL,
+            max_rowid INTEGER,
+            updated_at TEXT
+        )
+    """)
+
+
+def record_row_count(conn, table, updated_at=None, commit=True):
+    """Recount `table` after a write and store the result in table_stats
+
+    Call this from anything that inserts into or replaces a games table so
+    readers can use the cached count instead of COUNT(*). `updated_at`
+    defaults to now. Commits (unless `commit` is False, for callers that
+    manage their own transaction) and returns the new count.
+    """
+    _init_table_stats(conn)
+    row_count, max_rowid = conn.execute(f"SELECT COUNT(*), MAX(rowid) FROM {table}").fetchone()
+    conn.execute(
+        "INSERT OR REPLACE INTO table_stats (table_name, row_count, max_rowid, updated_at) VALUES (?, ?, ?, ?)",
+        (table, row_count, max_rowid, updated_at or datetime.now().isoformat())
+    )
+    if commit:
+        conn.commit()
+    return row_count
+
+
+def cached_row_count(conn, table, schema='main'):
+    """Cached row count for `table`, or None when missing or stale
+
+    The cache is considered stale when the table's MAX(rowid), an O(1)
+    b-tree seek, no longer matches the value recorded with the count, i.e.
+    rows were appended by something that did not call record_row_count.
+    """
+    try:
+        row = conn.execute(
+            f"SELECT row_count, max_rowid FROM {schema}.table_stats WHERE table_name = ?", (table,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # Database predates table_stats
+        return None
+    if row is None:
+        return None
+
+    max_rowid = conn.execute(f"SELECT MAX(rowid) FROM {schema}.{table}").fetchone()[0]
+    return row[0] if max_rowid == row[1] else None
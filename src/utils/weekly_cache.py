@@ -0,0 +1,125 @@
+"""Local Parquet cache of upstream weekly season data"""
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+import pandas as pd
+from loguru import logger
+
+
+def offline_mode():
+    """True when GAAS_OFFLINE is set: serve upstream data from data/cache only"""
+    return os.getenv('GAAS_OFFLINE', '').lower() not in ('', '0', 'false', 'no')
+
+
+def content_hash(frame):
+    """SHA-256 of a frame's values, independent of its index"""
+    return hashlib.sha256(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes()).hexdigest()
+
+
+class WeeklyCache:
+    """One season of weekly data cached as Parquet under data/cache
+
+    Weeks before the previous one are final, so a refresh keeps them from
+    the local file and takes only the current and previous week from
+    upstream. A cache fetched less than `max_age` ago is served without a
+    download, and offline (``offline=True`` or GAAS_OFFLINE) it is served
+    as-is, so tests and benchmarks can run from cached fixtures. The fetch
+    time, content hash and weeks are kept in a JSON file next to the data.
+
+    `fetch` downloads a full season frame for a season (e.g.
+    ``lambda season: nfl.import_weekly_data([season])``); the upstream
+    files are per season, so a refresh is one download however many weeks
+    change.
+    """
+
+    def __init__(self, name, season, fetch, cache_dir="data/cache", max_age=timedelta(minutes=30),
+                 offline=None, week_column='week'):
+        self.name = name
+        self.season = season
+        self.fetch = fetch
+        self.path = Path(cache_dir) / f"{name}_{season}.parquet"
+        self.meta_path = self.path.with_suffix('.json')
+        self.max_age = max_age
+        self.offline = offline_mode() if offline is None else offline
+        self.week_column = week_column
+
+    def meta(self):
+        """Fetch time, content hash and weeks of the cached frame; None if not cached"""
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Could not read cache metadata {self.meta_path}: {e}")
+            return None
+
+    def load(self):
+        """The cached frame, or None"""
+        if not self.path.exists():
+            return None
+        try:
+            return pd.read_parquet(self.path)
+        except Exception as e:
+            logger.warning(f"Could not read cache {self.path}: {e}")
+            return None
+
+    def get(self, refresh=False):
+        """Season frame from the cache, refreshing stale weeks when due
+
+        `refresh` forces a download even if the cache is younger than
+        max_age. Raises FileNotFoundError offline when nothing is cached.
+        """
+        meta, cached = self.meta(), self.load()
+        if self.offline:
+            if cached is None:
+                raise FileNotFoundError(f"Offline and no cached {self.name} data for {self.season} at {self.path}")
+            return cached
+
+        if cached is not None and meta is not None and not refresh:
+            age = datetime.now() - datetime.fromisoformat(meta['fetched_at'])
+            if age < self.max_age:
+                logger.info(f"Using cached {self.name} {self.season} data fetched {int(age.total_seconds() // 60)} minutes ago")
+                return cached
+
+        upstream = self.fetch(self.season)
+        frame = self._merge(cached, upstream)
+        digest = content_hash(frame)
+        try:
+            if meta is None or cached is None or meta.get('hash') != digest:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+                frame.to_parquet(tmp, index=False)
+                os.replace(tmp, self.path)
+                logger.info(f"Cached {len(frame)} {self.name} {self.season} rows at {self.path}")
+            else:
+                logger.info(f"{self.name} {self.season} unchanged upstream")
+            self._write_meta(frame, digest)
+        except Exception as e:
+            # The cache is an optimization; serve the fresh frame regardless
+            logger.warning(f"Could not write cache {self.path}: {e}")
+        return frame
+
+    def _merge(self, cached, upstream):
+        """Final weeks from the cache, the current and previous week from upstream"""
+        upstream = upstream.reset_index(drop=True)
+        if cached is None or len(upstream) == 0 or list(cached.columns) != list(upstream.columns):
+            return upstream
+        weeks = upstream[self.week_column]
+        final = cached[cached[self.week_column] < weeks.max() - 1]
+        # Weeks the cache never saw (e.g. no run during a week) come from upstream too
+        fresh = upstream[~weeks.isin(final[self.week_column].unique())]
+        return pd.concat([final, fresh], ignore_index=True)
+
+    def _write_meta(self, frame, digest):
+        meta = {
+            'season': self.season,
+            'fetched_at': datetime.now().isoformat(),
+            'hash': digest,
+            'rows': len(frame),
+            'weeks': sorted(int(week) for week in frame[self.week_column].unique())
+        }
+        with open(self.meta_path, 'w') as f:
+            json.dump(meta, f, indent=2)
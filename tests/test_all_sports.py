@@ -246,6 +246,959 @@ class TestAllSports:
         assert 'classification' in rarity, "Should have classification"
         assert 'occurrence_count' in rarity, "Should have occurrence_count"
 
+    @pytest.fixture
+    def rb_dbs(self, temp_dir, monkeypatch):
+        """Create small NFL RB archive/current databases in a temp working dir"""
+        import sqlite3
+        monkeypatch.chdir(temp_dir)
+
+        rows = {
+            'archive': [
+                ('g1', 'p1', 'Back One', '2001-09-09', '0-49', '0', '0'),
+                ('g2', 'p2', 'Back Two', '2003-09-14', '200+', '3', '0'),
+                ('g3', 'p3', 'Back Three', '2002-10-01', '0-49', '0', '0'),
+            ],
+            'current': [
+                ('g4', 'p4', 'Back Four', '2024-09-08', '0-49', '0', '0'),
+                ('g5', 'p5', 'Back Five', '2024-09-15', '200+', '3', '1'),
+            ]
+        }
+        for name, games in rows.items():
+            db = temp_dir / "data" / name / f"nfl_{name}.db"
+            db.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db)
+            conn.execute("""
+                CREATE TABLE rb_games (
+                    game_id TEXT, player_id TEXT, player_name TEXT, game_date TEXT,
+                    rush_yards_bucket TEXT, rush_td_bucket TEXT, fumbles_bucket TEXT
+                )
+            """)
+            conn.executemany("INSERT INTO rb_games VALUES (?, ?, ?, ?, ?, ?, ?)", games)
+            conn.commit()
+            conn.close()
+        return temp_dir
+
+    def test_bucket_counts_index(self, rb_dbs):
+        """Test bucket_counts lookups match archive + current occurrences"""
+        from processors.rarity_engine import RarityEngine
+
+        engine = RarityEngine('nfl', 'rb')
+        game = {'rush_yards_bucket': '0-49', 'rush_td_bucket': '0', 'fumbles_bucket': '0'}
+
+        rarity = engine.compute_rarity(game)
+        assert (rb_dbs / "data" / "index" / "nfl_index.db").exists(), "Index should be persisted"
+        assert rarity['occurrence_count'] == 3
+        assert rarity['total_games'] == 5
+        assert rarity['first_occurrence']['game_id'] == 'g1'
+        assert rarity['last_occurrence']['game_id'] == 'g4'
+
+        rare = engine.compute_rarity({'rush_yards_bucket': '200+', 'rush_td_bucket': '3', 'fumbles_bucket': '1'})
+        assert rare['occurrence_count'] == 1
+        assert rare['classification'] == 'never_before'
+
+        unseen = engine.compute_rarity({'rush_yards_bucket': '150-199', 'rush_td_bucket': '4+', 'fumbles_bucket': '2+'})
+        assert unseen['occurrence_count'] == 0
+        assert unseen['first_occurrence'] is None
+
+    def test_compute_rarity_batch(self, rb_dbs):
+        """Test batch scoring agrees with per-game compute_rarity"""
+        import pandas as pd
+        from processors.rarity_engine import RarityEngine
+
+        engine = RarityEngine('nfl', 'rb')
+        games = pd.DataFrame({
+            'rush_yards_bucket': ['0-49', '200+', '150-199'],
+            'rush_td_bucket': ['0', '3', '4+'],
+            'fumbles_bucket': ['0', '1', '2+']
+        }, index=[10, 20, 30])
+
+        batch = engine.compute_rarity_batch(games)
+        assert list(batch.index) == [10, 20, 30]
+        for idx, game in games.iterrows():
+            single = engine.compute_rarity(game)
+            row = batch.loc[idx]
+            assert row['occurrence_count'] == single['occurrence_count']
+            assert row['rarity_score'] == single['rarity_score']
+            assert row['classification'] == single['classification']
+
+        assert batch.loc[10, 'first_occurrence'] == 'g1|p1'
+        assert batch.loc[30, 'last_occurrence'] is None
+        assert engine.resolve_occurrences(batch.loc[20].to_dict())['first_occurrence']['player_name'] == 'Back Five'
+
+    def test_shared_game_id(self, rb_dbs):
+        """Test occurrences resolve to the matching player's row when players share a game_id"""
+        import sqlite3
+        import pandas as pd
+        from processors.rarity_engine import RarityEngine
+        from processors.in_memory_rarity import InMemoryRarityEngine
+        from processors.bitmap_index import BitmapIndex
+
+        conn = sqlite3.connect(rb_dbs / "data" / "current" / "nfl_current.db")
+        conn.execute("INSERT INTO rb_games VALUES ('g4', 'p9', 'Back Nine', '2024-09-08', '150-199', '4+', '2+')")
+        conn.commit()
+        conn.close()
+
+        game = {'rush_yards_bucket': '150-199', 'rush_td_bucket': '4+', 'fumbles_bucket': '2+'}
+        with RarityEngine('nfl', 'rb') as engine, InMemoryRarityEngine('nfl', 'rb') as memory:
+            rarity = engine.compute_rarity(game)
+            assert rarity['occurrence_count'] == 1
+            assert rarity['first_occurrence']['player_id'] == 'p9'
+            assert rarity['last_occurrence']['player_id'] == 'p9'
+
+            batch = engine.compute_rarity_batch(pd.DataFrame([game]))
+            assert engine.resolve_occurrences(batch.iloc[0].to_dict())['first_occurrence']['player_id'] == 'p9'
+            assert engine.compute_rarity(game, as_of='2024-12-31')['first_occurrence']['player_id'] == 'p9'
+            assert memory.compute_rarity(game)['first_occurrence']['player_id'] == 'p9'
+            assert BitmapIndex(engine).rarity(game)['first_occurrence']['player_id'] == 'p9'
+
+            common = engine.compute_rarity({'rush_yards_bucket': '0-49', 'rush_td_bucket': '0', 'fumbles_bucket': '0'})
+            assert common['last_occurrence']['player_id'] == 'p4'
+
+    def test_pooled_connections(self, rb_dbs):
+        """Test engines reuse read-only pooled connections across threads"""
+        import sqlite3
+        from concurrent.futures import ThreadPoolExecutor
+        from processors.rarity_engine import RarityEngine
+
+        game = {'rush_yards_bucket': '0-49', 'rush_td_bucket': '0', 'fumbles_bucket': '0', 'player_id': 'p1'}
+        with RarityEngine('nfl', 'rb') as engine:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                counts = list(executor.map(lambda _: len(engine._find_matches(game)), range(32)))
+            assert counts == [3] * 32
+
+            pool = engine._pools[engine.archive_db]
+            assert len(pool._connections) <= engine.POOL_SIZE
+
+            with engine._connect(engine.archive_db) as conn:
+                with pytest.raises(sqlite3.OperationalError):
+                    conn.execute("DELETE FROM rb_games")
+
+        assert engine._pools == {}, "close() should release all pools"
+
+    def test_nested_pool_borrows(self, rb_dbs):
+        """Test a thread nesting more borrows than the pool size reuses its connection"""
+        from concurrent.futures import ThreadPoolExecutor
+        from contextlib import ExitStack
+        from utils.db_pool import ConnectionPool
+
+        pool = ConnectionPool(rb_dbs / "data" / "archive" / "nfl_archive.db", size=2, read_only=True)
+
+        def nest(depth):
+            with ExitStack() as stack:
+                conns = [stack.enter_context(pool.connection()) for _ in range(depth)]
+                return len({id(conn) for conn in conns}), conns[-1].execute("SELECT COUNT(*) FROM rb_games").fetchone()[0]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = [future.result(timeout=10) for future in [executor.submit(nest, 5) for _ in range(4)]]
+        assert results == [(1, 3)] * 4
+        assert len(pool._connections) <= 2
+        assert pool._idle.qsize() == len(pool._connections), "Every connection should be returned"
+        pool.close()
+
+    def test_attached_union_view(self, rb_dbs):
+        """Test archive + current are queried together through one attached view"""
+        from processors.rarity_engine import RarityEngine
+
+        with RarityEngine('nfl', 'rb') as engine:
+            assert engine._get_total_games() == 5
+
+            game = {'rush_yards_bucket': '0-49', 'rush_td_bucket': '0', 'fumbles_bucket': '0'}
+            count, first, last = engine._occurrence_summary(game)
+            assert (count, first['game_date'], last['game_date']) == (3, '2001-09-09', '2024-09-08')
+
+            with engine._connect_all() as conn:
+                schemas = [row[1] for row in conn.execute("PRAGMA database_list")]
+            assert 'current_db' in schemas
+
+    def test_occurrence_summary_seeks(self, rb_dbs):
+        """Test first/last occurrences come from LIMIT 1 seeks, not every match"""
+        import sqlite3
+        from processors.rarity_engine import RarityEngine
+
+        for name in ['archive', 'current']:
+            conn = sqlite3.connect(rb_dbs / "data" / name / f"nfl_{name}.db")
+            conn.execute("CREATE INDEX idx_rb_sig ON rb_games (rush_yards_bucket, rush_td_bucket, fumbles_bucket, game_date)")
+            conn.commit()
+            conn.close()
+
+        with RarityEngine('nfl', 'rb') as engine:
+            game = {'rush_yards_bucket': '0-49', 'rush_td_bucket': '0', 'fumbles_bucket': '0'}
+            count, first, last = engine._occurrence_summary(game)
+            assert count == 3
+            assert first['game_id'] == 'g1' and first['player_name'] == 'Back One'
+            assert last['game_id'] == 'g4'
+            assert engine._occurrence_summary({**game, 'fumbles_bucket': '2+'}) == (0, None, None)
+
+            where_clause, params = engine._signature_filter(game)
+            with engine._connect_all() as conn:
+                plan = ' '.join(row[3] for row in conn.execute(
+                    f"EXPLAIN QUERY PLAN SELECT * FROM {engine.union_view} WHERE {where_clause} "
+                    f"ORDER BY game_date LIMIT 1", params))
+            assert 'SEARCH main.rb_games USING INDEX idx_rb_sig' in plan
+            assert 'TEMP B-TREE' not in plan, "Ordered seek should not sort matches"
+
+    def test_ensure_indexes(self, rb_dbs):
+        """Test signature indexes are created on both databases and stop table scans"""
+        import sqlite3
+        from processors.rarity_engine import RarityEngine
+
+        with RarityEngine('nfl', 'rb') as engine:
+            scans = engine.report_scans()
+            assert 'occurrence_count' in scans and 'occurrence_by_key' in scans
+
+            assert engine.ensure_indexes() == {}, "No lookup should scan once indexed"
+            assert engine.ensure_indexes() == {}, "Index creation should be idempotent"
+
+        for name in ['archive', 'current']:
+            conn = sqlite3.connect(rb_dbs / "data" / name / f"nfl_{name}.db")
+            indexes = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+            conn.close()
+            assert sorted(indexes) == ['idx_rb_games_game_id_player_id', 'idx_rb_games_signature']
+
+    def test_rarity_memo(self, rb_dbs):
+        """Test repeated signatures hit the memo until the data changes"""
+        import sqlite3
+        from processors.rarity_engine import RarityEngine
+
+        game = {'rush_yards_bucket': '0-49', 'rush_td_bucket': '0', 'fumbles_bucket': '0'}
+        with RarityEngine('nfl', 'rb') as engine:
+            first = engine.compute_rarity(game)
+            first['occurrence_count'] = -1
+            assert engine.compute_rarity(game)['occurrence_count'] == 3, "Memoized results should be copies"
+            assert engine.memo_stats() == {'hits': 1, 'misses': 1, 'size': 1}
+
+            conn = sqlite3.connect(rb_dbs / "data" / "current" / "nfl_current.db")
+            conn.execute("INSERT INTO rb_games VALUES ('g6', 'p6', 'Back Six', '2024-09-22', '0-49', '0', '0')")
+            conn.commit()
+            conn.close()
+
+            rarity = engine.compute_rarity(game)
+            assert rarity['occurrence_count'] == 4
+            assert rarity['total_games'] == 6
+            assert engine.memo_stats() == {'hits': 1, 'misses': 2, 'size': 1}
+
+    def test_cached_total_games(self, rb_dbs):
+        """Test total games come from table_stats and fall back to COUNT(*) when stale"""
+        import sqlite3
+        from processors.rarity_engine import RarityEngine
+        from utils.table_stats import record_row_count, cached_row_count
+
+        archive = sqlite3.connect(rb_dbs / "data" / "archive" / "nfl_archive.db")
+        assert cached_row_count(archive, 'rb_games') is None
+        assert record_row_count(archive, 'rb_games') == 3
+        assert cached_row_count(archive, 'rb_games') == 3
+
+        # A recorded count is trusted without recounting
+        archive.execute("UPDATE table_stats SET row_count = 1000 WHERE table_name = 'rb_games'")
+        archive.commit()
+        with RarityEngine('nfl', 'rb') as engine:
+            assert engine._get_total_games() == 1002
+
+        # Appending without recording makes the cache stale
+        archive.execute("INSERT INTO rb_games VALUES ('g7', 'p7', 'Back Seven', '2004-09-12', '0-49', '0', '0')")
+        archive.commit()
+        assert cached_row_count(archive, 'rb_games') is None
+        archive.close()
+        with RarityEngine('nfl', 'rb') as engine:
+            assert engine._get_total_games() == 6
+
+    def test_in_memory_engine(self, rb_dbs):
+        """Test InMemoryRarityEngine agrees with the SQL-backed engine"""
+        import pandas as pd
+        from processors.rarity_engine import RarityEngine
+        from processors.in_memory_rarity import InMemoryRarityEngine, in_memory_engine
+        from processors.nba_rarity import NBARarityEngine
+
+        games = pd.DataFrame({
+            'rush_yards_bucket': ['0-49', '200+', '150-199'],
+            'rush_td_bucket': ['0', '3', '4+'],
+            'fumbles_bucket': ['0', '1', '2+']
+        }, index=[10, 20, 30])
+
+        with RarityEngine('nfl', 'rb') as sql_engine, InMemoryRarityEngine('nfl', 'rb') as engine:
+            pd.testing.assert_frame_equal(
+                engine.compute_rarity_batch(games), sql_engine.compute_rarity_batch(games), check_dtype=False
+            )
+            for _, game in games.iterrows():
+                rarity, expected = engine.compute_rarity(game), sql_engine.compute_rarity(game)
+                assert rarity['occurrence_count'] == expected['occurrence_count']
+                assert rarity['rarity_score'] == expected['rarity_score']
+                for key in ['first_occurrence', 'last_occurrence']:
+                    assert (rarity[key] or {}).get('game_id') == (expected[key] or {}).get('game_id')
+
+        engine_cls = in_memory_engine(NBARarityEngine)
+        assert issubclass(engine_cls, NBARarityEngine) and issubclass(engine_cls, InMemoryRarityEngine)
+        assert in_memory_engine(engine_cls) is engine_cls
+
+    def test_bitmap_index(self, rb_dbs):
+        """Test ad-hoc multi-stat counts from ANDed bitmaps"""
+        from processors.rarity_engine import RarityEngine
+        from processors.bitmap_index import BitmapIndex
+
+        with RarityEngine('nfl', 'rb') as engine:
+            index = BitmapIndex(engine, derived={
+                'current_season': lambda games: games['game_date'] >= '2024-01-01'
+            })
+            assert index.size == 5
+            assert index.count({'rush_yards_bucket': '0-49'}) == 3
+            assert index.count({'rush_yards_bucket': '0-49', 'current_season': True}) == 1
+            assert index.count({'rush_yards_bucket': ['0-49', '200+'], 'fumbles_bucket': 0}) == 4
+            assert index.count({'rush_yards_bucket': '150-199'}) == 0
+            assert list(index.matches({'rush_td_bucket': '3'})) == ['g2', 'g5']
+
+            rarity = index.rarity({'rush_yards_bucket': '200+', 'current_season': False})
+            assert rarity['occurrence_count'] == 1
+            assert rarity['classification'] == 'never_before'
+            assert rarity['first_occurrence']['player_name'] == 'Back Two'
+
+    def test_exact_rarity(self, rb_dbs):
+        """Test "at least this line" counts against a brute-force scan"""
+        import sqlite3
+        import numpy as np
+        from processors.rarity_engine import RarityEngine
+        from processors.dominance_index import DominanceIndex
+
+        stats = {'g1': (30, 0), 'g2': (212, 3), 'g3': (45, 1), 'g4': (212, 2), 'g5': (240, 3)}
+        for name in ['archive', 'current']:
+            conn = sqlite3.connect(rb_dbs / "data" / name / f"nfl_{name}.db")
+            conn.execute("ALTER TABLE rb_games ADD COLUMN rush_yards INTEGER")
+            conn.execute("ALTER TABLE rb_games ADD COLUMN rush_td INTEGER")
+            conn.executemany("UPDATE rb_games SET rush_yards = ?, rush_td = ? WHERE game_id = ?",
+                             [(yards, tds, game_id) for game_id, (yards, tds) in stats.items()])
+            conn.commit()
+            conn.close()
+
+        with RarityEngine('nfl', 'rb') as engine:
+            rarity = engine.compute_exact_rarity({'rush_yards': 212, 'rush_td': 3})
+            assert rarity['occurrence_count'] == 2
+            assert rarity['total_games'] == 5
+            assert rarity['first_occurrence']['game_id'] == 'g2'
+            assert rarity['last_occurrence']['game_id'] == 'g5'
+            assert engine.compute_exact_rarity({'rush_yards': 250, 'rush_td': 0})['occurrence_count'] == 0
+            assert engine.compute_exact_rarity({'rush_yards': 0, 'rush_td': 0})['occurrence_count'] == 5
+
+        rng = np.random.default_rng(7)
+        values = rng.integers(0, 20, size=(500, 3))
+        days = rng.integers(0, 1000, size=500)
+        dense = DominanceIndex(values, days, np.arange(500))
+        linear = DominanceIndex(values, days, np.arange(500))
+        linear.dense = False
+        for thresholds in rng.integers(0, 22, size=(50, 3)):
+            dominating = np.flatnonzero((values >= thresholds).all(axis=1))
+            assert dense.query(thresholds)[0] == linear.query(thresholds)[0] == len(dominating)
+            if len(dominating):
+                count, first, last = dense.query(thresholds)
+                assert days[first] == days[dominating].min()
+                assert days[last] == days[dominating].max()
+
+    def test_dominance_fallback(self, monkeypatch):
+        """Test grids over MAX_CELLS fall back to linear counts with the same answers"""
+        import numpy as np
+        from processors.dominance_index import DominanceIndex
+
+        rng = np.random.default_rng(11)
+        values = rng.integers(0, 30, size=(400, 3))
+        days = rng.integers(0, 50, size=400)
+        dense = DominanceIndex(values, days, np.arange(400))
+        assert dense.dense and dense.counts.dtype == np.int32 and dense.first.dtype == np.int32
+
+        monkeypatch.setattr(DominanceIndex, 'MAX_CELLS', 1000)
+        linear = DominanceIndex(values, days, np.arange(400))
+        assert not linear.dense and not hasattr(linear, 'counts')
+        for thresholds in rng.integers(0, 32, size=(50, 3)):
+            assert linear.query(thresholds) == dense.query(thresholds)
+
+    def test_data_cube(self, rb_dbs):
+        """Test partial-signature counts and distributions read from the data cube"""
+        import sqlite3
+        from itertools import combinations
+        from processors.rarity_engine import RarityEngine
+
+        for name in ['archive', 'current']:
+            conn = sqlite3.connect(rb_dbs / "data" / name / f"nfl_{name}.db")
+            conn.execute("ALTER TABLE rb_games ADD COLUMN season INTEGER")
+            conn.execute("UPDATE rb_games SET season = CAST(substr(game_date, 1, 4) AS INTEGER)")
+            conn.commit()
+            conn.close()
+
+        with RarityEngine('nfl', 'rb') as engine:
+            cube = engine.data_cube()
+            assert cube.dims == ['rush_yards_bucket', 'rush_td_bucket', 'fumbles_bucket', 'season']
+
+            # Every subset of dimensions agrees with a direct GROUP BY
+            games = engine._read_all(f"SELECT * FROM {engine.union_view}").to_dict('records')
+            for size in range(len(cube.dims) + 1):
+                for dims in combinations(cube.dims, size):
+                    for row in games:
+                        conditions = {dim: row[dim] for dim in dims}
+                        expected = sum(all(str(other[dim]) == str(value) for dim, value in conditions.items())
+                                       for other in games)
+                        assert cube.count(conditions) == expected
+
+            rarity = engine.compute_partial_rarity({'rush_yards_bucket': '200+'})
+            assert rarity['occurrence_count'] == 2 and rarity['total_games'] == 5
+            assert engine.compute_partial_rarity({'season': 2024}, source='current')['occurrence_count'] == 2
+            assert cube.count({'rush_yards_bucket': '150-199'}) == 0
+            assert cube.distribution('rush_yards_bucket', source='archive') == {'0-49': 2, '200+': 1}
+
+    def test_as_of_rarity(self, rb_dbs):
+        """Test point-in-time rarity only counts games played by the as-of date"""
+        import pandas as pd
+        from processors.rarity_engine import RarityEngine
+
+        game = {'rush_yards_bucket': '0-49', 'rush_td_bucket': '0', 'fumbles_bucket': '0'}
+        with RarityEngine('nfl', 'rb') as engine:
+            early = engine.compute_rarity(game, as_of='2001-09-09')
+            assert (early['occurrence_count'], early['total_games']) == (1, 1)
+            assert early['classification'] == 'never_before'
+
+            mid = engine.compute_rarity(game, as_of='2002-12-31')
+            assert (mid['occurrence_count'], mid['total_games']) == (2, 2)
+            assert mid['last_occurrence']['game_id'] == 'g3'
+            assert engine.compute_rarity(game, as_of='1999-01-01')['occurrence_count'] == 0
+
+            games = engine._read_all(f"SELECT * FROM {engine.union_view}")
+            batch = engine.compute_rarity_batch(games, as_of=games['game_date'])
+            for (idx, row), rarity in zip(games.iterrows(), batch.to_dict('records')):
+                single = engine.compute_rarity(row, as_of=row['game_date'])
+                assert rarity['occurrence_count'] == single['occurrence_count']
+                assert rarity['rarity_score'] == single['rarity_score']
+
+            board = engine.all_time_leaderboard(top_n=10)
+            assert [perf['game']['game_id'] for perf in board] == ['g5', 'g2', 'g4', 'g1', 'g3']
+            assert board[0]['rarity']['rarity_score'] == 64.0
+            assert board[1]['rarity']['first_occurrence']['game_id'] == 'g2'
+
+    def test_all_time_leaderboards(self, temp_dir, monkeypatch):
+        """Test script all-time leaderboards are stable and match per-row scoring"""
+        import importlib.util
+        import sqlite3
+        from processors.nba_rarity import NBARarityEngine
+        from utils.nfl_tables import games_table_sql
+
+        monkeypatch.chdir(temp_dir)
+        script = Path(__file__).parent.parent / "scripts" / "corrected_data_processor.py"
+        spec = importlib.util.spec_from_file_location("corrected_data_processor", script)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        processor = module.CorrectedGAASProcessor()
+
+        archive = temp_dir / "data" / "archive" / "nfl_archive.db"
+        archive.parent.mkdir(parents=True)
+        conn = sqlite3.connect(archive)
+        conn.execute(games_table_sql('rb'))
+        stats = [(10, 20, 0), (12, 120, 1), (15, 30, 0), (20, 130, 2), (8, 75, 0),
+                 (25, 210, 3), (18, 140, 1), (11, 45, 0), (14, 80, 0)]
+        conn.executemany(
+            "INSERT INTO rb_games (game_id, player_id, player_name, game_date, season, week, "
+            "rush_attempts, rush_yards, rush_td) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(f'g{i}', f'p{i}', f'Back {i}', f'2020-09-{i + 10}', 2020, i + 1, *row) for i, row in enumerate(stats)]
+        )
+        conn.commit()
+        mapping = {'buckets': {'rush_yards': [(0, 49), (50, 99), (100, float('inf'))],
+                               'rush_td': [(0, 0), (1, float('inf'))]}}
+
+        cursor = conn.cursor()
+        board = processor.get_all_time_rare(cursor, 'rb_games', 'rb', mapping, limit=10, batch_size=2)
+        assert board == processor.get_all_time_rare(cursor, 'rb_games', 'rb', mapping, limit=10)
+        assert [perf['game']['game_id'] for perf in board] == ['g4', 'g8', 'g0', 'g2', 'g7', 'g1', 'g3', 'g5', 'g6']
+        for perf in board:
+            assert perf['rarity'] == processor.calculate_rarity(cursor, 'rb_games', perf['game'], 'rb', mapping)
+        conn.close()
+
+        with NBARarityEngine() as engine:
+            conn = sqlite3.connect(engine.archive_db)
+            conn.executemany(
+                "INSERT INTO games (game_id, player_id, player_name, game_date, points, "
+                "points_bucket, rebounds_bucket, assists_bucket) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [('n1', 'a', 'Guard A', '2019-01-01', 12, '10-19', '0-4', '0-4'),
+                 ('n2', 'b', 'Guard B', '2019-01-02', 51, '50+', '10-14', '10+'),
+                 ('n3', 'c', 'Guard C', '2019-01-03', 14, '10-19', '0-4', '0-4')]
+            )
+            conn.commit()
+            conn.close()
+            expected = engine.all_time_leaderboard(top_n=50)
+
+        processor.process_other_sports()
+        with open(temp_dir / "results" / "nba" / "nba_all_time.json") as f:
+            first = json.load(f)
+        assert [perf['game']['game_id'] for perf in first['top_rare_performances']] == \
+            [perf['game']['game_id'] for perf in expected]
+        processor.process_other_sports()
+        with open(temp_dir / "results" / "nba" / "nba_all_time.json") as f:
+            assert json.load(f)['top_rare_performances'] == first['top_rare_performances']
+
+    def test_stream_current_season(self, rb_dbs):
+        """Test current-season games stream in batches with columns read by name"""
+        import sqlite3
+        from processors.nfl_rarity import NFLRarityEngine
+
+        conn = sqlite3.connect(rb_dbs / "data" / "current" / "nfl_current.db")
+        for col in ['team TEXT', 'opponent TEXT', 'season INTEGER', 'week INTEGER', 'rush_yards INTEGER']:
+            conn.execute(f"ALTER TABLE rb_games ADD COLUMN {col}")
+        conn.execute("UPDATE rb_games SET team = 'KC', opponent = 'BUF', season = 2024, week = 1, rush_yards = 210")
+        conn.commit()
+        conn.close()
+
+        engine = NFLRarityEngine('rb')
+        engine.FETCH_SIZE = 1
+        batches = list(engine._stream_current("SELECT * FROM rb_games ORDER BY game_date DESC"))
+        assert [len(batch) for batch in batches] == [1, 1]
+        assert batches[0]['game_id'].tolist() == ['g5']
+
+        rare = engine.check_current_season('rb')
+        assert [perf['player_name'] for perf in rare] == ['Back Five', 'Back Four']
+        assert rare[0]['team'] == 'KC' and rare[0]['opponent'] == 'BUF'
+        assert rare[0]['rush_yards'] == 210 and rare[0]['week'] == 1
+        assert rare[0]['classification'] == 'never_before'
+        engine.close()
+
+    def test_nfl_fresh_archive(self, temp_dir, monkeypatch):
+        """Test a fresh NFL engine creates the collector's tables and checks the current season"""
+        import sqlite3
+        from processors.nfl_rarity import NFLRarityEngine
+        from utils.nfl_tables import games_table_sql
+
+        monkeypatch.chdir(temp_dir)
+        current = temp_dir / "data" / "current" / "nfl_current.db"
+        current.parent.mkdir(parents=True)
+        conn = sqlite3.connect(current)
+        conn.execute(games_table_sql('rb'))
+        conn.execute("""
+            INSERT INTO rb_games VALUES ('2024_01_r1', 'r1', 'Back One', 'RB', 'KC', 'BUF', '2024-09-08', 2024, 1,
+                                        18, 132, 2, 0, '100-149', '2', '0')
+        """)
+        conn.commit()
+        conn.close()
+
+        engine = NFLRarityEngine('rb')
+        conn = sqlite3.connect(temp_dir / "data" / "archive" / "nfl_archive.db")
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        assert {'qb_games', 'rb_games', 'wr_games', 'te_games'} <= tables
+
+        rare = engine.check_current_season('rb')
+        assert [perf['player_name'] for perf in rare] == ['Back One']
+        assert rare[0]['team'] == 'KC' and rare[0]['opponent'] == 'BUF'
+        assert rare[0]['classification'] == 'never_before'
+        engine.close()
+
+    def test_sharded_scoring(self, rb_dbs):
+        """Test process-pool scoring matches in-process batch scoring in input order"""
+        from processors.rarity_engine import RarityEngine
+        from processors.sharded_scoring import ShardedScorer
+
+        with RarityEngine('nfl', 'rb') as engine:
+            games = engine._read_all(f"SELECT * FROM {engine.union_view}").iloc[::-1]
+            games.index = [10, 7, 7, 3, 1]
+            expected = engine.compute_rarity_batch(games)
+            expected_as_of = engine.compute_rarity_batch(games, as_of=games['game_date'])
+
+        with ShardedScorer(RarityEngine, ('nfl', 'rb'), workers=2) as scorer:
+            assert set(scorer.shards(games)) <= {0, 1}
+            result = scorer.score(games)
+            assert list(result.index) == [10, 7, 7, 3, 1]
+            assert result.to_dict('records') == expected.to_dict('records')
+            as_of = scorer.score(games, as_of=games['game_date'])
+            assert as_of.to_dict('records') == expected_as_of.to_dict('records')
+            assert scorer._indexed, "Parent should create indexes before dispatch"
+
+    def test_read_only_engine(self, rb_dbs, monkeypatch):
+        """Test read-only engines score without creating indexes, tables or databases"""
+        import sqlite3
+        from processors.nfl_rarity import NFLRarityEngine
+        from processors.rarity_engine import RarityEngine
+
+        archive = rb_dbs / "data" / "archive" / "nfl_archive.db"
+        with RarityEngine('nfl', 'rb', read_only=True) as engine:
+            engine.ensure_indexes()
+            conn = sqlite3.connect(archive)
+            assert conn.execute("PRAGMA index_list(rb_games)").fetchall() == []
+            conn.close()
+
+            games = engine._read_all(f"SELECT * FROM {engine.union_view}")
+            assert len(engine.compute_rarity_batch(games)) == 5
+            with pytest.raises(sqlite3.OperationalError):
+                with engine._connect(engine.current_db) as conn:
+                    conn.execute("CREATE TABLE scratch (x)")
+
+        empty = rb_dbs / "empty"
+        empty.mkdir()
+        monkeypatch.chdir(empty)
+        NFLRarityEngine('rb', read_only=True).close()
+        assert not (empty / "data").exists(), "Read-only construction should not create databases"
+
+    def test_approximate_rarity(self, rb_dbs):
+        """Test exact stat line sketch estimates never undercount and survive a save/load round trip"""
+        import sqlite3
+        import pandas as pd
+        from processors.rarity_engine import RarityEngine
+        from utils.sketches import SignatureSketch, update_sketch
+
+        stats = {'g1': (12, 0), 'g2': (212, 3), 'g3': (12, 0), 'g4': (12, 0), 'g5': (240, 3)}
+        for name in ['archive', 'current']:
+            conn = sqlite3.connect(rb_dbs / "data" / name / f"nfl_{name}.db")
+            conn.execute("ALTER TABLE rb_games ADD COLUMN rush_yards INTEGER")
+            conn.execute("ALTER TABLE rb_games ADD COLUMN rush_td INTEGER")
+            conn.executemany("UPDATE rb_games SET rush_yards = ?, rush_td = ? WHERE game_id = ?",
+                             [(yards, td, game_id) for game_id, (yards, td) in stats.items()])
+            conn.commit()
+            conn.close()
+
+        # Sketched by exact stats, not buckets: equal numbers match whatever their type
+        game = {'rush_yards': 12.0, 'rush_td': '0', 'rush_yards_bucket': '200+'}
+        with RarityEngine('nfl', 'rb') as engine:
+            approx = engine.compute_approximate_rarity(game)
+            assert approx['occurrence_count'] >= 3
+            assert approx['occurrence_count'] - 3 <= approx['error_bound'] + 1
+            assert approx['total_games'] == 5 and approx['confidence'] == 0.99
+            assert engine.sketch().columns == ['rush_yards', 'rush_td']
+
+            summary = engine.sketch_summary()
+            assert summary['distinct_players'] == 5 and summary['distinct_signatures'] == 3
+
+            loaded = SignatureSketch.load(engine.sketch_path)
+            assert loaded.total == 5
+            assert (loaded.counts.counts == engine.sketch().counts.counts).all()
+
+            # Collectors add appended rows to the saved sketch
+            update_sketch('nfl', 'rb_games', pd.DataFrame([{'rush_yards': 12, 'rush_td': 0, 'player_id': 'p6'}]))
+            assert SignatureSketch.load(engine.sketch_path).estimate(pd.DataFrame([game]))[0] == 4
+
+    def test_percentile_rarity(self, rb_dbs):
+        """Test t-digest percentiles of raw stats in single and batch rarity"""
+        import sqlite3
+        import pandas as pd
+        from processors.rarity_engine import RarityEngine
+        from utils.sketches import TDigest, load_digests, sketch_path
+
+        yards = {'g1': 10, 'g2': 230, 'g3': 40, 'g4': 5, 'g5': 250}
+        for name in ['archive', 'current']:
+            conn = sqlite3.connect(rb_dbs / "data" / name / f"nfl_{name}.db")
+            conn.execute("ALTER TABLE rb_games ADD COLUMN rush_yards INTEGER")
+            conn.executemany("UPDATE rb_games SET rush_yards = ? WHERE game_id = ?",
+                             [(value, game_id) for game_id, value in yards.items()])
+            conn.commit()
+            conn.close()
+
+        game = {'rush_yards_bucket': '200+', 'rush_td_bucket': '3', 'fumbles_bucket': '1', 'rush_yards': 250}
+        with RarityEngine('nfl', 'rb') as engine:
+            # Percentiles are opt-in: plain lookups never build digests
+            assert 'percentile' not in engine.compute_rarity(game)
+            assert 'percentile' not in engine.compute_rarity_batch(pd.DataFrame([game])).columns
+            assert not sketch_path('nfl', 'rb_games', 'quantiles').exists()
+
+            # 4 of 5 games below, one tie counted as half
+            assert engine.compute_rarity(game, percentile=True)['percentile'] == 90.0
+            assert engine.compute_rarity(dict(game, rush_yards=40), percentile=True)['percentile'] == 50.0
+            no_yards = {k: v for k, v in game.items() if k != 'rush_yards'}
+            assert engine.compute_rarity(no_yards, percentile=True)['percentile'] is None
+
+            # The memo and the digests share one data version probe per call
+            probes = []
+            data_version = engine._data_version
+            engine._data_version = lambda: probes.append(1) or data_version()
+            engine.compute_rarity(game, percentile=True)
+            assert len(probes) == 1
+            del engine._data_version
+
+            games = engine._read_all(f"SELECT * FROM {engine.union_view}").sort_values('rush_yards')
+            rarities = engine.compute_rarity_batch(games, percentile=True)
+            assert rarities['percentile'].tolist() == [10.0, 30.0, 50.0, 70.0, 90.0]
+
+            # Only the archive is saved; the current season is merged in
+            digests, _ = load_digests(sketch_path('nfl', 'rb_games', 'quantiles'))
+            assert digests['rush_yards'].count == 3 and engine.quantile_digests()['rush_yards'].count == 5
+
+        merged = TDigest().add(range(1000)).merge(TDigest().add(range(1000, 2000)))
+        assert merged.count == 2000 and merged.percentile([1999, 5000])[1] == 100
+        assert abs(merged.percentile([1000])[0] - 50) < 1
+
+    def test_change_feed_updates(self, rb_dbs):
+        """Test appended games update bucket counts from the change feed without a rebuild"""
+        import sqlite3
+        import pandas as pd
+        from processors.nfl_rarity import NFLRarityEngine
+        from utils.buckets import POSITION_BUCKETS
+        from utils.change_feed import append_games, read_changes
+
+        current = rb_dbs / "data" / "current" / "nfl_current.db"
+        conn = sqlite3.connect(current)
+        for col in ['team TEXT', 'opponent TEXT', 'season INTEGER', 'week INTEGER']:
+            conn.execute(f"ALTER TABLE rb_games ADD COLUMN {col}")
+        conn.execute("UPDATE rb_games SET team = 'KC', opponent = 'BUF', season = 2024, week = 1")
+        conn.commit()
+
+        engine = NFLRarityEngine('rb')
+        rare = {'rush_yards_bucket': '200+', 'rush_td_bucket': '3', 'fumbles_bucket': '1'}
+        assert engine.compute_rarity(rare)['occurrence_count'] == 1
+        since = engine.feed_position()
+
+        new_games = pd.DataFrame([
+            {'game_id': 'g6', 'player_id': 'p6', 'player_name': 'Back Six', 'game_date': '2024-09-22',
+             'team': 'NYJ', 'opponent': 'NE', 'season': 2024, 'week': 3, **rare},
+            {'game_id': 'g7', 'player_id': 'p7', 'player_name': 'Back Seven', 'game_date': '2024-09-22',
+             'team': 'NYJ', 'opponent': 'NE', 'season': 2024, 'week': 3,
+             'rush_yards_bucket': '150-199', 'rush_td_bucket': '2', 'fumbles_bucket': '0'},
+        ])
+        assert len(append_games(conn, 'rb_games', new_games, POSITION_BUCKETS['rb'])) == 2
+        conn.close()
+        conn = sqlite3.connect(current)
+        assert read_changes(conn, 'rb_games')['row_id'].tolist() == [3, 4]
+        conn.close()
+
+        rebuilds = []
+        engine.build_bucket_counts, full_build = (lambda: rebuilds.append(1)), engine.build_bucket_counts
+        rarity = engine.compute_rarity(rare)
+        assert rebuilds == [], "Index should be updated from the change feed"
+        assert rarity['occurrence_count'] == 2 and rarity['total_games'] == 7
+        assert rarity['last_occurrence']['game_id'] == 'g6'
+        incremental = engine._load_bucket_counts()[0].sort_values('signature').reset_index(drop=True)
+        full_build()
+        assert incremental.equals(engine._load_bucket_counts()[0].sort_values('signature').reset_index(drop=True))
+
+        # Only games sharing a changed signature are re-scored
+        changed, position = engine.check_changes(since, 'rb')
+        assert position == 2
+        assert [perf['player_name'] for perf in changed] == ['Back Seven', 'Back Six', 'Back Five']
+        assert engine.check_changes(position, 'rb') == ([], 2)
+
+        # Changed signatures are read a few bound values per query
+        engine.MAX_QUERY_VARIABLES = 3
+        assert engine.check_changes(since, 'rb')[0] == changed
+        engine.close()
+
+        # A position passed to check_changes does not switch the engine
+        qb_engine = NFLRarityEngine('qb')
+        assert [perf['player_name'] for perf in qb_engine.check_changes(since, 'rb')[0]] == \
+            ['Back Seven', 'Back Six', 'Back Five']
+        assert qb_engine.position == 'qb' and qb_engine.table_name == 'qb_games'
+        qb_engine.close()
+
+    def test_append_games_dedupe(self, temp_dir):
+        """Test collector appends skip existing primary keys and return only inserted rows"""
+        import sqlite3
+        import pandas as pd
+        from utils.change_feed import append_games, read_changes
+        from utils.table_stats import cached_row_count
+
+        conn = sqlite3.connect(temp_dir / "current.db")
+        conn.execute("CREATE TABLE rb_games (game_id TEXT, player_id TEXT, rush_yards INTEGER, "
+                     "game_date TEXT, PRIMARY KEY (game_id, player_id))")
+        week1 = pd.DataFrame({'game_id': ['g1', 'g2'], 'player_id': ['p1', 'p2'], 'rush_yards': [80, 120],
+                              'game_date': pd.to_datetime(['2024-09-08', '2024-09-08'])})
+        assert append_games(conn, 'rb_games', week1, ['rush_yards'])['game_id'].tolist() == ['g1', 'g2']
+
+        # Re-polling the season re-sends week 1 alongside one new game
+        week2 = pd.concat([week1, pd.DataFrame({'game_id': ['g3'], 'player_id': ['p1'], 'rush_yards': [200],
+                                                'game_date': pd.to_datetime(['2024-09-15'])})])
+        inserted = append_games(conn, 'rb_games', week2, ['rush_yards'])
+        assert inserted['game_id'].tolist() == ['g3'] and inserted['rush_yards'].tolist() == [200]
+        assert len(append_games(conn, 'rb_games', week2, ['rush_yards'])) == 0
+
+        assert cached_row_count(conn, 'rb_games') == 3
+        assert read_changes(conn, 'rb_games')['signature'].tolist() == ['80', '120', '200']
+
+        # A missing table is created keyed from its schema, never keyless
+        with pytest.raises(sqlite3.OperationalError, match='no such table'):
+            append_games(conn, 'wr_games', week1, ['rush_yards'])
+        create_sql = ("CREATE TABLE IF NOT EXISTS wr_games (game_id TEXT, player_id TEXT, rush_yards INTEGER, "
+                      "game_date TEXT, PRIMARY KEY (game_id, player_id))")
+        assert len(append_games(conn, 'wr_games', week1, ['rush_yards'], create_sql)) == 2
+        assert len(append_games(conn, 'wr_games', week2, ['rush_yards'], create_sql)) == 1
+        assert conn.execute("SELECT game_date FROM rb_games WHERE game_id = 'g3'").fetchone()[0].startswith('2024-09-15')
+        conn.close()
+
+    def test_nfl_multi_position_ingest(self, temp_dir, monkeypatch):
+        """Test one weekly download feeds every NFL position table"""
+        import sqlite3
+        import pandas as pd
+        import collectors.nfl_collector as nfl_collector
+        from datetime import timedelta
+
+        monkeypatch.chdir(temp_dir)
+        weekly = pd.DataFrame({
+            'player_id': ['q1', 'r1', 'w1', 'k1'], 'player_display_name': ['QB', 'RB', 'WR', 'K'],
+            'position': ['QB', 'RB', 'WR', 'K'], 'recent_team': ['KC'] * 4, 'opponent_team': ['BUF'] * 4,
+            'season': [2024] * 4, 'week': [1] * 4,
+            'passing_yards': [310, 0, 0, 0], 'passing_tds': [3, 0, 0, 0], 'interceptions': [1, 0, 0, 0],
+            'completions': [25, 0, 0, 0], 'attempts': [36, 0, 0, 0],
+            'carries': [2, 18, 0, 0], 'rushing_yards': [9, 132, 0, 0], 'rushing_tds': [0, 2, 0, 0],
+            'rushing_fumbles_lost': [0, 0, 0, 0],
+            'receptions': [0, 3, 9, 0], 'receiving_yards': [0, 20, 140, 0], 'receiving_tds': [0, 0, 1, 0],
+            'targets': [0, 4, 12, 0],
+        })
+        downloads = []
+        monkeypatch.setattr(nfl_collector.nfl, 'import_weekly_data',
+                            lambda years, downcast=True: downloads.append(years) or weekly.copy())
+
+        collector = nfl_collector.NFLCollector(offline=False)
+        collector.weekly_cache.max_age = timedelta(0)
+        new_games = collector.fetch_all_positions(['rb', 'qb', 'wr', 'te'])
+        assert len(downloads) == 1
+        assert {position: len(games) for position, games in new_games.items()} == {'rb': 1, 'qb': 1, 'wr': 1, 'te': 0}
+        assert new_games['qb'].iloc[0]['pass_yards_bucket'] == '300-349'
+        assert new_games['rb'].iloc[0]['rush_yards_bucket'] == '100-149'
+
+        conn = sqlite3.connect(temp_dir / "data" / "current" / "nfl_current.db")
+        assert conn.execute("SELECT receiving_yards, game_date FROM wr_games").fetchone() == (140, '2024-09-08')
+        conn.close()
+
+        # A second poll of the same week inserts nothing
+        assert all(len(games) == 0 for games in collector.fetch_all_positions().values())
+        assert len(collector.fetch_new_games('rb')) == 0 and len(downloads) == 3
+
+    def test_weekly_cache(self, temp_dir, monkeypatch):
+        """Test the weekly cache keeps final weeks, refreshes recent ones and serves offline"""
+        pytest.importorskip("pyarrow", exc_type=ImportError)
+        import pandas as pd
+        from utils.weekly_cache import WeeklyCache
+
+        monkeypatch.chdir(temp_dir)
+        upstream = pd.DataFrame({'player_id': ['a', 'a', 'a', 'b'], 'week': [1, 2, 3, 3], 'yards': [10, 20, 30, 40]})
+        downloads = []
+
+        def fetch(season):
+            downloads.append(season)
+            return upstream.copy()
+
+        cache = WeeklyCache('nfl_weekly', 2024, fetch, offline=False)
+        assert cache.get()['yards'].tolist() == [10, 20, 30, 40]
+        assert (temp_dir / "data" / "cache" / "nfl_weekly_2024.parquet").exists()
+        first = cache.meta()
+        assert first['weeks'] == [1, 2, 3] and len(first['hash']) == 64
+
+        # Within max_age the file is served without a download
+        assert len(cache.get()) == 4 and downloads == [2024]
+
+        # A refresh takes weeks 2-3 (current and previous) from upstream but keeps final week 1
+        upstream.loc[:, 'yards'] = [99, 21, 31, 41]
+        refreshed = cache.get(refresh=True)
+        assert sorted(refreshed['yards']) == [10, 21, 31, 41] and len(downloads) == 2
+        assert cache.meta()['hash'] != first['hash']
+
+        offline = WeeklyCache('nfl_weekly', 2024, fetch, offline=True)
+        assert sorted(offline.get()['yards']) == [10, 21, 31, 41] and len(downloads) == 2
+        with pytest.raises(FileNotFoundError):
+            WeeklyCache('nfl_weekly', 2023, fetch, offline=True).get()
+
+    def test_ingest_watermark(self, temp_dir, monkeypatch):
+        """Test ingest watermarks restore keys, seed from old rows and limit appends"""
+        import sqlite3
+        import pandas as pd
+        from collectors.nba_collector import NBACollector
+        from utils.ingest_state import advance_watermark, ensure_table, past_watermark, read_watermark
+
+        monkeypatch.chdir(temp_dir)
+        # A table created before keys and watermarks, holding a duplicated row
+        conn = sqlite3.connect(temp_dir / "legacy.db")
+        conn.execute("CREATE TABLE rb_games (game_id TEXT, player_id TEXT, player_name TEXT, game_date TEXT)")
+        conn.executemany("INSERT INTO rb_games VALUES (?, ?, ?, ?)", [
+            ('g4', 'p4', 'Back Four', '2024-09-08'),
+            ('g5', 'p5', 'Back Five', '2024-09-15'),
+            ('g5', 'p5', 'Back Five', '2024-09-15'),
+        ])
+        conn.commit()
+        ensure_table(conn, 'rb_games', """
+            CREATE TABLE IF NOT EXISTS rb_games (
+                game_id TEXT, player_id TEXT, player_name TEXT, game_date TEXT,
+                PRIMARY KEY (game_id, player_id)
+            )
+        """)
+        assert conn.execute("SELECT game_id FROM rb_games ORDER BY game_id").fetchall() == [('g4',), ('g5',)]
+
+        # A rebuild interrupted after the rename is finished by the next call
+        conn.execute("CREATE TABLE qb_games (game_id TEXT, player_id TEXT, PRIMARY KEY (game_id, player_id))")
+        conn.execute("CREATE TABLE qb_games_legacy (game_id TEXT, player_id TEXT)")
+        conn.executemany("INSERT INTO qb_games_legacy VALUES (?, ?)", [('g1', 'p1'), ('g1', 'p1')])
+        conn.commit()
+        ensure_table(conn, 'qb_games', "CREATE TABLE IF NOT EXISTS qb_games "
+                                       "(game_id TEXT, player_id TEXT, PRIMARY KEY (game_id, player_id))")
+        assert conn.execute("SELECT game_id, player_id FROM qb_games").fetchall() == [('g1', 'p1')]
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'qb_games_legacy'").fetchone() is None
+
+        # A table ingested before watermarks existed is seeded from its latest row
+        watermark = read_watermark(conn, 'rb_games', 'game_date')
+        assert watermark['last_date'] == '2024-09-15' and watermark['upstream_hash'] is None
+        games = pd.DataFrame({'game_id': ['g4', 'g5', 'g6'], 'game_date': ['2024-09-08', '2024-09-15', '2024-09-22']})
+        assert past_watermark(games, watermark, 'game_date')['game_id'].tolist() == ['g5', 'g6']
+
+        advance_watermark(conn, 'rb_games', games.tail(1), 'game_date', upstream_hash='abc')
+        advance_watermark(conn, 'rb_games', games.head(1), 'game_date')
+        assert conn.execute(
+            "SELECT last_date, upstream_hash, rows_ingested FROM ingest_state WHERE table_name = 'rb_games'"
+        ).fetchone() == ('2024-09-22', 'abc', 2)
+        conn.close()
+
+        # A collector rerun requests and appends only games past its watermark
+        first = NBACollector(seed=7).fetch_new_games()
+        second = NBACollector(seed=7).fetch_new_games()
+        assert len(first) > 0 and len(second) > 0
+        assert second['game_date'].min() > first['game_date'].max()
+        conn = sqlite3.connect(temp_dir / "data" / "current" / "nba_current.db")
+        assert conn.execute("SELECT COUNT(*) FROM games").fetchone()[0] == len(first) + len(second)
+        assert conn.execute("SELECT last_date FROM ingest_state").fetchone()[0] == second['game_date'].max()
+        conn.close()
+
+    def test_synthetic_data(self, temp_dir):
+        """Test synthetic games are seeded, batch-stable and stream into an archive"""
+        import sqlite3
+        import pandas as pd
+        from utils.synthetic import generate, iter_games, write_archive
+
+        games = generate('nba', 5000, seed=11, seasons=[2023, 2024])
+        assert len(games) == 5000 and games['game_id'].is_unique
+        assert games.equals(generate('nba', 5000, seed=11, seasons=[2023, 2024]))
+        assert not games.equals(generate('nba', 5000, seed=12, seasons=[2023, 2024]))
+        assert set(games['points_bucket']) <= {'0-9', '10-19', '20-29', '30-39', '40-49', '50+'}
+
+        batches = list(iter_games('nba', 5000, seed=11, seasons=[2023, 2024], batch_size=1000))
+        assert [len(batch) for batch in batches] == [1000] * 5
+        assert pd.concat(batches, ignore_index=True).equals(
+            pd.concat(iter_games('nba', 5000, seed=11, seasons=[2023, 2024], batch_size=1000), ignore_index=True)
+        )
+
+        # F1 finishing orders are permutations within each grid of a race
+        races = generate('f1', seed=3, seasons=[2024], games_per_season=2, players=[f"D{i}" for i in range(20)])
+        assert all(sorted(race) == list(range(1, 21)) for _, race in races.groupby('race_date')['position'])
+        assert races.loc[races['position'] == 1, 'points'].eq(25).all()
+
+        db = temp_dir / "nhl_archive.db"
+        assert write_archive('nhl', 3000, db, seed=5, batch_size=700) == 3000
+        conn = sqlite3.connect(db)
+        assert conn.execute("SELECT COUNT(*), COUNT(DISTINCT game_id) FROM games").fetchone() == (3000, 3000)
+        assert conn.execute("SELECT row_count FROM table_stats WHERE table_name = 'games'").fetchone() == (3000,)
+        conn.close()
+        with pytest.raises(ValueError):
+            write_archive('nhl', 10, db)
+
+    def test_bucket_registry(self):
+        """Test shared bucket specs label edges the way collectors expect"""
+        import pandas as pd
+        from utils.buckets import BUCKETS, POSITION_BUCKETS, apply_buckets, bucket_label
+
+        games = pd.DataFrame({'rush_yards': [0, 49, 50, 199, 200, None], 'rush_td': [0, 1, 3, 4, 9, 'n/a'],
+                              'fumbles_lost': [0, 1, 2, 5, 0, 0]})
+        apply_buckets(games, 'nfl', POSITION_BUCKETS['rb'])
+        # Missing and non-numeric stats fall in the lowest bucket, not the rarest
+        assert list(games['rush_yards_bucket']) == ['0-49', '0-49', '50-99', '150-199', '200+', '0-49']
+        assert list(games['rush_td_bucket']) == ['0', '1', '3', '4+', '4+', '0']
+        assert list(games['fumbles_bucket']) == ['0', '1', '2+', '2+', '0', '0']
+        assert bucket_label('nba', 'points_bucket', float('nan')) == '0-9'
+
+        # Right-closed F1 buckets: the edge stays in the lower bucket
+        assert [bucket_label('f1', 'position_bucket', pos) for pos in (1, 3, 4, 5, 6, 20)] == \
+            ['1', '3', '4-5', '4-5', '6-10', '11+']
+        assert bucket_label('f1', 'fastest_lap_bucket', 0.5) == '0.0-0.5'
+
+        nba = apply_buckets(pd.DataFrame({'points': [9, 10, 50], 'team': ['A', 'B', 'C']}), 'nba')
+        assert list(nba['points_bucket']) == ['0-9', '10-19', '50+']
+        assert 'rebounds_bucket' not in nba
+
+        for sport, specs in BUCKETS.items():
+            for column, spec in specs.items():
+                assert column.endswith('_bucket') and len(spec.labels) == len(spec.edges) + 1
+
     def test_data_quality(self):
         """Test data quality across all sports"""
         sports_data = {